@@ -0,0 +1,94 @@
+"""CPU cost of serializing inventory responses, before and after response models.
+
+Times what a worker spends turning domain entities into response bytes for
+a single inventory, a list page, an NDJSON export page and a lookup, with
+the previous hand-built dicts run through ``jsonable_encoder`` and
+``json.dumps`` against the pydantic response models dumped by
+pydantic-core. Needs no database. Usage
+(from inventory-service/):
+
+    python -m benchmarks.response_serialization --rows 100 --lookup-rows 1000
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.domain.entities import Inventory
+from src.infrastructure.schemas import InventoryResponseSchema, InventoryPageResponseSchema, INVENTORY_ROWS
+from src.interface.routes.inventory_route import dump_rows
+
+
+def legacy_serialize_inventory(inventory: Inventory) -> dict:
+    return {
+        "id": inventory.id,
+        "product_uid": inventory.product_uid,
+        "quantity_available": inventory.quantity_available,
+        "reserved_quantity": inventory.reserved_quantity,
+        "reorder_threshold": inventory.reorder_threshold,
+        "updated_at": inventory.updated_at.isoformat()
+    }
+
+
+def legacy_render(content) -> bytes:
+    # FastAPI without a response model, then JSONResponse.render
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def main(rows: int, lookup_rows: int, repeat: int) -> None:
+    now = datetime.now(timezone.utc)
+    inventories = [
+        Inventory(
+            id=index + 1, product_uid=f"product-{index:07d}", quantity_available=index * 7 % 1000,
+            reserved_quantity=index % 13, created_at=now, updated_at=now,
+            reorder_threshold=None if index % 3 else 10,
+        )
+        for index in range(max(rows, lookup_rows))
+    ]
+    inventory_adapter = TypeAdapter(InventoryResponseSchema)
+    page_adapter = TypeAdapter(InventoryPageResponseSchema)
+    page = inventories[:rows]
+    lookup = inventories[:lookup_rows]
+
+    cases = {
+        "get": (
+            20000,
+            # The entity went through jsonable_encoder, which read its attributes.
+            lambda: legacy_render({name: getattr(inventories[0], name) for name in Inventory.__slots__}),
+            lambda: inventory_adapter.dump_json(inventory_adapter.validate_python(inventories[0], from_attributes=True)),
+        ),
+        f"list of {rows}": (
+            max(1, 20000 // rows),
+            lambda: legacy_render({"inventories": [legacy_serialize_inventory(inventory) for inventory in page], "next_cursor": "MQ=="}),
+            lambda: page_adapter.dump_json(page_adapter.validate_python({"inventories": page, "next_cursor": "MQ=="}, from_attributes=True)),
+        ),
+        f"export of {rows}": (
+            max(1, 20000 // rows),
+            lambda: "".join(json.dumps(legacy_serialize_inventory(inventory)) + "\n" for inventory in page),
+            lambda: "".join(row.model_dump_json() + "\n" for row in INVENTORY_ROWS.validate_python(page, from_attributes=True)),
+        ),
+        f"lookup of {lookup_rows}": (
+            max(1, 20000 // lookup_rows),
+            lambda: [json.dumps(legacy_serialize_inventory(inventory)) for inventory in lookup],
+            lambda: dump_rows(lookup),
+        ),
+    }
+    assert json.loads(b"[" + dump_rows(page) + b"]")[0]["product_uid"] == page[0].product_uid
+    for name, (number, before, after) in cases.items():
+        before_us = min(timeit.repeat(before, number=number, repeat=repeat)) / number * 1e6
+        after_us = min(timeit.repeat(after, number=number, repeat=repeat)) / number * 1e6
+        print(f"{name:<16} before={before_us:9.1f}us after={after_us:9.1f}us speedup={before_us / after_us:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--lookup-rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.lookup_rows, args.repeat)
@@ -0,0 +1,70 @@
+"""Bulk import of stock levels from a CSV or NDJSON file.
+
+Each row sets ``quantity_available`` of one product, creating the products
+that do not exist yet. CSV files need a header with ``product_uid`` and
+``quantity_available`` columns. Usage (from inventory-service/):
+
+    python import_stock.py stock.csv
+    python import_stock.py stock.ndjson --chunk-size 10000
+
+Exits with status 1 when some rows were rejected.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+
+from src.infrastructure.config import INVENTORY_IMPORT_CHUNK_SIZE, INVENTORY_IMPORT_MAX_ERRORS
+from src.infrastructure.database import DatabaseFactory
+from src.infrastructure.importers import IMPORT_FORMATS, read_stock_levels
+from src.infrastructure.monitoring import configure_logging
+from src.interface.dependencies import ServiceProvider
+
+async def read_file(path: str, block_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while block := file.read(block_size):
+            yield block
+
+async def main(path: str, format: str, chunk_size: int, max_errors: int) -> int:
+    configure_logging()
+    database = DatabaseFactory.get_default_strategy()
+    await database.startup()
+    # The repository layers of the HTTP routes, so the import goes through the cache too.
+    service_provider = ServiceProvider.from_config()
+    started = time.perf_counter()
+    # The counts of the final ``done`` event, which the exit status follows.
+    summary = None
+    try:
+        async with asynccontextmanager(database.get_session)() as session:
+            events = service_provider.inventory_service(session).import_stock_levels(
+                read_stock_levels(read_file(path), format), chunk_size, max_errors
+            )
+            async for event in events:
+                if event["event"] == "error":
+                    logger.warning(f"Line {event['line']}: {event['error']}")
+                    continue
+                if event["event"] == "done":
+                    summary = event
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"{event['processed']} rows in {elapsed:.1f}s ({event['processed'] / elapsed:.0f}/s): "
+                    f"{event['inserted']} inserted, {event['updated']} updated, "
+                    f"{event['unchanged']} unchanged, {event['failed']} rejected"
+                )
+    finally:
+        await database.shutdown()
+    return 1 if summary is None or summary["failed"] else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=INVENTORY_IMPORT_CHUNK_SIZE)
+    parser.add_argument("--max-errors", type=int, default=INVENTORY_IMPORT_MAX_ERRORS)
+    args = parser.parse_args()
+    format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    sys.exit(asyncio.run(main(args.path, format, args.chunk_size, args.max_errors)))
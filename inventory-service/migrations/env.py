@@ -7,6 +7,12 @@ from sqlalchemy import pool, create_engine
 from alembic import context
 
 from src.infrastructure.models.inventory_model import InventoryModel
+from src.infrastructure.models.inventory_shard_model import InventoryShardModel
+from src.infrastructure.models.reservation_model import ReservationModel
+from src.infrastructure.models.idempotency_key_model import IdempotencyKeyModel
+from src.infrastructure.models.stock_movement_model import StockMovementModel
+from src.infrastructure.models.inventory_snapshot_model import InventorySnapshotModel
+from src.infrastructure.models.outbox_event_model import OutboxEventModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,30 @@
+"""add_outbox_event_lease
+
+Revision ID: 2edc0708ece4
+Revises: 768a4f8c45a5
+Create Date: 2026-10-18 20:05:41.552907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2edc0708ece4'
+down_revision: Union[str, None] = '768a4f8c45a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Relays lease the events they deliver instead of holding their row locks,
+    # and a transaction, open while the sink is called.
+    op.add_column('outbox_events', sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('outbox_events', 'claimed_until')
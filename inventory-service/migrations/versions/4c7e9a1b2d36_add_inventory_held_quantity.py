@@ -0,0 +1,58 @@
+"""add_inventory_held_quantity
+
+Revision ID: 4c7e9a1b2d36
+Revises: 2edc0708ece4
+Create Date: 2026-10-18 21:12:27.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c7e9a1b2d36'
+down_revision: Union[str, None] = '2edc0708ece4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Timed reservations count their units apart from the rest of the
+    # reserved stock, which /release can no longer hand back. Reservations
+    # whose units a /release already returned keep only what is still
+    # reserved, those expiring first served first, so that every reservation
+    # can be settled in full.
+    op.add_column('inventories', sa.Column('held_quantity', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+    WITH reserved AS (
+        SELECT inventories.product_uid, CASE WHEN inventories.shard_count > 0 THEN (
+            SELECT coalesce(sum(inventory_shards.reserved_quantity), 0) FROM inventory_shards
+            WHERE inventory_shards.product_uid = inventories.product_uid
+        ) ELSE inventories.reserved_quantity END AS quantity
+        FROM inventories
+    ), trimmed AS (
+        SELECT reservations.id, greatest(0, least(
+            reservations.amount,
+            reserved.quantity - sum(reservations.amount) OVER (
+                PARTITION BY reservations.product_uid ORDER BY reservations.expires_at, reservations.id
+            ) + reservations.amount
+        )) AS amount
+        FROM reservations JOIN reserved ON reserved.product_uid = reservations.product_uid
+    )
+    UPDATE reservations SET amount = trimmed.amount
+    FROM trimmed
+    WHERE reservations.id = trimmed.id AND reservations.amount <> trimmed.amount
+    """)
+    op.execute("""
+    UPDATE inventories SET held_quantity = held.amount
+    FROM (SELECT product_uid, sum(amount) AS amount FROM reservations GROUP BY product_uid) AS held
+    WHERE inventories.product_uid = held.product_uid
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('inventories', 'held_quantity')
@@ -0,0 +1,56 @@
+"""notify_on_inventory_shard_change
+
+Revision ID: 613b7d3a579b
+Revises: ed53c2559714
+Create Date: 2026-10-18 18:55:45.208359
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '613b7d3a579b'
+down_revision: Union[str, None] = 'ed53c2559714'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reservations of a sharded product only touch its shards. Announce them
+    # on 'inventory_changes' with the inventory row, whose zero counters and
+    # shard_count tell listeners to read the totals. Postgres folds identical
+    # notifications of a transaction into one.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_inventory_shard_change() RETURNS trigger AS $$
+    DECLARE
+        parent inventories;
+    BEGIN
+        SELECT * INTO parent FROM inventories WHERE product_uid = NEW.product_uid;
+        IF FOUND THEN
+            PERFORM pg_notify(
+                'inventory_changes',
+                json_build_object('op', 'UPDATE', 'inventory', row_to_json(parent))::text
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER inventory_shards_notify_update
+    AFTER UPDATE OF quantity_available, reserved_quantity ON inventory_shards
+    FOR EACH ROW WHEN (
+        OLD.quantity_available <> NEW.quantity_available OR OLD.reserved_quantity <> NEW.reserved_quantity
+    )
+    EXECUTE FUNCTION notify_inventory_shard_change()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS inventory_shards_notify_update ON inventory_shards")
+    op.execute("DROP FUNCTION IF EXISTS notify_inventory_shard_change()")
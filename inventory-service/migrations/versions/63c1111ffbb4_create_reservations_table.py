@@ -0,0 +1,37 @@
+"""create_reservations_table
+
+Revision ID: 63c1111ffbb4
+Revises: 65485ff5cf2c
+Create Date: 2026-10-18 18:03:46.302320
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '63c1111ffbb4'
+down_revision: Union[str, None] = '65485ff5cf2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reservations',
+    sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('product_uid', sa.String(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reservations_expires_at'), 'reservations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reservations_expires_at'), table_name='reservations')
+    op.drop_table('reservations')
@@ -0,0 +1,60 @@
+"""notify_on_inventory_change
+
+Revision ID: 65485ff5cf2c
+Revises: b8219c7aa3d8
+Create Date: 2026-10-18 17:59:17.581157
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '65485ff5cf2c'
+down_revision: Union[str, None] = 'b8219c7aa3d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Publish every committed change of an inventory row on the
+    # 'inventory_changes' channel so that each worker can refresh its cache.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_inventory_change() RETURNS trigger AS $$
+    DECLARE
+        changed inventories;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            changed := OLD;
+        ELSE
+            changed := NEW;
+        END IF;
+        PERFORM pg_notify(
+            'inventory_changes',
+            json_build_object('op', TG_OP, 'inventory', row_to_json(changed))::text
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER inventories_notify_change
+    AFTER INSERT OR DELETE ON inventories
+    FOR EACH ROW EXECUTE FUNCTION notify_inventory_change()
+    """)
+    op.execute("""
+    CREATE TRIGGER inventories_notify_update
+    AFTER UPDATE ON inventories
+    FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION notify_inventory_change()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS inventories_notify_update ON inventories")
+    op.execute("DROP TRIGGER IF EXISTS inventories_notify_change ON inventories")
+    op.execute("DROP FUNCTION IF EXISTS notify_inventory_change()")
@@ -0,0 +1,127 @@
+"""add_stock_movement_ledger
+
+Revision ID: 680e8abe76e3
+Revises: b0436511166c
+Create Date: 2026-10-18 18:47:50.740258
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '680e8abe76e3'
+down_revision: Union[str, None] = 'b0436511166c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inventory_snapshots',
+    sa.Column('product_uid', sa.String(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('quantity_available', sa.Integer(), nullable=False),
+    sa.Column('reserved_quantity', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('product_uid', 'taken_at')
+    )
+    op.create_index(op.f('ix_inventory_snapshots_taken_at'), 'inventory_snapshots', ['taken_at'], unique=False)
+    op.create_table('stock_movements',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('product_uid', sa.String(), nullable=False),
+    sa.Column('delta_available', sa.Integer(), nullable=False),
+    sa.Column('delta_reserved', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=32), nullable=False),
+    sa.Column('idempotency_key', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('clock_timestamp()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_movements_created_at', 'stock_movements', ['created_at', 'id'], unique=False)
+    op.create_index('ix_stock_movements_product_uid_created_at', 'stock_movements', ['product_uid', 'created_at', 'id'], unique=False)
+    # Every change of a stock counter, on an inventory row or on a shard, is
+    # appended by the transaction making it. Writers may name the reason and
+    # the Idempotency-Key of the transaction with set_config; otherwise the
+    # reason is read from the shape of the change.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION record_stock_movement() RETURNS trigger AS $$
+    DECLARE
+        uid text;
+        delta_available integer;
+        delta_reserved integer;
+        reason text := NULLIF(current_setting('inventory.movement_reason', true), '');
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            uid := NEW.product_uid;
+            delta_available := NEW.quantity_available;
+            delta_reserved := NEW.reserved_quantity;
+        ELSIF TG_OP = 'DELETE' THEN
+            uid := OLD.product_uid;
+            delta_available := -OLD.quantity_available;
+            delta_reserved := -OLD.reserved_quantity;
+        ELSE
+            uid := NEW.product_uid;
+            delta_available := NEW.quantity_available - OLD.quantity_available;
+            delta_reserved := NEW.reserved_quantity - OLD.reserved_quantity;
+        END IF;
+        IF delta_available = 0 AND delta_reserved = 0 THEN
+            RETURN NULL;
+        END IF;
+        IF reason IS NULL THEN
+            reason := CASE
+                WHEN TG_OP = 'INSERT' THEN 'create'
+                WHEN TG_OP = 'DELETE' THEN 'delete'
+                WHEN delta_available < 0 AND delta_reserved = -delta_available THEN 'reserve'
+                WHEN delta_available > 0 AND delta_reserved = -delta_available THEN 'release'
+                WHEN delta_available = 0 AND delta_reserved < 0 THEN 'confirm'
+                ELSE 'adjust'
+            END;
+        END IF;
+        INSERT INTO stock_movements (product_uid, delta_available, delta_reserved, reason, idempotency_key)
+        VALUES (
+            uid, delta_available, delta_reserved, reason,
+            NULLIF(current_setting('inventory.idempotency_key', true), '')
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    for table in ('inventories', 'inventory_shards'):
+        op.execute(f"""
+        CREATE TRIGGER {table}_record_movement
+        AFTER INSERT OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION record_stock_movement()
+        """)
+        op.execute(f"""
+        CREATE TRIGGER {table}_record_movement_update
+        AFTER UPDATE OF quantity_available, reserved_quantity ON {table}
+        FOR EACH ROW WHEN (
+            OLD.quantity_available <> NEW.quantity_available OR OLD.reserved_quantity <> NEW.reserved_quantity
+        )
+        EXECUTE FUNCTION record_stock_movement()
+        """)
+    # Opening balances. The triggers already hold their locks, so every later
+    # change is recorded as a movement after this snapshot.
+    op.execute("""
+    INSERT INTO inventory_snapshots (product_uid, taken_at, quantity_available, reserved_quantity)
+    SELECT inventories.product_uid, now(),
+           inventories.quantity_available + coalesce(sum(inventory_shards.quantity_available), 0),
+           inventories.reserved_quantity + coalesce(sum(inventory_shards.reserved_quantity), 0)
+    FROM inventories
+    LEFT JOIN inventory_shards ON inventory_shards.product_uid = inventories.product_uid
+    GROUP BY inventories.product_uid, inventories.quantity_available, inventories.reserved_quantity
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('inventories', 'inventory_shards'):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_record_movement_update ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_record_movement ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_stock_movement()")
+    op.drop_index('ix_stock_movements_product_uid_created_at', table_name='stock_movements')
+    op.drop_index('ix_stock_movements_created_at', table_name='stock_movements')
+    op.drop_table('stock_movements')
+    op.drop_index(op.f('ix_inventory_snapshots_taken_at'), table_name='inventory_snapshots')
+    op.drop_table('inventory_snapshots')
@@ -0,0 +1,48 @@
+"""add_inventory_shards
+
+Revision ID: 6d856d572fd0
+Revises: 3f2916135784
+Create Date: 2026-10-18 18:14:01.893477
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d856d572fd0'
+down_revision: Union[str, None] = '3f2916135784'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inventories', sa.Column('shard_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('inventory_shards',
+    sa.Column('product_uid', sa.String(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('quantity_available', sa.Integer(), nullable=False),
+    sa.Column('reserved_quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_uid'], ['inventories.product_uid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_uid', 'shard')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold sharded stock back into the inventory rows before dropping the shards.
+    op.execute("""
+    UPDATE inventories SET
+        quantity_available = totals.quantity_available,
+        reserved_quantity = totals.reserved_quantity
+    FROM (
+        SELECT product_uid, sum(quantity_available) AS quantity_available, sum(reserved_quantity) AS reserved_quantity
+        FROM inventory_shards GROUP BY product_uid
+    ) AS totals
+    WHERE inventories.product_uid = totals.product_uid
+    """)
+    op.drop_table('inventory_shards')
+    op.drop_column('inventories', 'shard_count')
@@ -0,0 +1,79 @@
+"""gate_inventory_change_notifications
+
+Revision ID: 768a4f8c45a5
+Revises: 613b7d3a579b
+Create Date: 2026-10-18 19:40:12.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '768a4f8c45a5'
+down_revision: Union[str, None] = '613b7d3a579b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A transaction that queued a NOTIFY takes a cluster-wide lock to commit.
+    # Only connections opened with inventory.notify_changes=on publish the
+    # changes of inventory and shard rows, so a deployment without a cache
+    # listener or stock stream can turn them off.
+    op.execute("DROP TRIGGER IF EXISTS inventories_notify_update ON inventories")
+    op.execute("DROP TRIGGER IF EXISTS inventories_notify_change ON inventories")
+    op.execute("""
+    CREATE TRIGGER inventories_notify_change
+    AFTER INSERT OR DELETE ON inventories
+    FOR EACH ROW WHEN (current_setting('inventory.notify_changes', true) = 'on')
+    EXECUTE FUNCTION notify_inventory_change()
+    """)
+    op.execute("""
+    CREATE TRIGGER inventories_notify_update
+    AFTER UPDATE ON inventories
+    FOR EACH ROW WHEN (
+        current_setting('inventory.notify_changes', true) = 'on' AND OLD.* IS DISTINCT FROM NEW.*
+    )
+    EXECUTE FUNCTION notify_inventory_change()
+    """)
+    op.execute("DROP TRIGGER IF EXISTS inventory_shards_notify_update ON inventory_shards")
+    op.execute("""
+    CREATE TRIGGER inventory_shards_notify_update
+    AFTER UPDATE OF quantity_available, reserved_quantity ON inventory_shards
+    FOR EACH ROW WHEN (
+        current_setting('inventory.notify_changes', true) = 'on' AND (
+            OLD.quantity_available <> NEW.quantity_available OR OLD.reserved_quantity <> NEW.reserved_quantity
+        )
+    )
+    EXECUTE FUNCTION notify_inventory_shard_change()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS inventories_notify_update ON inventories")
+    op.execute("DROP TRIGGER IF EXISTS inventories_notify_change ON inventories")
+    op.execute("""
+    CREATE TRIGGER inventories_notify_change
+    AFTER INSERT OR DELETE ON inventories
+    FOR EACH ROW EXECUTE FUNCTION notify_inventory_change()
+    """)
+    op.execute("""
+    CREATE TRIGGER inventories_notify_update
+    AFTER UPDATE ON inventories
+    FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION notify_inventory_change()
+    """)
+    op.execute("DROP TRIGGER IF EXISTS inventory_shards_notify_update ON inventory_shards")
+    op.execute("""
+    CREATE TRIGGER inventory_shards_notify_update
+    AFTER UPDATE OF quantity_available, reserved_quantity ON inventory_shards
+    FOR EACH ROW WHEN (
+        OLD.quantity_available <> NEW.quantity_available OR OLD.reserved_quantity <> NEW.reserved_quantity
+    )
+    EXECUTE FUNCTION notify_inventory_shard_change()
+    """)
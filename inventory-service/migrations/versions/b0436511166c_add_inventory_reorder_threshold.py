@@ -0,0 +1,38 @@
+"""add_inventory_reorder_threshold
+
+Revision ID: b0436511166c
+Revises: 6d856d572fd0
+Create Date: 2026-10-18 18:40:55.914002
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0436511166c'
+down_revision: Union[str, None] = '6d856d572fd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inventories', sa.Column('reorder_threshold', sa.Integer(), nullable=True))
+    # Only products at or below their threshold are indexed, so the low-stock
+    # listing reads a handful of entries instead of scanning the table.
+    op.create_index(
+        'ix_inventories_low_stock',
+        'inventories',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('quantity_available <= reorder_threshold'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventories_low_stock', table_name='inventories')
+    op.drop_column('inventories', 'reorder_threshold')
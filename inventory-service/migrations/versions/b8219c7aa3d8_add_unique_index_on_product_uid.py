@@ -0,0 +1,79 @@
+"""add_unique_index_on_product_uid
+
+Revision ID: b8219c7aa3d8
+Revises: 6cf5c3a7817d
+Create Date: 2026-10-18 17:57:07.491967
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8219c7aa3d8'
+down_revision: Union[str, None] = '6cf5c3a7817d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Merge duplicate rows into the oldest one: stock and reservations are
+    # summed, so nothing that was reserved on a duplicate is lost.
+    op.execute("""
+    WITH duplicates AS (
+        SELECT product_uid,
+               MIN(id) AS keep_id,
+               SUM(quantity_available) AS quantity_available,
+               SUM(reserved_quantity) AS reserved_quantity,
+               MIN(created_at) AS created_at,
+               MAX(updated_at) AS updated_at
+        FROM inventories
+        GROUP BY product_uid
+        HAVING COUNT(*) > 1
+    ), merged AS (
+        UPDATE inventories
+        SET quantity_available = duplicates.quantity_available,
+            reserved_quantity = duplicates.reserved_quantity,
+            created_at = duplicates.created_at,
+            updated_at = duplicates.updated_at
+        FROM duplicates
+        WHERE inventories.id = duplicates.keep_id
+        RETURNING duplicates.product_uid, duplicates.keep_id
+    )
+    DELETE FROM inventories
+    USING merged
+    WHERE inventories.product_uid = merged.product_uid
+      AND inventories.id <> merged.keep_id
+    """)
+
+    # Build the index without blocking writes. A failed concurrent build
+    # leaves an INVALID index behind, so drop it first to make reruns safe.
+    with op.get_context().autocommit_block():
+        op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index
+                WHERE indexrelid = to_regclass('ix_inventories_product_uid') AND NOT indisvalid
+            ) THEN
+                DROP INDEX ix_inventories_product_uid;
+            END IF;
+        END
+        $$
+        """)
+        op.create_index(
+            op.f('ix_inventories_product_uid'), 'inventories', ['product_uid'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_inventories_product_uid'), table_name='inventories',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,87 @@
+"""add_outbox_events
+
+Revision ID: ed53c2559714
+Revises: 680e8abe76e3
+Create Date: 2026-10-18 18:52:46.596004
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed53c2559714'
+down_revision: Union[str, None] = '680e8abe76e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('event_type', sa.String(length=32), nullable=False),
+    sa.Column('product_uid', sa.String(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('clock_timestamp()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Each stock movement becomes an event carrying the totals it left behind,
+    # written in the same transaction. Only connections opened with
+    # inventory.outbox_enabled=on, i.e. with OUTBOX_ENABLED, write events, so
+    # the table does not fill up where no relay drains it. Resharding moves
+    # stock between rows of a product without changing its totals.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION enqueue_stock_event() RETURNS trigger AS $$
+    DECLARE
+        totals record;
+        event_type text := 'stock.changed';
+    BEGIN
+        SELECT
+            CASE WHEN inventories.shard_count > 0 THEN (
+                SELECT coalesce(sum(inventory_shards.quantity_available), 0) FROM inventory_shards
+                WHERE inventory_shards.product_uid = inventories.product_uid
+            ) ELSE inventories.quantity_available END AS quantity_available,
+            CASE WHEN inventories.shard_count > 0 THEN (
+                SELECT coalesce(sum(inventory_shards.reserved_quantity), 0) FROM inventory_shards
+                WHERE inventory_shards.product_uid = inventories.product_uid
+            ) ELSE inventories.reserved_quantity END AS reserved_quantity
+        INTO totals
+        FROM inventories WHERE inventories.product_uid = NEW.product_uid;
+        IF NOT FOUND THEN
+            event_type := 'stock.deleted';
+        END IF;
+        INSERT INTO outbox_events (event_type, product_uid, payload)
+        VALUES (event_type, NEW.product_uid, jsonb_build_object(
+            'event', event_type,
+            'product_uid', NEW.product_uid,
+            'quantity_available', totals.quantity_available,
+            'reserved_quantity', totals.reserved_quantity,
+            'delta_available', NEW.delta_available,
+            'delta_reserved', NEW.delta_reserved,
+            'reason', NEW.reason,
+            'idempotency_key', NEW.idempotency_key,
+            'movement_id', NEW.id,
+            'occurred_at', NEW.created_at
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER stock_movements_enqueue_event
+    AFTER INSERT ON stock_movements
+    FOR EACH ROW WHEN (
+        NEW.reason <> 'reshard' AND current_setting('inventory.outbox_enabled', true) = 'on'
+    )
+    EXECUTE FUNCTION enqueue_stock_event()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS stock_movements_enqueue_event ON stock_movements")
+    op.execute("DROP FUNCTION IF EXISTS enqueue_stock_event()")
+    op.drop_table('outbox_events')
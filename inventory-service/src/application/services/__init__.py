@@ -1,3 +1,5 @@
 from src.application.services.inventory_service import InventoryService
+from src.application.services.reservation_service import ReservationService
+from src.application.services.stock_movement_service import StockMovementService
 
-__all__ = ["InventoryService"]
\ No newline at end of file
+__all__ = ["InventoryService", "ReservationService", "StockMovementService"]
@@ -1,36 +1,167 @@
-from datetime import datetime, timezone
-from src.domain.entities import Inventory
+from typing import AsyncIterator, Dict, List, Optional
+from pydantic import ValidationError
+from src.domain.entities import Inventory, InventoryShard
 from src.domain.repositories import InventoryInterface
-from src.infrastructure.schemas import InventoryCreateSchema, InventoryUpdateSchema
+from src.infrastructure.config import (
+    INVENTORY_IMPORT_CHUNK_SIZE,
+    INVENTORY_IMPORT_MAX_ERRORS,
+    INVENTORY_EXPORT_PAGE_SIZE
+)
+from src.infrastructure.importers.stock_level_reader import StockLevelRecord
+from src.infrastructure.notifications import LowStockNotifier
+from src.infrastructure.schemas import (
+    InventoryCreateSchema,
+    InventoryUpdateSchema,
+    InventoryImportRowSchema,
+    InventoryBatchReserveSchema,
+    InventoryReorderThresholdSchema,
+    InventoryShardingSchema
+)
+
+def import_error_message(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
 
 class InventoryService:
-    def __init__(self, inventory_repository: InventoryInterface):
+    def __init__(self, inventory_repository: InventoryInterface, low_stock_notifier: Optional[LowStockNotifier] = None):
         self.inventory_repository = inventory_repository
+        self.low_stock_notifier = low_stock_notifier
 
     async def get_inventory_by_uid(self, product_uid: str) -> Inventory:
         return await self.inventory_repository.get_inventory_by_uid(product_uid)
 
+    def get_inventories_by_uids(self, product_uids: List[str]) -> AsyncIterator[Inventory]:
+        # Preserve the caller's order while dropping duplicates.
+        return self.inventory_repository.get_inventories_by_uids(list(dict.fromkeys(product_uids)))
+
+    async def list_inventories(
+        self,
+        after_id: int,
+        limit: int,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+    ) -> List[Inventory]:
+        return await self.inventory_repository.list_inventories(after_id, limit, max_available, has_reservations)
+
+    async def export_inventories(
+        self,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+        page_size: int = INVENTORY_EXPORT_PAGE_SIZE,
+    ) -> AsyncIterator[List[Inventory]]:
+        """Every matching inventory, in pages of ``page_size`` following ``id``.
+
+        Only one page is held at a time. Pages are separate queries, so a row
+        changed during the export shows the value it had when its page was read.
+        """
+        after_id = 0
+        while True:
+            page = await self.inventory_repository.list_inventories(after_id, page_size, max_available, has_reservations)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after_id = page[-1].id
+
     async def create_inventory(self, inventory_schema: InventoryCreateSchema) -> Inventory:
         inventory = Inventory(
             product_uid=inventory_schema.product_uid,
             quantity_available=inventory_schema.quantity_available,
-            reserved_quantity=inventory_schema.reserved_quantity
+            reserved_quantity=inventory_schema.reserved_quantity,
+            reorder_threshold=inventory_schema.reorder_threshold
         )
         return await self.inventory_repository.create_inventory(inventory)
 
-    async def update_inventory(self, product_uid: str, inventory_schema: InventoryUpdateSchema) -> None:
-        # First get the current inventory
-        current_inventory = await self.inventory_repository.get_inventory_by_uid(product_uid)
-        
-        # Update only the quantity_available field
-        current_inventory.quantity_available = inventory_schema.quantity_available
-        current_inventory.updated_at = datetime.now(timezone.utc)
-        
-        # Save the updated inventory
-        await self.inventory_repository.update_inventory(current_inventory)
-
-    async def reserve_inventory(self, product_uid: str, amount: int) -> None:
-        await self.inventory_repository.reserve_inventory(product_uid, amount)
-
-    async def release_inventory(self, product_uid: str, amount: int) -> None:
-        await self.inventory_repository.release_inventory(product_uid, amount)
+    async def update_inventory(self, product_uid: str, inventory_schema: InventoryUpdateSchema) -> Inventory:
+        # Update only the quantity_available field, in a single statement
+        inventory = Inventory(
+            product_uid=product_uid,
+            quantity_available=inventory_schema.quantity_available
+        )
+        return await self.inventory_repository.update_inventory(inventory)
+
+    async def import_stock_levels(
+        self,
+        batches: AsyncIterator[List[StockLevelRecord]],
+        chunk_size: int = INVENTORY_IMPORT_CHUNK_SIZE,
+        max_errors: int = INVENTORY_IMPORT_MAX_ERRORS,
+    ) -> AsyncIterator[dict]:
+        """Upsert the stock levels read from ``batches`` and yield a report as they are applied.
+
+        Valid rows are written ``chunk_size`` at a time, one transaction per
+        chunk, so an interrupted import keeps the chunks already written and
+        memory stays bounded. When a product appears more than once, the
+        last row wins. Yields an ``error`` event for each of the first
+        ``max_errors`` invalid rows, a ``progress`` event per chunk written
+        and a final ``done`` event, each with the running counts.
+        """
+        counts = dict(processed=0, inserted=0, updated=0, unchanged=0, failed=0)
+        chunk: Dict[str, int] = {}
+
+        async def write_chunk():
+            inserted, updated = await self.inventory_repository.upsert_stock_levels(list(chunk.items()))
+            counts["inserted"] += inserted
+            counts["updated"] += updated
+            counts["unchanged"] += len(chunk) - inserted - updated
+            chunk.clear()
+
+        async for records in batches:
+            for line, fields in records:
+                counts["processed"] += 1
+                try:
+                    if isinstance(fields, ValueError):
+                        raise fields
+                    row = InventoryImportRowSchema.model_validate(fields)
+                except ValueError as e:
+                    counts["failed"] += 1
+                    if counts["failed"] <= max_errors:
+                        yield {"event": "error", "line": line, "error": import_error_message(e)}
+                    continue
+                chunk[row.product_uid] = row.quantity_available
+                if len(chunk) >= chunk_size:
+                    await write_chunk()
+                    yield {"event": "progress", **counts}
+        if chunk:
+            await write_chunk()
+        yield {"event": "done", **counts}
+
+    async def list_low_stock(self, after_id: int, limit: int) -> List[Inventory]:
+        return await self.inventory_repository.list_low_stock(after_id, limit)
+
+    async def set_reorder_threshold(self, product_uid: str, threshold_schema: InventoryReorderThresholdSchema) -> Inventory:
+        return await self.inventory_repository.set_reorder_threshold(product_uid, threshold_schema.reorder_threshold)
+
+    async def reserve_inventory(self, product_uid: str, amount: int) -> Inventory:
+        inventory = await self.inventory_repository.reserve_inventory(product_uid, amount)
+        self._notify_crossing(inventory, amount)
+        return inventory
+
+    async def release_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self.inventory_repository.release_inventory(product_uid, amount)
+
+    async def reserve_inventory_batch(self, batch_schema: InventoryBatchReserveSchema) -> List[Inventory]:
+        items = [(item.product_uid, item.amount) for item in batch_schema.items]
+        inventories = await self.inventory_repository.reserve_inventory_batch(items)
+        if self.low_stock_notifier is not None:
+            amounts: Dict[str, int] = {}
+            for product_uid, amount in items:
+                amounts[product_uid] = amounts.get(product_uid, 0) + amount
+            for inventory in inventories:
+                self._notify_crossing(inventory, amounts[inventory.product_uid])
+        return inventories
+
+    async def enable_sharding(self, product_uid: str, sharding_schema: InventoryShardingSchema) -> Inventory:
+        return await self.inventory_repository.set_shard_count(product_uid, sharding_schema.shard_count)
+
+    async def disable_sharding(self, product_uid: str) -> Inventory:
+        return await self.inventory_repository.set_shard_count(product_uid, 0)
+
+    async def get_inventory_shards(self, product_uid: str) -> List[InventoryShard]:
+        return await self.inventory_repository.get_inventory_shards(product_uid)
+
+    def _notify_crossing(self, inventory: Inventory, reserved: int) -> None:
+        if self.low_stock_notifier is not None and inventory.crossed_reorder_threshold(reserved):
+            self.low_stock_notifier.publish(inventory)
@@ -0,0 +1,51 @@
+from typing import Optional
+
+from src.domain.entities import Reservation
+from src.domain.repositories import ReservationInterface
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.database import UnitOfWork
+from src.infrastructure.schemas import ReservationCreateSchema
+
+class ReservationService:
+    def __init__(
+        self,
+        reservation_repository: ReservationInterface,
+        cache: Optional[InventoryCache] = None,
+        unit_of_work: Optional[UnitOfWork] = None,
+    ):
+        self.reservation_repository = reservation_repository
+        self.cache = cache
+        self.unit_of_work = unit_of_work
+
+    async def create_reservation(self, reservation_schema: ReservationCreateSchema) -> Reservation:
+        reservation = Reservation.with_ttl(
+            product_uid=reservation_schema.product_uid,
+            amount=reservation_schema.amount,
+            ttl_seconds=reservation_schema.ttl_seconds
+        )
+        reservation = await self.reservation_repository.create_reservation(reservation)
+        self._invalidate(reservation.product_uid)
+        return reservation
+
+    async def get_reservation(self, reservation_id: str) -> Reservation:
+        return await self.reservation_repository.get_reservation(reservation_id)
+
+    async def release_reservation(self, reservation_id: str) -> Reservation:
+        reservation = await self.reservation_repository.release_reservation(reservation_id)
+        self._invalidate(reservation.product_uid)
+        return reservation
+
+    async def confirm_reservation(self, reservation_id: str) -> Reservation:
+        reservation = await self.reservation_repository.confirm_reservation(reservation_id)
+        self._invalidate(reservation.product_uid)
+        return reservation
+
+    def _invalidate(self, product_uid: str) -> None:
+        # Stock changed underneath the inventory cache of this worker, once
+        # the unit of work, if any, commits.
+        if self.cache is None:
+            return
+        if self.unit_of_work is None:
+            self.cache.invalidate(product_uid)
+        else:
+            self.unit_of_work.after_commit(lambda: self.cache.invalidate(product_uid))
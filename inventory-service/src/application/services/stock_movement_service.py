@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.domain.entities import StockMovement, StockSnapshot
+from src.domain.exceptions import InventoryNotFoundError
+from src.domain.repositories import StockMovementInterface
+
+class StockMovementService:
+    def __init__(self, stock_movement_repository: StockMovementInterface):
+        self.stock_movement_repository = stock_movement_repository
+
+    async def list_movements(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        after: Optional[Tuple[datetime, int]],
+        limit: int,
+        product_uid: Optional[str] = None,
+    ) -> List[StockMovement]:
+        return await self.stock_movement_repository.list_movements(since, until, after, limit, product_uid)
+
+    async def get_stock_at(self, product_uid: str, at: datetime) -> StockSnapshot:
+        snapshot = await self.stock_movement_repository.get_stock_at(product_uid, at)
+        if snapshot is None:
+            # The product had no stock recorded yet at that time.
+            raise InventoryNotFoundError(product_uid)
+        return snapshot
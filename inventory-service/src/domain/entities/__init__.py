@@ -1,3 +1,8 @@
 from src.domain.entities.inventory import Inventory
+from src.domain.entities.inventory_shard import InventoryShard
+from src.domain.entities.reservation import Reservation
+from src.domain.entities.idempotency_record import IdempotencyRecord
+from src.domain.entities.stock_movement import StockMovement
+from src.domain.entities.stock_snapshot import StockSnapshot
 
-__all__ = ["Inventory"]
+__all__ = ["Inventory", "InventoryShard", "Reservation", "IdempotencyRecord", "StockMovement", "StockSnapshot"]
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+class IdempotencyRecord:
+    def __init__(
+        self,
+        key: str,
+        fingerprint: str,
+        expires_at: datetime,
+        status_code: Optional[int] = None,
+        response: Optional[dict] = None,
+    ):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.status_code = status_code
+        self.response = response
+
+    @classmethod
+    def with_ttl(cls, key: str, fingerprint: str, ttl_seconds: int) -> 'IdempotencyRecord':
+        return cls(key=key, fingerprint=fingerprint, expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds))
+
+    def is_complete(self) -> bool:
+        return self.status_code is not None
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        return self.expires_at <= (now or datetime.now(timezone.utc))
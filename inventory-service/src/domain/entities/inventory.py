@@ -2,6 +2,12 @@ from datetime import datetime, timezone
 from typing import Optional
 
 class Inventory:
+    # Bulk reads build one per row: slots save the per-instance dict.
+    __slots__ = (
+        "id", "product_uid", "quantity_available", "reserved_quantity",
+        "created_at", "updated_at", "shard_count", "reorder_threshold",
+    )
+
     def __init__(
         self,
         product_uid: str,
@@ -10,6 +16,8 @@ class Inventory:
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
         id: Optional[int] = None,
+        shard_count: int = 0,
+        reorder_threshold: Optional[int] = None,
     ):
         self.id = id
         self.product_uid = product_uid
@@ -17,6 +25,18 @@ class Inventory:
         self.reserved_quantity = reserved_quantity
         self.created_at = created_at or datetime.now(timezone.utc)
         self.updated_at = updated_at or datetime.now(timezone.utc)
+        # 0 when the stock lives on the inventory row itself, otherwise the
+        # number of sub-counters it is split across.
+        self.shard_count = shard_count
+        # Stock level at or below which the product should be reordered.
+        self.reorder_threshold = reorder_threshold
+
+    def is_low_stock(self) -> bool:
+        return self.reorder_threshold is not None and self.quantity_available <= self.reorder_threshold
+
+    def crossed_reorder_threshold(self, reserved: int) -> bool:
+        """Whether reserving ``reserved`` units, already applied, took the stock down to the threshold."""
+        return self.is_low_stock() and self.quantity_available + reserved > self.reorder_threshold
 
     def reserve(self, amount: int):
         if self.quantity_available < amount:
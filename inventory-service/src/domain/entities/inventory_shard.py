@@ -0,0 +1,6 @@
+class InventoryShard:
+    def __init__(self, product_uid: str, shard: int, quantity_available: int, reserved_quantity: int = 0):
+        self.product_uid = product_uid
+        self.shard = shard
+        self.quantity_available = quantity_available
+        self.reserved_quantity = reserved_quantity
@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+class Reservation:
+    def __init__(
+        self,
+        product_uid: str,
+        amount: int,
+        expires_at: datetime,
+        created_at: Optional[datetime] = None,
+        id: Optional[str] = None,
+    ):
+        self.id = id
+        self.product_uid = product_uid
+        self.amount = amount
+        self.expires_at = expires_at
+        self.created_at = created_at or datetime.now(timezone.utc)
+
+    @classmethod
+    def with_ttl(cls, product_uid: str, amount: int, ttl_seconds: int) -> 'Reservation':
+        now = datetime.now(timezone.utc)
+        return cls(product_uid=product_uid, amount=amount, expires_at=now + timedelta(seconds=ttl_seconds), created_at=now)
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        return self.expires_at <= (now or datetime.now(timezone.utc))
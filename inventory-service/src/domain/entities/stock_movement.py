@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional
+
+class StockMovement:
+    """One change of the stock counters of a product, as recorded in the ledger.
+
+    Deltas are signed: a reservation of 3 units is ``delta_available=-3,
+    delta_reserved=3``. Summing the deltas of a product up to a point in time
+    gives its counters at that time.
+    """
+    def __init__(
+        self,
+        product_uid: str,
+        delta_available: int,
+        delta_reserved: int,
+        reason: str,
+        created_at: datetime,
+        idempotency_key: Optional[str] = None,
+        id: Optional[int] = None,
+    ):
+        self.id = id
+        self.product_uid = product_uid
+        self.delta_available = delta_available
+        self.delta_reserved = delta_reserved
+        self.reason = reason
+        self.idempotency_key = idempotency_key
+        self.created_at = created_at
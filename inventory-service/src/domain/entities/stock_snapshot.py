@@ -0,0 +1,9 @@
+from datetime import datetime
+
+class StockSnapshot:
+    """Stock counters of a product as of ``taken_at``."""
+    def __init__(self, product_uid: str, taken_at: datetime, quantity_available: int, reserved_quantity: int):
+        self.product_uid = product_uid
+        self.taken_at = taken_at
+        self.quantity_available = quantity_available
+        self.reserved_quantity = reserved_quantity
@@ -0,0 +1,25 @@
+from src.domain.exceptions.inventory_exceptions import (
+    InventoryError,
+    InventoryNotFoundError,
+    InventoryAlreadyExistsError,
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError,
+    ReservationNotFoundError
+)
+from src.domain.exceptions.idempotency_exceptions import (
+    IdempotencyError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyMismatchError
+)
+
+__all__ = [
+    "InventoryError",
+    "InventoryNotFoundError",
+    "InventoryAlreadyExistsError",
+    "InsufficientInventoryError",
+    "InsufficientReservedInventoryError",
+    "ReservationNotFoundError",
+    "IdempotencyError",
+    "IdempotencyKeyInProgressError",
+    "IdempotencyKeyMismatchError"
+]
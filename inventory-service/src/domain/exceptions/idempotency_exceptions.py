@@ -0,0 +1,14 @@
+class IdempotencyError(ValueError):
+    """Base class for Idempotency-Key errors."""
+
+
+class IdempotencyKeyInProgressError(IdempotencyError):
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"A request with Idempotency-Key {key} is still in progress")
+
+
+class IdempotencyKeyMismatchError(IdempotencyError):
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"Idempotency-Key {key} was already used with a different request")
@@ -0,0 +1,36 @@
+class InventoryError(ValueError):
+    """Base class for inventory domain errors."""
+
+
+class InventoryNotFoundError(InventoryError):
+    def __init__(self, product_uid: str):
+        self.product_uid = product_uid
+        super().__init__(f"Inventory not found for product_uid: {product_uid}")
+
+
+class InventoryAlreadyExistsError(InventoryError):
+    def __init__(self, product_uid: str):
+        self.product_uid = product_uid
+        super().__init__(f"Inventory already exists for product_uid: {product_uid}")
+
+
+class InsufficientInventoryError(InventoryError):
+    def __init__(self, product_uid: str, available: int, requested: int):
+        self.product_uid = product_uid
+        self.available = available
+        self.requested = requested
+        super().__init__(f"Not enough inventory available. Available: {available}, Requested: {requested}")
+
+
+class InsufficientReservedInventoryError(InventoryError):
+    def __init__(self, product_uid: str, reserved: int, requested: int):
+        self.product_uid = product_uid
+        self.reserved = reserved
+        self.requested = requested
+        super().__init__(f"Not enough reserved inventory. Reserved: {reserved}, Requested: {requested}")
+
+
+class ReservationNotFoundError(InventoryError):
+    def __init__(self, reservation_id: str):
+        self.reservation_id = reservation_id
+        super().__init__(f"Reservation not found: {reservation_id}")
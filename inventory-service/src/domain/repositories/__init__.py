@@ -1,3 +1,6 @@
 from src.domain.repositories.inventory_interface import InventoryInterface
+from src.domain.repositories.reservation_interface import ReservationInterface
+from src.domain.repositories.idempotency_interface import IdempotencyInterface
+from src.domain.repositories.stock_movement_interface import StockMovementInterface
 
-__all__ = ["InventoryInterface"]
\ No newline at end of file
+__all__ = ["InventoryInterface", "ReservationInterface", "IdempotencyInterface", "StockMovementInterface"]
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from src.domain.entities import IdempotencyRecord
+
+class IdempotencyInterface(ABC):
+    @abstractmethod
+    def claim(self, record: IdempotencyRecord) -> Optional[IdempotencyRecord]:
+        """Claim ``record.key``, or return the completed record it already holds."""
+        pass
+
+    @abstractmethod
+    def complete(self, record: IdempotencyRecord) -> None:
+        pass
+
+    @abstractmethod
+    def discard(self, record: IdempotencyRecord) -> None:
+        pass
@@ -1,23 +1,62 @@
 from abc import ABC, abstractmethod
-from src.domain.entities import Inventory
+from typing import AsyncIterator, List, Optional, Tuple
+from src.domain.entities import Inventory, InventoryShard
 
 class InventoryInterface(ABC):
     @abstractmethod
     def get_inventory_by_uid(self, product_uid: str) -> Inventory:
         pass
 
+    @abstractmethod
+    def get_inventories_by_uids(self, product_uids: List[str]) -> AsyncIterator[Inventory]:
+        pass
+
+    @abstractmethod
+    def list_inventories(
+        self,
+        after_id: int,
+        limit: int,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+    ) -> List[Inventory]:
+        pass
+
+    @abstractmethod
+    def list_low_stock(self, after_id: int, limit: int) -> List[Inventory]:
+        pass
+
     @abstractmethod
     def create_inventory(self, inventory: Inventory) -> Inventory:
         pass
 
     @abstractmethod
-    def update_inventory(self, inventory: Inventory) -> None:
+    def update_inventory(self, inventory: Inventory) -> Inventory:
+        pass
+
+    @abstractmethod
+    def upsert_stock_levels(self, levels: List[Tuple[str, int]]) -> Tuple[int, int]:
+        pass
+
+    @abstractmethod
+    def reserve_inventory(self, product_uid: str, amount: int) -> Inventory:
+        pass
+
+    @abstractmethod
+    def release_inventory(self, product_uid: str, amount: int) -> Inventory:
+        pass
+
+    @abstractmethod
+    def reserve_inventory_batch(self, items: List[Tuple[str, int]]) -> List[Inventory]:
+        pass
+
+    @abstractmethod
+    def set_reorder_threshold(self, product_uid: str, reorder_threshold: Optional[int]) -> Inventory:
         pass
 
     @abstractmethod
-    def reserve_inventory(self, product_uid: str, amount: int) -> None:
+    def set_shard_count(self, product_uid: str, shard_count: int) -> Inventory:
         pass
 
     @abstractmethod
-    def release_inventory(self, product_uid: str, amount: int) -> None:
+    def get_inventory_shards(self, product_uid: str) -> List[InventoryShard]:
         pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+from src.domain.entities import Reservation
+
+class ReservationInterface(ABC):
+    @abstractmethod
+    def create_reservation(self, reservation: Reservation) -> Reservation:
+        pass
+
+    @abstractmethod
+    def get_reservation(self, reservation_id: str) -> Reservation:
+        pass
+
+    @abstractmethod
+    def release_reservation(self, reservation_id: str) -> Reservation:
+        pass
+
+    @abstractmethod
+    def confirm_reservation(self, reservation_id: str) -> Reservation:
+        pass
+
+    @abstractmethod
+    def release_expired_reservations(self, limit: int) -> List[Tuple[str, int]]:
+        pass
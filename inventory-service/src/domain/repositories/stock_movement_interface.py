@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+from src.domain.entities import StockMovement, StockSnapshot
+
+class StockMovementInterface(ABC):
+    @abstractmethod
+    def list_movements(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        after: Optional[Tuple[datetime, int]],
+        limit: int,
+        product_uid: Optional[str] = None,
+    ) -> List[StockMovement]:
+        pass
+
+    @abstractmethod
+    def get_stock_at(self, product_uid: str, at: datetime) -> Optional[StockSnapshot]:
+        pass
@@ -0,0 +1,3 @@
+from src.infrastructure.brokers.reservation_broker import ReservationBroker
+
+__all__ = ["ReservationBroker"]
@@ -0,0 +1,4 @@
+from src.infrastructure.cache.inventory_cache import InventoryCache
+from src.infrastructure.cache.idempotency_cache import IdempotencyCache
+
+__all__ = ["InventoryCache", "IdempotencyCache"]
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from typing import Optional
+
+from src.domain.entities import IdempotencyRecord
+from src.domain.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyMismatchError
+from src.domain.repositories import IdempotencyInterface
+from src.infrastructure.config import IDEMPOTENCY_MEMORY_MAX_KEYS
+
+class IdempotencyCache(IdempotencyInterface):
+    """Per-process LRU of Idempotency-Key records for single-node deployments.
+
+    Keys are claimed before the operation runs and hold its response once it
+    succeeds. A key is forgotten when it expires, when its operation fails or
+    when it is evicted to stay within ``max_size``.
+    """
+    _instance: Optional['IdempotencyCache'] = None
+
+    def __init__(self, max_size: int = IDEMPOTENCY_MEMORY_MAX_KEYS):
+        self.max_size = max_size
+        self._records: OrderedDict[str, IdempotencyRecord] = OrderedDict()
+
+    @classmethod
+    def get_instance(cls) -> 'IdempotencyCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    async def claim(self, record: IdempotencyRecord) -> Optional[IdempotencyRecord]:
+        existing = self._records.get(record.key)
+        if existing is not None and existing.is_expired():
+            del self._records[record.key]
+            existing = None
+
+        if existing is None:
+            self._store(record)
+            return None
+
+        self._records.move_to_end(record.key)
+        if existing.fingerprint != record.fingerprint:
+            raise IdempotencyKeyMismatchError(record.key)
+        if not existing.is_complete():
+            raise IdempotencyKeyInProgressError(record.key)
+        return existing
+
+    async def complete(self, record: IdempotencyRecord) -> None:
+        self._store(record)
+
+    async def discard(self, record: IdempotencyRecord) -> None:
+        if self._records.get(record.key) is record:
+            del self._records[record.key]
+
+    def _store(self, record: IdempotencyRecord) -> None:
+        self._records[record.key] = record
+        self._records.move_to_end(record.key)
+        while len(self._records) > self.max_size:
+            self._records.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,93 @@
+import copy
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.domain.entities import Inventory
+from src.infrastructure.config import INVENTORY_CACHE_MAX_SIZE, INVENTORY_CACHE_TTL
+
+class InventoryCache:
+    """Per-process LRU of inventories keyed by product_uid, with a per-entry TTL.
+
+    The TTL is the maximum staleness of a read served from memory. Writes made
+    through this process invalidate or refresh entries immediately.
+    """
+    _instance: Optional['InventoryCache'] = None
+
+    def __init__(self, max_size: int = INVENTORY_CACHE_MAX_SIZE, ttl: float = INVENTORY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[Inventory, float]] = OrderedDict()
+        # Pending read-through fills by product_uid. Invalidating a key cancels
+        # its fill, so a read that raced with a write cannot store the old value.
+        self._fills: dict[str, object] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def get_instance(cls) -> 'InventoryCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def begin_fill(self, product_uid: str) -> object:
+        token = object()
+        self._fills[product_uid] = token
+        return token
+
+    def get(self, product_uid: str) -> Optional[Inventory]:
+        entry = self._entries.get(product_uid)
+        if entry is None:
+            self.misses += 1
+            return None
+        inventory, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[product_uid]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(product_uid)
+        self.hits += 1
+        # Callers may mutate the entity they get back.
+        return copy.copy(inventory)
+
+    def set(self, inventory: Inventory, fill_token: Optional[object] = None) -> None:
+        if fill_token is not None:
+            if self._fills.get(inventory.product_uid) is not fill_token:
+                return
+            del self._fills[inventory.product_uid]
+        self._entries[inventory.product_uid] = (copy.copy(inventory), time.monotonic() + self.ttl)
+        self._entries.move_to_end(inventory.product_uid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def cancel_fill(self, product_uid: str, fill_token: object) -> None:
+        if self._fills.get(product_uid) is fill_token:
+            del self._fills[product_uid]
+
+    def invalidate(self, product_uid: str) -> None:
+        self._fills.pop(product_uid, None)
+        self._entries.pop(product_uid, None)
+
+    def apply_change(self, operation: str, inventory: Inventory) -> None:
+        # Evict rather than patch: a notification can be delivered after a
+        # local fill that already read a newer row.
+        self.invalidate(inventory.product_uid)
+
+    def clear(self) -> None:
+        self._fills.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
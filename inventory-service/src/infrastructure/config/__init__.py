@@ -1,3 +1,170 @@
 from decouple import config
+from loguru import logger
 
-POSTGRES_URL = config("POSTGRES_URL")
+def _bounded(name: str, default, minimum, cast=int):
+    value = config(name, default=default, cast=cast)
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}, got {value}")
+    return value
+
+# 'memory' keeps inventories in process, for tests and benchmarks of the
+# service and HTTP layers: only the inventory routes are served and the
+# Postgres-backed background tasks are not started.
+DATABASE_STRATEGY = config("DATABASE_STRATEGY", default="sqlalchemy")
+if DATABASE_STRATEGY not in ("sqlalchemy", "memory"):
+    raise ValueError(f"DATABASE_STRATEGY must be 'sqlalchemy' or 'memory', got {DATABASE_STRATEGY}")
+POSTGRES_URL = config("POSTGRES_URL") if DATABASE_STRATEGY == "sqlalchemy" else config("POSTGRES_URL", default="")
+
+# Engine and connection pool
+DB_POOL_SIZE = _bounded("DB_POOL_SIZE", 10, 1)
+DB_MAX_OVERFLOW = _bounded("DB_MAX_OVERFLOW", 20, 0)
+DB_POOL_TIMEOUT = _bounded("DB_POOL_TIMEOUT", 30.0, 0, cast=float)
+DB_POOL_RECYCLE = _bounded("DB_POOL_RECYCLE", 3600, -1)
+# Pre-ping costs a round trip per checkout. When disabled, a dead connection
+# surfaces as an error on first use and SQLAlchemy invalidates the pool.
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=True, cast=bool)
+DB_POOL_WARMUP = config("DB_POOL_WARMUP", default=True, cast=bool)
+DB_CONNECT_RETRIES = _bounded("DB_CONNECT_RETRIES", 5, 1)
+DB_CONNECT_RETRY_DELAY = _bounded("DB_CONNECT_RETRY_DELAY", 1.0, 0, cast=float)
+DB_CONNECT_TIMEOUT = _bounded("DB_CONNECT_TIMEOUT", 30.0, 0, cast=float)
+DB_COMMAND_TIMEOUT = _bounded("DB_COMMAND_TIMEOUT", 30.0, 0, cast=float)
+# Prepared statements cached per connection; 0 disables caching (pgbouncer in
+# transaction mode).
+DB_STATEMENT_CACHE_SIZE = _bounded("DB_STATEMENT_CACHE_SIZE", 100, 0)
+DB_ECHO = config("DB_ECHO", default=False, cast=bool)
+
+INVENTORY_LOOKUP_MAX_UIDS = _bounded("INVENTORY_LOOKUP_MAX_UIDS", 5000, 1)
+INVENTORY_LIST_DEFAULT_LIMIT = _bounded("INVENTORY_LIST_DEFAULT_LIMIT", 100, 1)
+INVENTORY_LIST_MAX_LIMIT = _bounded("INVENTORY_LIST_MAX_LIMIT", 1000, 1)
+# Rows fetched per keyset page by the full export, each page its own query.
+INVENTORY_EXPORT_PAGE_SIZE = _bounded("INVENTORY_EXPORT_PAGE_SIZE", 5000, 1)
+# Rows taken at once from the server-side cursor of a lookup.
+INVENTORY_STREAM_PARTITION_SIZE = _bounded("INVENTORY_STREAM_PARTITION_SIZE", 1000, 1)
+
+# Bulk imports upsert this many rows per statement and transaction, and report
+# at most INVENTORY_IMPORT_MAX_ERRORS invalid rows individually.
+INVENTORY_IMPORT_CHUNK_SIZE = _bounded("INVENTORY_IMPORT_CHUNK_SIZE", 5000, 1)
+INVENTORY_IMPORT_MAX_ERRORS = _bounded("INVENTORY_IMPORT_MAX_ERRORS", 1000, 0)
+
+INVENTORY_CACHE_ENABLED = config("INVENTORY_CACHE_ENABLED", default=False, cast=bool)
+INVENTORY_CACHE_MAX_SIZE = _bounded("INVENTORY_CACHE_MAX_SIZE", 10000, 1)
+INVENTORY_CACHE_TTL = _bounded("INVENTORY_CACHE_TTL", 1.0, 0.001, cast=float)
+
+# Hot products can split their stock across up to this many counter rows.
+INVENTORY_MAX_SHARDS = _bounded("INVENTORY_MAX_SHARDS", 64, 1)
+SHARD_REBALANCER_ENABLED = config("SHARD_REBALANCER_ENABLED", default=True, cast=bool)
+SHARD_REBALANCE_INTERVAL = _bounded("SHARD_REBALANCE_INTERVAL", 5.0, 0, cast=float)
+SHARD_REBALANCE_BATCH_SIZE = _bounded("SHARD_REBALANCE_BATCH_SIZE", 100, 1)
+
+# Reservations taking a product down to its reorder threshold are POSTed here;
+# empty disables the push.
+LOW_STOCK_WEBHOOK_URL = config("LOW_STOCK_WEBHOOK_URL", default="")
+LOW_STOCK_WEBHOOK_TIMEOUT = _bounded("LOW_STOCK_WEBHOOK_TIMEOUT", 5.0, 0, cast=float)
+LOW_STOCK_QUEUE_SIZE = _bounded("LOW_STOCK_QUEUE_SIZE", 10000, 1)
+
+# Reservations of the same product arriving within the window are applied as
+# one UPDATE by a per-process broker, at the cost of up to one window of latency.
+RESERVATION_BROKER_ENABLED = config("RESERVATION_BROKER_ENABLED", default=False, cast=bool)
+RESERVATION_BROKER_WINDOW = _bounded("RESERVATION_BROKER_WINDOW", 0.003, 0, cast=float)
+RESERVATION_BROKER_MAX_BATCH = _bounded("RESERVATION_BROKER_MAX_BATCH", 256, 1)
+
+# Every product whose stock moved gets a ledger snapshot at each multiple of
+# STOCK_SNAPSHOT_PERIOD seconds, so the stock at any time is rebuilt from one
+# snapshot and at most one period of movements. Snapshots wait
+# STOCK_SNAPSHOT_LAG seconds past their time for transactions still writing
+# movements before it; keep it above the longest write transaction.
+STOCK_SNAPSHOTTER_ENABLED = config("STOCK_SNAPSHOTTER_ENABLED", default=True, cast=bool)
+STOCK_SNAPSHOT_PERIOD = _bounded("STOCK_SNAPSHOT_PERIOD", 3600, 1)
+STOCK_SNAPSHOT_LAG = _bounded("STOCK_SNAPSHOT_LAG", 60.0, 0, cast=float)
+STOCK_SNAPSHOT_INTERVAL = _bounded("STOCK_SNAPSHOT_INTERVAL", 60.0, 0, cast=float)
+STOCK_SNAPSHOT_BATCH_SIZE = _bounded("STOCK_SNAPSHOT_BATCH_SIZE", 1000, 1)
+
+# Stock changes are written to an outbox in the writing transaction and relayed
+# at least once to OUTBOX_SINK: "webhook" POSTs each batch as a JSON array,
+# "file" appends NDJSON lines, "memory" keeps them in process (tests).
+# Whether writes record their events. The relay may run in any replica, so
+# this is a deployment-wide setting: every writer, the API replicas as well as
+# the import command, must share it, or the events of some writes are lost.
+# Turn it off everywhere only when no replica runs the relay, since nothing
+# else drains the table.
+OUTBOX_ENABLED = config("OUTBOX_ENABLED", default=True, cast=bool)
+# Whether this process relays the recorded events. Relays lease their batches,
+# so several replicas may run one.
+OUTBOX_RELAY_ENABLED = config("OUTBOX_RELAY_ENABLED", default=False, cast=bool)
+if OUTBOX_RELAY_ENABLED and not OUTBOX_ENABLED:
+    raise ValueError("OUTBOX_ENABLED must be on where the outbox relay runs")
+OUTBOX_SINK = config("OUTBOX_SINK", default="webhook")
+if OUTBOX_SINK not in ("webhook", "file", "memory"):
+    raise ValueError(f"OUTBOX_SINK must be 'webhook', 'file' or 'memory', got {OUTBOX_SINK}")
+OUTBOX_WEBHOOK_URL = config("OUTBOX_WEBHOOK_URL", default="")
+OUTBOX_WEBHOOK_TIMEOUT = _bounded("OUTBOX_WEBHOOK_TIMEOUT", 10.0, 0, cast=float)
+OUTBOX_FILE_PATH = config("OUTBOX_FILE_PATH", default="stock-events.ndjson")
+OUTBOX_BATCH_SIZE = _bounded("OUTBOX_BATCH_SIZE", 500, 1)
+OUTBOX_POLL_INTERVAL = _bounded("OUTBOX_POLL_INTERVAL", 0.5, 0, cast=float)
+# Failed deliveries are retried after 1, 2, 4... seconds, up to this many.
+OUTBOX_MAX_RETRY_DELAY = _bounded("OUTBOX_MAX_RETRY_DELAY", 60.0, 0, cast=float)
+# A claimed batch is left to other relays after this many seconds without
+# being delivered, so it must outlast a delivery attempt.
+OUTBOX_LEASE = _bounded("OUTBOX_LEASE", 60.0, 1, cast=float)
+if OUTBOX_SINK == "webhook" and OUTBOX_LEASE <= OUTBOX_WEBHOOK_TIMEOUT:
+    raise ValueError("OUTBOX_LEASE must be longer than OUTBOX_WEBHOOK_TIMEOUT")
+if OUTBOX_RELAY_ENABLED and OUTBOX_SINK == "webhook" and not OUTBOX_WEBHOOK_URL:
+    raise ValueError("OUTBOX_WEBHOOK_URL is required when OUTBOX_RELAY_ENABLED with the webhook sink")
+
+# Live stock pushed over SSE and WebSocket, fed by the change listener. Changes
+# are coalesced per product over STOCK_STREAM_COALESCE_INTERVAL seconds.
+STOCK_STREAM_ENABLED = config("STOCK_STREAM_ENABLED", default=False, cast=bool)
+STOCK_STREAM_COALESCE_INTERVAL = _bounded("STOCK_STREAM_COALESCE_INTERVAL", 0.1, 0, cast=float)
+STOCK_STREAM_HEARTBEAT_INTERVAL = _bounded("STOCK_STREAM_HEARTBEAT_INTERVAL", 15.0, 1, cast=float)
+STOCK_STREAM_MAX_UIDS = _bounded("STOCK_STREAM_MAX_UIDS", 100, 1)
+STOCK_STREAM_MAX_SUBSCRIBERS = _bounded("STOCK_STREAM_MAX_SUBSCRIBERS", 10000, 1)
+
+INVENTORY_CHANGE_CHANNEL = "inventory_changes"
+INVENTORY_CHANGE_LISTENER_ENABLED = config("INVENTORY_CHANGE_LISTENER_ENABLED", default=False, cast=bool)
+# Whether writes publish on INVENTORY_CHANGE_CHANNEL. The listeners may run in
+# any replica, so this is a deployment-wide setting: every writer, the API
+# replicas as well as the import command, must share it, or replicas serve
+# stale cache entries until their TTL. Every NOTIFY serializes commits
+# cluster-wide: turn it off everywhere only when no replica runs the cache
+# listener or the stock stream.
+INVENTORY_CHANGE_NOTIFY = config("INVENTORY_CHANGE_NOTIFY", default=True, cast=bool)
+if not INVENTORY_CHANGE_NOTIFY and (
+    (INVENTORY_CACHE_ENABLED and INVENTORY_CHANGE_LISTENER_ENABLED) or STOCK_STREAM_ENABLED
+):
+    raise ValueError("INVENTORY_CHANGE_NOTIFY must be on where the cache listener or the stock stream runs")
+
+RESERVATION_DEFAULT_TTL = _bounded("RESERVATION_DEFAULT_TTL", 900, 1)
+RESERVATION_MAX_TTL = _bounded("RESERVATION_MAX_TTL", 86400, 1)
+RESERVATION_SWEEPER_ENABLED = config("RESERVATION_SWEEPER_ENABLED", default=True, cast=bool)
+RESERVATION_SWEEP_INTERVAL = _bounded("RESERVATION_SWEEP_INTERVAL", 1.0, 0, cast=float)
+RESERVATION_SWEEP_BATCH_SIZE = _bounded("RESERVATION_SWEEP_BATCH_SIZE", 500, 1)
+
+# "postgres" claims keys in the same transaction as the inventory write and is
+# shared by all replicas; "memory" is a per-process LRU for single-node setups.
+IDEMPOTENCY_STORE = config("IDEMPOTENCY_STORE", default="memory" if DATABASE_STRATEGY == "memory" else "postgres")
+if IDEMPOTENCY_STORE not in ("postgres", "memory"):
+    raise ValueError(f"IDEMPOTENCY_STORE must be 'postgres' or 'memory', got {IDEMPOTENCY_STORE}")
+if IDEMPOTENCY_STORE == "postgres" and DATABASE_STRATEGY == "memory":
+    raise ValueError("IDEMPOTENCY_STORE must be 'memory' with the memory DATABASE_STRATEGY")
+IDEMPOTENCY_KEY_TTL = _bounded("IDEMPOTENCY_KEY_TTL", 86400, 1)
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_MEMORY_MAX_KEYS = _bounded("IDEMPOTENCY_MEMORY_MAX_KEYS", 100000, 1)
+IDEMPOTENCY_SWEEPER_ENABLED = config("IDEMPOTENCY_SWEEPER_ENABLED", default=True, cast=bool)
+IDEMPOTENCY_SWEEP_INTERVAL = _bounded("IDEMPOTENCY_SWEEP_INTERVAL", 60.0, 0, cast=float)
+IDEMPOTENCY_SWEEP_BATCH_SIZE = _bounded("IDEMPOTENCY_SWEEP_BATCH_SIZE", 1000, 1)
+
+LOG_LEVEL = config("LOG_LEVEL", default="INFO")
+LOG_SINK = config("LOG_SINK", default="stderr")
+LOG_SERIALIZE = config("LOG_SERIALIZE", default=False, cast=bool)
+LOG_ENQUEUE = config("LOG_ENQUEUE", default=False, cast=bool)
+
+POOL_STATS_ENABLED = config("POOL_STATS_ENABLED", default=True, cast=bool)
+POOL_STATS_SAMPLE_INTERVAL = _bounded("POOL_STATS_SAMPLE_INTERVAL", 1.0, 0.01, cast=float)
+POOL_STATS_REPORT_INTERVAL = _bounded("POOL_STATS_REPORT_INTERVAL", 60.0, POOL_STATS_SAMPLE_INTERVAL, cast=float)
+POOL_STATS_LOG_LEVEL = config("POOL_STATS_LOG_LEVEL", default="INFO")
+try:
+    logger.level(POOL_STATS_LOG_LEVEL)
+except ValueError:
+    raise ValueError(f"POOL_STATS_LOG_LEVEL must be a loguru level, got {POOL_STATS_LOG_LEVEL}") from None
+
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
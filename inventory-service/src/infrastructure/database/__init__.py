@@ -1,3 +1,4 @@
 from src.infrastructure.database.database_factory import DatabaseFactory
+from src.infrastructure.database.unit_of_work import UnitOfWork
 
-__all__ = ["DatabaseFactory"]
\ No newline at end of file
+__all__ = ["DatabaseFactory", "UnitOfWork"]
\ No newline at end of file
@@ -2,12 +2,14 @@ from typing import Type
 
 from src.infrastructure.database.database_strategy import DatabaseStrategy
 from src.infrastructure.database.sqlalchemy_strategy import SQLAlchemyStrategy
+from src.infrastructure.database.memory_strategy import MemoryStrategy
 
 from src.infrastructure.config import *
 
 class DatabaseFactory:
     _strategies = {
         'sqlalchemy': SQLAlchemyStrategy,
+        'memory': MemoryStrategy,
     }
 
     @classmethod
@@ -19,4 +21,4 @@ class DatabaseFactory:
 
     @classmethod
     def get_default_strategy(cls) -> Type[DatabaseStrategy]:
-        return cls.create_strategy('sqlalchemy') 
\ No newline at end of file
+        return cls.create_strategy(DATABASE_STRATEGY)
\ No newline at end of file
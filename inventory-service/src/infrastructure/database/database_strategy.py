@@ -5,6 +5,14 @@ class DatabaseStrategy(ABC):
     def get_instance(cls):
         pass
     
+    @abstractmethod
+    def startup(cls):
+        pass
+
+    @abstractmethod
+    def shutdown(cls):
+        pass
+
     @abstractmethod
     def get_session(cls):
         pass
@@ -14,5 +22,9 @@ class DatabaseStrategy(ABC):
         pass
     
     @abstractmethod
-    def get_session_with_retry(cls, max_retries=5, retry_delay=1):
+    def warm_up(cls):
+        pass
+
+    @abstractmethod
+    def get_pool_stats(cls):
         pass
@@ -0,0 +1,112 @@
+from array import array
+from collections.abc import AsyncGenerator
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.domain.entities import Inventory
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+
+# Stored in place of a missing reorder threshold, which cannot be negative.
+NO_THRESHOLD = -1
+
+class InventoryStore:
+    """Inventories held in process, in typed arrays indexed by slot.
+
+    A product's slot is its position in creation order, looked up by
+    ``product_uid`` in ``slots``, and its ``id`` is the slot plus one.
+    Counters and timestamps are packed machine values rather than an object
+    per product, so a million products take tens of megabytes and reads
+    allocate nothing until an ``Inventory`` is built. Nothing is ever
+    removed, as in ``InventoryInterface``.
+
+    Store methods never await: on the event loop each runs to completion
+    with no other task interleaved, so callers get atomic operations without
+    locks as long as they do not await between a check and a write.
+    """
+
+    def __init__(self):
+        self.slots: Dict[str, int] = {}
+        self.product_uids: List[str] = []
+        self.quantity_available = array("q")
+        self.reserved_quantity = array("q")
+        self.reorder_threshold = array("q")
+        self.shard_count = array("l")
+        # POSIX timestamps
+        self.created_at = array("d")
+        self.updated_at = array("d")
+
+    def __len__(self) -> int:
+        return len(self.product_uids)
+
+    def add(self, inventory: Inventory) -> int:
+        slot = len(self.product_uids)
+        self.slots[inventory.product_uid] = slot
+        self.product_uids.append(inventory.product_uid)
+        self.quantity_available.append(inventory.quantity_available)
+        self.reserved_quantity.append(inventory.reserved_quantity)
+        self.reorder_threshold.append(
+            NO_THRESHOLD if inventory.reorder_threshold is None else inventory.reorder_threshold
+        )
+        self.shard_count.append(inventory.shard_count)
+        self.created_at.append(inventory.created_at.timestamp())
+        self.updated_at.append(inventory.updated_at.timestamp())
+        return slot
+
+    def entity(self, slot: int) -> Inventory:
+        reorder_threshold = self.reorder_threshold[slot]
+        return Inventory(
+            id=slot + 1,
+            product_uid=self.product_uids[slot],
+            quantity_available=self.quantity_available[slot],
+            reserved_quantity=self.reserved_quantity[slot],
+            created_at=datetime.fromtimestamp(self.created_at[slot], timezone.utc),
+            updated_at=datetime.fromtimestamp(self.updated_at[slot], timezone.utc),
+            shard_count=self.shard_count[slot],
+            reorder_threshold=None if reorder_threshold == NO_THRESHOLD else reorder_threshold,
+        )
+
+    def touch(self, slot: int) -> None:
+        self.updated_at[slot] = datetime.now(timezone.utc).timestamp()
+
+class MemoryStrategy(DatabaseStrategy):
+    """In-process stand-in for Postgres, serving an ``InventoryStore`` as session.
+
+    The store lives from ``startup`` to ``shutdown`` and is shared by every
+    session of the worker. Only inventories are kept: there are no
+    reservations, stock movements or outbox behind it.
+    """
+    _instance: Optional['MemoryStrategy'] = None
+    _store: Optional[InventoryStore] = None
+
+    @classmethod
+    def get_instance(cls) -> 'MemoryStrategy':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    async def startup(cls) -> None:
+        if cls._store is None:
+            cls._store = InventoryStore()
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        cls._store = None
+
+    @classmethod
+    async def get_session(cls) -> AsyncGenerator[InventoryStore, None]:
+        if cls._store is None:
+            raise RuntimeError("MemoryStrategy.startup() must run before sessions are requested")
+        yield cls._store
+
+    @classmethod
+    def get_engine(cls):
+        return None
+
+    @classmethod
+    async def warm_up(cls) -> None:
+        pass
+
+    @classmethod
+    def get_pool_stats(cls) -> Optional[dict]:
+        return None
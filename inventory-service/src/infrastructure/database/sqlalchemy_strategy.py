@@ -1,15 +1,35 @@
-from typing import Optional
+from typing import Callable, Optional
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 import asyncio
 import time
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.exc import OperationalError
-from fastapi.encoders import jsonable_encoder
 from loguru import logger
 
 from src.infrastructure.config import *
 from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.database.unit_of_work import UnitOfWork
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool passing the duration of every checkout to ``observe_checkout``.
+
+    That covers waiting for a free connection, opening an overflow one and
+    the pre-ping, including checkouts that time out. The observer is set by
+    the metrics module, which cannot be imported from here.
+    """
+    observe_checkout: Optional[Callable[[float], None]] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            if self.observe_checkout is not None:
+                self.observe_checkout(time.perf_counter() - started)
 
 class SQLAlchemyStrategy(DatabaseStrategy):
     _instance: Optional['SQLAlchemyStrategy'] = None
@@ -22,67 +42,111 @@ class SQLAlchemyStrategy(DatabaseStrategy):
             cls._instance = cls()
         return cls._instance
 
+    @classmethod
+    async def startup(cls, max_retries=DB_CONNECT_RETRIES, retry_delay=DB_CONNECT_RETRY_DELAY) -> None:
+        """Build the engine and session factory and check the database is reachable.
+
+        Called once per worker from the application lifespan. Temporary
+        connection failures are retried with exponential backoff.
+        """
+        engine = cls.get_engine()
+        cls._session_factory = sessionmaker(
+            engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+        )
+
+        retries = 0
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+                return
+            except (OperationalError, OSError) as e:
+                retries += 1
+                if retries >= max_retries:
+                    logger.error(f"Failed to connect to database after {max_retries} attempts: {str(e)}")
+                    raise
+                # Exponential backoff
+                wait_time = retry_delay * (2 ** (retries - 1))
+                logger.warning(f"Database connection failed (attempt {retries}/{max_retries}), retrying in {wait_time} seconds: {str(e)}")
+                await asyncio.sleep(wait_time)
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        if cls._engine is not None:
+            await cls._engine.dispose()
+        cls._engine = None
+        cls._session_factory = None
+
     @classmethod
     async def get_session(cls) -> AsyncGenerator[AsyncSession, None]:
         if cls._session_factory is None:
-            if cls._engine is None:
-                cls._engine = cls.get_engine()
-            cls._session_factory = sessionmaker(
-                cls._engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
-            )
+            raise RuntimeError("SQLAlchemyStrategy.startup() must run before sessions are requested")
         async with cls._session_factory() as session:
-            logger.info(f"ASYNC Pool: {cls._engine.pool.status()}")
             yield session
 
+    @classmethod
+    @asynccontextmanager
+    async def unit_of_work(cls) -> AsyncGenerator[UnitOfWork, None]:
+        if cls._session_factory is None:
+            raise RuntimeError("SQLAlchemyStrategy.startup() must run before sessions are requested")
+        async with UnitOfWork.open(cls.get_engine(), cls._session_factory) as unit_of_work:
+            yield unit_of_work
+
     @classmethod
     def get_engine(cls):
         if cls._engine is None:
             engine = create_async_engine(
                 POSTGRES_URL,
-                future=True,
-                echo=False,
-                json_serializer=jsonable_encoder,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True,  # Check connection validity before using it
-                pool_recycle=3600,   # Recycle connections after 1 hour
+                echo=DB_ECHO,
+                poolclass=TimedQueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_pre_ping=DB_POOL_PRE_PING,
+                pool_recycle=DB_POOL_RECYCLE,
                 connect_args={
-                    "timeout": 30,   # Connection timeout in seconds
-                    "command_timeout": 30  # Command execution timeout
+                    "timeout": DB_CONNECT_TIMEOUT,
+                    "command_timeout": DB_COMMAND_TIMEOUT,
+                    # asyncpg's own statement cache and SQLAlchemy's cache of
+                    # asyncpg prepared statements
+                    "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+                    "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+                    # Read by the outbox trigger of stock_movements and the
+                    # change notification triggers; set once per connection,
+                    # so writes pay nothing to carry them.
+                    "server_settings": {
+                        "inventory.outbox_enabled": "on" if OUTBOX_ENABLED else "off",
+                        "inventory.notify_changes": "on" if INVENTORY_CHANGE_NOTIFY else "off",
+                    },
                 }
             )
             cls._engine = engine
         return cls._engine
-    
+
     @classmethod
-    async def get_session_with_retry(cls, max_retries=5, retry_delay=1) -> AsyncGenerator[AsyncSession, None]:
-        """Get a database session with retry mechanism for handling temporary connection issues."""
-        retries = 0
-        last_error = None
-        
-        while retries < max_retries:
-            try:
-                if cls._session_factory is None:
-                    if cls._engine is None:
-                        cls._engine = cls.get_engine()
-                    cls._session_factory = sessionmaker(
-                        cls._engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
-                    )
-                
-                async with cls._session_factory() as session:
-                    logger.info(f"ASYNC Pool: {cls._engine.pool.status()}")
-                    yield session
-                    return  # Successfully yielded a session
-            except OperationalError as e:
-                last_error = e
-                retries += 1
-                logger.warning(f"Database connection failed (attempt {retries}/{max_retries}): {str(e)}")
-                if retries < max_retries:
-                    # Exponential backoff
-                    wait_time = retry_delay * (2 ** (retries - 1))
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-        
-        # If we get here, all retries failed
-        logger.error(f"Failed to connect to database after {max_retries} attempts: {str(last_error)}")
-        raise last_error
+    async def warm_up(cls) -> None:
+        """Open ``pool_size`` connections up front so the first burst of traffic does not pay for them."""
+        engine = cls.get_engine()
+        connections = await asyncio.gather(
+            *(engine.connect() for _ in range(engine.pool.size())), return_exceptions=True
+        )
+        errors = [connection for connection in connections if isinstance(connection, BaseException)]
+        for connection in connections:
+            if not isinstance(connection, BaseException):
+                await connection.close()
+        if errors:
+            logger.warning(f"Pool warm-up failed for {len(errors)}/{len(connections)} connections: {str(errors[0])}")
+        else:
+            logger.info(f"Pool warm-up opened {len(connections)} connections")
+
+    @classmethod
+    def get_pool_stats(cls) -> Optional[dict]:
+        if cls._engine is None:
+            return None
+        pool = cls._engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
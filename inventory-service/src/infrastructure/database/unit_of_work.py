@@ -0,0 +1,62 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, AsyncTransaction
+from sqlalchemy.orm import sessionmaker
+
+class UnitOfWork:
+    """One transaction around several repository operations, committed only by ``commit``.
+
+    Repositories commit and roll back their own work. The session of a unit
+    of work is joined to a transaction begun on its own connection, in
+    SQLAlchemy's ``create_savepoint`` mode, so those commits and rollbacks
+    only end savepoints: nothing reaches the database before ``commit``, and
+    leaving ``open`` without it rolls everything back.
+    """
+
+    def __init__(self, session: AsyncSession, transaction: AsyncTransaction):
+        self.session = session
+        self._transaction = transaction
+        self._after_commit: List[Callable[[], None]] = []
+        session.info["unit_of_work"] = self
+
+    @staticmethod
+    def of(session) -> Optional['UnitOfWork']:
+        """The unit of work ``session`` belongs to, None for a plain session."""
+        if not isinstance(session, AsyncSession):
+            return None
+        return session.info.get("unit_of_work")
+
+    @classmethod
+    @asynccontextmanager
+    async def open(cls, engine: AsyncEngine, session_factory: sessionmaker) -> AsyncIterator['UnitOfWork']:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            try:
+                async with session_factory(bind=connection, join_transaction_mode="create_savepoint") as session:
+                    yield cls(session, transaction)
+            finally:
+                if transaction.is_active:
+                    await transaction.rollback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once ``commit`` has committed the transaction, never if it rolls back.
+
+        The commits of the repositories only release savepoints, so whatever
+        must follow their writes becoming visible, such as dropping cache
+        entries, waits for this.
+        """
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        # Flushes the session and releases its savepoint first.
+        await self.session.commit()
+        await self._transaction.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        self._after_commit.clear()
+        await self.session.rollback()
+        await self._transaction.rollback()
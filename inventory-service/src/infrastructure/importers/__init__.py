@@ -0,0 +1,3 @@
+from src.infrastructure.importers.stock_level_reader import IMPORT_FORMATS, read_stock_levels
+
+__all__ = ["IMPORT_FORMATS", "read_stock_levels"]
@@ -0,0 +1,81 @@
+import csv
+import json
+from typing import AsyncIterator, List, Tuple, Union
+
+# (line number, fields of the row or the reason it could not be parsed)
+StockLevelRecord = Tuple[int, Union[dict, ValueError]]
+
+IMPORT_FORMATS = ("csv", "ndjson")
+REQUIRED_COLUMNS = ("product_uid", "quantity_available")
+
+async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """Split a byte stream into lists of complete lines, one list per chunk received.
+
+    Only the trailing partial line of a chunk is held back, so memory stays
+    bounded by the chunk size whatever the size of the stream. A UTF-8 byte
+    order mark, as written by Excel, is dropped from the first line.
+    """
+    tail = b""
+    # "utf-8-sig" strips the mark at the start of the first decoded line only.
+    encoding = "utf-8-sig"
+    async for chunk in chunks:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        if lines:
+            yield b"\n".join(lines).decode(encoding, "replace").split("\n")
+            encoding = "utf-8"
+    if tail:
+        yield [tail.decode(encoding, "replace")]
+
+async def read_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[StockLevelRecord]]:
+    """Rows of a CSV stream whose header names at least the required columns.
+
+    Fields may not contain line breaks: each line is one row.
+    """
+    header = None
+    line_number = 0
+    async for lines in read_lines(chunks):
+        records = []
+        for values in csv.reader(lines):
+            line_number += 1
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                missing = [name for name in REQUIRED_COLUMNS if name not in header]
+                if missing:
+                    yield [(line_number, ValueError(f"Missing CSV column(s): {', '.join(missing)}"))]
+                    return
+                continue
+            if len(values) != len(header):
+                records.append((line_number, ValueError(f"Expected {len(header)} fields, got {len(values)}")))
+                continue
+            records.append((line_number, dict(zip(header, values))))
+        yield records
+
+async def read_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[StockLevelRecord]]:
+    """Rows of a stream holding one JSON object per line."""
+    line_number = 0
+    async for lines in read_lines(chunks):
+        records = []
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                fields = json.loads(line)
+            except ValueError as e:
+                records.append((line_number, ValueError(f"Invalid JSON: {str(e)}")))
+                continue
+            if not isinstance(fields, dict):
+                records.append((line_number, ValueError("Expected a JSON object")))
+                continue
+            records.append((line_number, fields))
+        yield records
+
+def read_stock_levels(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[List[StockLevelRecord]]:
+    if format == "csv":
+        return read_csv(chunks)
+    if format == "ndjson":
+        return read_ndjson(chunks)
+    raise ValueError(f"Unknown import format: {format}")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.domain.entities import IdempotencyRecord
+from src.infrastructure.models.base_model import Base
+
+class IdempotencyKeyModel(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    # sha256 of the method, path and body the key was first used with
+    fingerprint = Column(String(64), nullable=False)
+    # Both stay NULL while the claiming request is in flight.
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSONB, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    @staticmethod
+    def entity_from_row(row):
+        return IdempotencyRecord(
+            key=row.key,
+            fingerprint=row.fingerprint,
+            expires_at=row.expires_at,
+            status_code=row.status_code,
+            response=row.response,
+        )
@@ -1,5 +1,4 @@
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index, text
 
 from src.domain.entities import Inventory
 from src.infrastructure.models.base_model import Base
@@ -8,29 +7,37 @@ class InventoryModel(Base):
     __tablename__ = "inventories"
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    product_uid = Column(String, nullable=False)
+    product_uid = Column(String, nullable=False, unique=True, index=True)
     quantity_available = Column(Integer, nullable=False)
     reserved_quantity = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), nullable=False)
     updated_at = Column(DateTime(timezone=True), nullable=False)
+    # Sharded products keep their counters in inventory_shards and zeros here.
+    shard_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reorder_threshold = Column(Integer, nullable=True)
+    # Part of the reserved stock held by timed reservations, only settled by
+    # closing them. Kept on this row even for sharded products.
+    held_quantity = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index(
+            "ix_inventories_low_stock", "id",
+            postgresql_where=text("quantity_available <= reorder_threshold"),
+        ),
+    )
 
     @staticmethod
-    def from_entity(inventory):
-        return InventoryModel(
-            id=inventory.id if hasattr(inventory, 'id') and inventory.id is not None else None,
-            product_uid=inventory.product_uid,
-            quantity_available=inventory.quantity_available,
-            reserved_quantity=inventory.reserved_quantity,
-            created_at=inventory.created_at,
-            updated_at=inventory.updated_at,
-        )
+    def entity_from_row(row):
+        """Map a Core row starting with the columns of ``inventories``, in table order.
 
-    def to_entity(self):
+        That is what ``inventory_columns()`` and RETURNING every column give.
+        Reading by position is several times cheaper than by name, which
+        shows on bulk reads.
+        """
+        (
+            id, product_uid, quantity_available, reserved_quantity,
+            created_at, updated_at, shard_count, reorder_threshold,
+        ) = row[:8]
         return Inventory(
-            id=self.id,
-            product_uid=self.product_uid,
-            quantity_available=self.quantity_available,
-            reserved_quantity=self.reserved_quantity,
-            created_at=self.created_at, 
-            updated_at=self.updated_at,
+            product_uid, quantity_available, reserved_quantity, created_at, updated_at, id, shard_count, reorder_threshold
         )
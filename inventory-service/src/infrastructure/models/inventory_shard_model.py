@@ -0,0 +1,23 @@
+from sqlalchemy import Column, ForeignKey, String, Integer
+
+from src.domain.entities import InventoryShard
+from src.infrastructure.models.base_model import Base
+
+class InventoryShardModel(Base):
+    __tablename__ = "inventory_shards"
+
+    product_uid = Column(
+        String, ForeignKey("inventories.product_uid", ondelete="CASCADE"), primary_key=True
+    )
+    shard = Column(Integer, primary_key=True)
+    quantity_available = Column(Integer, nullable=False)
+    reserved_quantity = Column(Integer, nullable=False)
+
+    @staticmethod
+    def entity_from_row(row):
+        return InventoryShard(
+            product_uid=row.product_uid,
+            shard=row.shard,
+            quantity_available=row.quantity_available,
+            reserved_quantity=row.reserved_quantity,
+        )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, DateTime
+
+from src.domain.entities import StockSnapshot
+from src.infrastructure.models.base_model import Base
+
+class InventorySnapshotModel(Base):
+    """Stock counters of a product at ``taken_at``, folded from ``stock_movements``.
+
+    The counters at any time are those of the latest snapshot before it plus
+    the movements in between.
+    """
+    __tablename__ = "inventory_snapshots"
+
+    product_uid = Column(String, primary_key=True)
+    taken_at = Column(DateTime(timezone=True), primary_key=True, index=True)
+    quantity_available = Column(Integer, nullable=False)
+    reserved_quantity = Column(Integer, nullable=False)
+
+    @staticmethod
+    def entity_from_row(row):
+        return StockSnapshot(
+            product_uid=row.product_uid,
+            taken_at=row.taken_at,
+            quantity_available=row.quantity_available,
+            reserved_quantity=row.reserved_quantity,
+        )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, Identity, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.infrastructure.models.base_model import Base
+
+class OutboxEventModel(Base):
+    """Stock change events waiting to be delivered by the outbox relay.
+
+    Rows are written by a trigger on ``stock_movements``, so in the
+    transaction changing the stock, and deleted once delivered. A relay
+    delivering an event leases it until ``claimed_until``.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    event_type = Column(String(32), nullable=False)
+    product_uid = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.clock_timestamp())
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
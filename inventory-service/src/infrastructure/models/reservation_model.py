@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.domain.entities import Reservation
+from src.infrastructure.models.base_model import Base
+
+class ReservationModel(Base):
+    __tablename__ = "reservations"
+
+    id = Column(UUID(as_uuid=False), primary_key=True)
+    product_uid = Column(String, nullable=False)
+    amount = Column(Integer, nullable=False)
+    # The sweeper walks this index from the oldest expiry, so its cost depends
+    # on the number of expired reservations only.
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    @staticmethod
+    def from_entity(reservation):
+        return ReservationModel(
+            id=reservation.id,
+            product_uid=reservation.product_uid,
+            amount=reservation.amount,
+            expires_at=reservation.expires_at,
+            created_at=reservation.created_at,
+        )
+
+    @staticmethod
+    def entity_from_row(row):
+        return Reservation(
+            id=row.id,
+            product_uid=row.product_uid,
+            amount=row.amount,
+            expires_at=row.expires_at,
+            created_at=row.created_at,
+        )
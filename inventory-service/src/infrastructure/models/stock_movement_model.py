@@ -0,0 +1,41 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Identity, Index, func
+
+from src.domain.entities import StockMovement
+from src.infrastructure.models.base_model import Base
+
+class StockMovementModel(Base):
+    """Append-only ledger of stock counter changes.
+
+    Rows are written by triggers on ``inventories`` and ``inventory_shards``,
+    in the transaction that changes the counters, and never updated. There is
+    no foreign key: the history of a deleted product stays.
+    """
+    __tablename__ = "stock_movements"
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    product_uid = Column(String, nullable=False)
+    delta_available = Column(Integer, nullable=False)
+    delta_reserved = Column(Integer, nullable=False)
+    # reserve, release, confirm, adjust, create, delete, or set by the writer
+    # for the transaction: expire, import, reshard
+    reason = Column(String(32), nullable=False)
+    idempotency_key = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.clock_timestamp())
+
+    __table_args__ = (
+        # Range reads page on (created_at, id), per product or over all of them.
+        Index("ix_stock_movements_product_uid_created_at", "product_uid", "created_at", "id"),
+        Index("ix_stock_movements_created_at", "created_at", "id"),
+    )
+
+    @staticmethod
+    def entity_from_row(row):
+        return StockMovement(
+            id=row.id,
+            product_uid=row.product_uid,
+            delta_available=row.delta_available,
+            delta_reserved=row.delta_reserved,
+            reason=row.reason,
+            idempotency_key=row.idempotency_key,
+            created_at=row.created_at,
+        )
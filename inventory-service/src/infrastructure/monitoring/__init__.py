@@ -0,0 +1,5 @@
+from src.infrastructure.monitoring.logging_config import configure_logging
+from src.infrastructure.monitoring.pool_stats_reporter import PoolStatsReporter
+from src.infrastructure.monitoring.metrics import MetricsRegistry, instrumented
+
+__all__ = ["configure_logging", "PoolStatsReporter", "MetricsRegistry", "instrumented"]
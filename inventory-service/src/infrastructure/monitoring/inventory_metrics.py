@@ -0,0 +1,86 @@
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.config import INVENTORY_CACHE_ENABLED
+from src.infrastructure.database import DatabaseFactory
+from src.infrastructure.database.sqlalchemy_strategy import TimedQueuePool
+from src.infrastructure.monitoring.metrics import MetricsRegistry, Counter, Histogram, Gauge
+
+def _pool_connections():
+    stats = DatabaseFactory.get_default_strategy().get_pool_stats()
+    if stats is None:
+        return None
+    return {(state,): value for state, value in stats.items()}
+
+def _cache_events():
+    if not INVENTORY_CACHE_ENABLED:
+        return None
+    stats = InventoryCache.get_instance().stats()
+    return {(event,): stats[event] for event in ("hits", "misses", "evictions", "expirations")}
+
+def _cache_size():
+    if not INVENTORY_CACHE_ENABLED:
+        return None
+    return {(): InventoryCache.get_instance().stats()["size"]}
+
+registry = MetricsRegistry.get_instance()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "inventory_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+))
+REPOSITORY_DURATION = registry.register(Histogram(
+    "inventory_repository_duration_seconds",
+    "Time spent in repository methods, database round trips included.",
+    ("method",),
+))
+INVENTORY_OUTCOMES = registry.register(Counter(
+    "inventory_rejections_total",
+    "Inventory operations rejected by the domain, by outcome.",
+    ("outcome",),
+))
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "inventory_db_pool_connections",
+    "Database connection pool state (size, checked_in, checked_out, overflow).",
+    ("state",),
+    _pool_connections,
+))
+DB_POOL_CHECKOUT_DURATION = registry.register(Histogram(
+    "inventory_db_pool_checkout_duration_seconds",
+    "Time to check a connection out of the pool, waiting for a free one included.",
+    (),
+))
+TimedQueuePool.observe_checkout = staticmethod(DB_POOL_CHECKOUT_DURATION.observe)
+CACHE_EVENTS = registry.register(Gauge(
+    "inventory_cache_events_total",
+    "Stock cache lookups and removals, by event.",
+    ("event",),
+    _cache_events,
+    metric_type="counter",
+))
+CACHE_SIZE = registry.register(Gauge(
+    "inventory_cache_entries",
+    "Number of products held in the stock cache.",
+    (),
+    _cache_size,
+))
+IDEMPOTENT_REPLAYS = registry.register(Counter(
+    "inventory_idempotent_replays_total",
+    "Requests answered from a stored Idempotency-Key response, by route.",
+    ("route",),
+))
+RESERVATION_BROKER_BATCH_SIZE = registry.register(Histogram(
+    "inventory_reservation_broker_batch_size",
+    "Reservations applied per coalesced write by the reservation broker.",
+    (),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+))
+LOW_STOCK_NOTIFICATIONS = registry.register(Counter(
+    "inventory_low_stock_notifications_total",
+    "Reorder threshold crossings pushed to the webhook, by outcome (sent, failed, dropped).",
+    ("outcome",),
+))
+OUTBOX_EVENTS = registry.register(Counter(
+    "inventory_outbox_events_total",
+    "Stock change events handed to the outbox sink, by outcome (delivered, failed).",
+    ("outcome",),
+))
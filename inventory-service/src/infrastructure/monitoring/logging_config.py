@@ -0,0 +1,22 @@
+import sys
+
+from loguru import logger
+
+from src.infrastructure.config import LOG_LEVEL, LOG_SINK, LOG_SERIALIZE, LOG_ENQUEUE
+
+def configure_logging() -> None:
+    """Replace loguru's default handler with the configured sink.
+
+    ``LOG_SINK`` is ``stderr``, ``stdout`` or a file path. ``LOG_SERIALIZE``
+    writes one JSON object per line, extra fields bound with
+    ``logger.bind`` included, and ``LOG_ENQUEUE`` moves the writes off the
+    event loop thread.
+    """
+    sinks = {"stderr": sys.stderr, "stdout": sys.stdout}
+    logger.remove()
+    logger.add(
+        sinks.get(LOG_SINK, LOG_SINK),
+        level=LOG_LEVEL,
+        serialize=LOG_SERIALIZE,
+        enqueue=LOG_ENQUEUE,
+    )
@@ -0,0 +1,168 @@
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def _format_labels(labelnames: Sequence[str], labels: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+class Histogram:
+    """Histogram that stores per-bucket counts and only accumulates them when scraped."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last slot is +Inf), sum]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def time(self, *labels) -> '_Timer':
+        return _Timer(self, labels)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+class Gauge:
+    """Metric whose values are read from ``collect`` at scrape time, as ``{labels: value}``.
+
+    ``metric_type`` can be set to ``counter`` to export counters that are
+    maintained elsewhere, such as the cache hit counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Optional[Dict[Tuple, float]]],
+        metric_type: str = "gauge",
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        for labels, value in (self.collect() or {}).items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+class MetricsRegistry:
+    """Per-worker registry rendered in the Prometheus text exposition format.
+
+    Metrics are plain dicts updated from the event loop thread, so recording
+    needs no lock. Each worker exposes its own series.
+    """
+    _instance: Optional['MetricsRegistry'] = None
+
+    def __init__(self):
+        self._metrics = {}
+
+    @classmethod
+    def get_instance(cls) -> 'MetricsRegistry':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+def instrumented(histogram: Histogram, *labels):
+    """Record the duration of a coroutine function or async generator in ``histogram``.
+
+    For an async generator only the time spent producing items counts, not
+    the time the consumer takes with each of them before asking for the
+    next. Without ``labels`` the series is labelled with the function name.
+    """
+    def decorator(method):
+        series = labels or (method.__name__,)
+        if inspect.isasyncgenfunction(method):
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs):
+                items = method(*args, **kwargs)
+                elapsed = 0.0
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = await items.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            elapsed += time.perf_counter() - started
+                        yield item
+                finally:
+                    started = time.perf_counter()
+                    try:
+                        await items.aclose()
+                    finally:
+                        histogram.observe(elapsed + time.perf_counter() - started, *series)
+        else:
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs):
+                with histogram.time(*series):
+                    return await method(*args, **kwargs)
+        return wrapper
+    return decorator
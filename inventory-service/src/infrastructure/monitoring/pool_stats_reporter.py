@@ -0,0 +1,66 @@
+import asyncio
+from typing import Optional, Type
+
+from loguru import logger
+
+from src.infrastructure.config import POOL_STATS_SAMPLE_INTERVAL, POOL_STATS_REPORT_INTERVAL, POOL_STATS_LOG_LEVEL
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+
+class PoolStatsReporter:
+    """Samples connection pool usage off the request path and logs one summary per interval.
+
+    The summary is a structured record (``logger.bind``) carrying the pool
+    size and the peak and mean number of checked out connections over the
+    window, so a serializing sink emits it as a metric rather than text.
+    """
+
+    def __init__(
+        self,
+        strategy: Type[DatabaseStrategy],
+        sample_interval: float = POOL_STATS_SAMPLE_INTERVAL,
+        report_interval: float = POOL_STATS_REPORT_INTERVAL,
+        level: str = POOL_STATS_LOG_LEVEL,
+    ):
+        self.strategy = strategy
+        self.sample_interval = sample_interval
+        self.report_interval = report_interval
+        self.level = level
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="pool-stats-reporter")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        samples_per_report = max(1, round(self.report_interval / self.sample_interval))
+        while True:
+            checked_out = []
+            overflow = []
+            stats = None
+            for _ in range(samples_per_report):
+                await asyncio.sleep(self.sample_interval)
+                stats = self.strategy.get_pool_stats()
+                if stats is not None:
+                    checked_out.append(stats["checked_out"])
+                    overflow.append(stats["overflow"])
+            if not checked_out:
+                continue
+            logger.bind(
+                metric="db_pool",
+                size=stats["size"],
+                checked_in=stats["checked_in"],
+                checked_out=stats["checked_out"],
+                checked_out_max=max(checked_out),
+                checked_out_avg=round(sum(checked_out) / len(checked_out), 2),
+                overflow_max=max(overflow),
+                samples=len(checked_out),
+            ).log(self.level, "db pool stats")
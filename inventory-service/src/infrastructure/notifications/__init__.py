@@ -0,0 +1,22 @@
+from src.infrastructure.notifications.inventory_change_listener import InventoryChangeListener
+from src.infrastructure.notifications.low_stock_notifier import LowStockNotifier
+from src.infrastructure.notifications.event_sinks import (
+    EventSink,
+    WebhookEventSink,
+    FileEventSink,
+    MemoryEventSink,
+    build_event_sink
+)
+from src.infrastructure.notifications.stock_stream_broadcaster import StockStreamBroadcaster, StockSubscription
+
+__all__ = [
+    "InventoryChangeListener",
+    "LowStockNotifier",
+    "EventSink",
+    "WebhookEventSink",
+    "FileEventSink",
+    "MemoryEventSink",
+    "build_event_sink",
+    "StockStreamBroadcaster",
+    "StockSubscription"
+]
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import httpx
+
+from src.infrastructure.config import (
+    OUTBOX_SINK,
+    OUTBOX_WEBHOOK_URL,
+    OUTBOX_WEBHOOK_TIMEOUT,
+    OUTBOX_FILE_PATH,
+    OUTBOX_BATCH_SIZE
+)
+
+class EventSink(ABC):
+    """Destination of the stock change events relayed from the outbox.
+
+    ``publish`` returns once the whole batch is delivered and raises
+    otherwise; the relay then keeps the batch and retries it later, so a
+    sink may see the same event more than once.
+    """
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, events: List[dict]) -> None:
+        pass
+
+class WebhookEventSink(EventSink):
+    """POSTs each batch as one JSON array; any 2xx response acknowledges it."""
+
+    def __init__(self, url: str = OUTBOX_WEBHOOK_URL, timeout: float = OUTBOX_WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def publish(self, events: List[dict]) -> None:
+        response = await self._client.post(self.url, json=events)
+        response.raise_for_status()
+
+class FileEventSink(EventSink):
+    """Appends one JSON line per event and fsyncs each batch before acknowledging it."""
+
+    def __init__(self, path: str = OUTBOX_FILE_PATH):
+        self.path = path
+
+    async def publish(self, events: List[dict]) -> None:
+        lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+class MemoryEventSink(EventSink):
+    """Keeps events in process, for tests and local runs.
+
+    Holds at most ``max_events``: past that, batches are refused like by a
+    consumer that cannot keep up, until ``drain`` makes room.
+    """
+    _instance: Optional['MemoryEventSink'] = None
+
+    def __init__(self, max_events: int = 100 * OUTBOX_BATCH_SIZE):
+        self.max_events = max_events
+        self.events: List[dict] = []
+
+    @classmethod
+    def get_instance(cls) -> 'MemoryEventSink':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    async def publish(self, events: List[dict]) -> None:
+        if len(self.events) + len(events) > self.max_events:
+            raise OverflowError(f"Memory event sink is full ({len(self.events)} events)")
+        self.events.extend(events)
+
+    def drain(self) -> List[dict]:
+        events, self.events = self.events, []
+        return events
+
+def build_event_sink(kind: str = OUTBOX_SINK) -> EventSink:
+    if kind == "webhook":
+        return WebhookEventSink()
+    if kind == "file":
+        return FileEventSink()
+    if kind == "memory":
+        return MemoryEventSink.get_instance()
+    raise ValueError(f"Unknown event sink: {kind}")
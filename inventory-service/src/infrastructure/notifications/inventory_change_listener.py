@@ -0,0 +1,107 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import asyncpg
+from loguru import logger
+
+from src.domain.entities import Inventory
+from src.infrastructure.config import POSTGRES_URL, INVENTORY_CHANGE_CHANNEL
+
+ChangeHandler = Callable[[str, Inventory], None]
+ResetHandler = Callable[[], None]
+
+class InventoryChangeListener:
+    """Background LISTEN on the channel fed by the ``inventories`` triggers.
+
+    Each notification is decoded into ``(operation, Inventory)`` and passed to
+    every change handler. Notifications sent while the connection was down are
+    lost, so reset handlers run on every (re)connect to drop derived state.
+    """
+    _instance: Optional['InventoryChangeListener'] = None
+
+    def __init__(self, dsn: str = POSTGRES_URL, channel: str = INVENTORY_CHANGE_CHANNEL, reconnect_delay: float = 1.0):
+        # asyncpg does not understand SQLAlchemy's driver suffix.
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._change_handlers: List[ChangeHandler] = []
+        self._reset_handlers: List[ResetHandler] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> 'InventoryChangeListener':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def add_handler(self, on_change: ChangeHandler, on_reset: Optional[ResetHandler] = None) -> None:
+        self._change_handlers.append(on_change)
+        if on_reset is not None:
+            self._reset_handlers.append(on_reset)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="inventory-change-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                for on_reset in self._reset_handlers:
+                    on_reset()
+                logger.info(f"Listening for inventory changes on '{self.channel}'")
+                delay = self.reconnect_delay
+                await lost.wait()
+                logger.warning("Inventory change listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Inventory change listener failed: {str(e)}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            change = json.loads(payload)
+            operation, inventory = change["op"], self._decode(change["inventory"])
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed inventory change: {str(e)}")
+            return
+        for on_change in self._change_handlers:
+            on_change(operation, inventory)
+
+    @staticmethod
+    def _decode(row: dict) -> Inventory:
+        return Inventory(
+            id=row["id"],
+            product_uid=row["product_uid"],
+            quantity_available=row["quantity_available"],
+            reserved_quantity=row["reserved_quantity"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            shard_count=row.get("shard_count", 0),
+            reorder_threshold=row.get("reorder_threshold"),
+        )
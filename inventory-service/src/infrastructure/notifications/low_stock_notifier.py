@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+from loguru import logger
+
+from src.domain.entities import Inventory
+from src.infrastructure.config import LOW_STOCK_WEBHOOK_URL, LOW_STOCK_WEBHOOK_TIMEOUT, LOW_STOCK_QUEUE_SIZE
+from src.infrastructure.monitoring.inventory_metrics import LOW_STOCK_NOTIFICATIONS
+
+class LowStockNotifier:
+    """Background push of reorder threshold crossings to a webhook.
+
+    Reserve paths only queue the inventory they just brought down to its
+    threshold, so a slow or unreachable webhook never delays a reservation.
+    Each crossing is POSTed once, in order. A crossing is dropped when the
+    queue is full and not retried when the webhook fails; both are counted.
+    """
+    _instance: Optional['LowStockNotifier'] = None
+
+    def __init__(
+        self,
+        url: str = LOW_STOCK_WEBHOOK_URL,
+        timeout: float = LOW_STOCK_WEBHOOK_TIMEOUT,
+        queue_size: int = LOW_STOCK_QUEUE_SIZE,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> 'LowStockNotifier':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def publish(self, inventory: Inventory) -> None:
+        if not self.running:
+            return
+        event = {
+            "event": "low_stock",
+            "product_uid": inventory.product_uid,
+            "quantity_available": inventory.quantity_available,
+            "reserved_quantity": inventory.reserved_quantity,
+            "reorder_threshold": inventory.reorder_threshold,
+            "detected_at": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            LOW_STOCK_NOTIFICATIONS.inc("dropped")
+
+    async def start(self) -> None:
+        if not self.running:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._task = asyncio.create_task(self._run(), name="low-stock-notifier")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            event = await self._queue.get()
+            try:
+                response = await self._client.post(self.url, json=event)
+                response.raise_for_status()
+                LOW_STOCK_NOTIFICATIONS.inc("sent")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOW_STOCK_NOTIFICATIONS.inc("failed")
+                logger.warning(f"Low stock notification for {event['product_uid']} failed: {str(e)}")
@@ -0,0 +1,202 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Optional, Set, Type
+
+from loguru import logger
+
+from src.domain.entities import Inventory
+from src.infrastructure.config import STOCK_STREAM_COALESCE_INTERVAL, STOCK_STREAM_MAX_SUBSCRIBERS
+from src.infrastructure.database import DatabaseFactory
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.repositories import build_inventory_repository
+
+def stock_message(product_uid: str, inventory: Optional[Inventory]) -> str:
+    """JSON pushed to subscribers; null counters mean the product does not exist."""
+    return json.dumps({
+        "product_uid": product_uid,
+        "quantity_available": inventory.quantity_available if inventory is not None else None,
+        "reserved_quantity": inventory.reserved_quantity if inventory is not None else None,
+    }, separators=(",", ":"))
+
+class StockSubscription:
+    """The products one client follows and their latest unsent messages.
+
+    Only the newest message of each product is kept, so a client reading
+    slower than its products change skips intermediate levels instead of
+    building up a backlog.
+    """
+
+    def __init__(self, product_uids: Iterable[str]):
+        self.product_uids: Set[str] = set(product_uids)
+        self._pending: Dict[str, str] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, product_uid: str, message: str) -> None:
+        self._pending[product_uid] = message
+        self._ready.set()
+
+    def offer_initial(self, product_uid: str, message: str) -> None:
+        # A change delivered while the initial level was being read is newer.
+        if product_uid not in self._pending:
+            self.offer(product_uid, message)
+
+    async def next(self, timeout: float) -> List[str]:
+        """Messages pending now or within ``timeout`` seconds, possibly none."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        messages, self._pending = list(self._pending.values()), {}
+        return messages
+
+class StockStreamBroadcaster:
+    """Per-worker fan-out of stock level changes to stream subscribers.
+
+    Fed by the ``InventoryChangeListener``, so writes from every worker and
+    background task are seen. Changes are collected per product and flushed
+    every ``interval`` seconds: a product changing a hundred times in that
+    window costs one message. Sharded products, whose notifications carry
+    the zeroed inventory row, have their totals read in one query per flush.
+    A message is built once per product and shared by all its subscribers,
+    and only sent when ``quantity_available`` moved.
+    """
+    _instance: Optional['StockStreamBroadcaster'] = None
+
+    def __init__(
+        self,
+        strategy: Optional[Type[DatabaseStrategy]] = None,
+        interval: float = STOCK_STREAM_COALESCE_INTERVAL,
+        max_subscribers: int = STOCK_STREAM_MAX_SUBSCRIBERS,
+    ):
+        self.session = asynccontextmanager((strategy or DatabaseFactory.get_default_strategy()).get_session)
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self.subscriber_count = 0
+        self._subscribers: Dict[str, Set[StockSubscription]] = {}
+        # Changed products, with the new row or None when the totals must be read.
+        self._dirty: Dict[str, Optional[Inventory]] = {}
+        # quantity_available last sent per followed product
+        self._sent: Dict[str, Optional[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_instance(cls) -> 'StockStreamBroadcaster':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def full(self) -> bool:
+        return self.subscriber_count >= self.max_subscribers
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="stock-stream-broadcaster")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def apply_change(self, operation: str, inventory: Inventory) -> None:
+        if inventory.product_uid not in self._subscribers:
+            return
+        known = operation != "DELETE" and not inventory.shard_count
+        self._dirty[inventory.product_uid] = inventory if known else None
+
+    def reset(self) -> None:
+        # Notifications were missed while the listener was away: re-read everything followed.
+        self._dirty = dict.fromkeys(self._subscribers)
+
+    async def subscribe(self, product_uids: Iterable[str]) -> Optional[StockSubscription]:
+        """Follow ``product_uids``; their current levels are the first messages of the subscription.
+
+        Returns None when ``max_subscribers`` subscriptions are open. The slot
+        is checked and taken before anything is awaited, so concurrent
+        subscribers cannot overshoot the limit, and it is given back when the
+        initial read fails.
+        """
+        if self.full:
+            return None
+        subscription = StockSubscription(())
+        self.subscriber_count += 1
+        try:
+            await self.follow(subscription, product_uids)
+        except BaseException:
+            self.unsubscribe(subscription)
+            raise
+        return subscription
+
+    async def follow(self, subscription: StockSubscription, product_uids: Iterable[str]) -> None:
+        added = [product_uid for product_uid in product_uids if product_uid not in subscription.product_uids]
+        for product_uid in added:
+            subscription.product_uids.add(product_uid)
+            self._subscribers.setdefault(product_uid, set()).add(subscription)
+        if not added:
+            return
+        # Registered before reading, so no change after the read can be missed.
+        inventories = await self._read(added)
+        for product_uid in added:
+            inventory = inventories.get(product_uid)
+            self._sent.setdefault(product_uid, inventory.quantity_available if inventory is not None else None)
+            subscription.offer_initial(product_uid, stock_message(product_uid, inventory))
+
+    def unfollow(self, subscription: StockSubscription, product_uids: Iterable[str]) -> None:
+        for product_uid in list(product_uids):
+            if product_uid not in subscription.product_uids:
+                continue
+            subscription.product_uids.discard(product_uid)
+            subscribers = self._subscribers.get(product_uid)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[product_uid]
+                    self._sent.pop(product_uid, None)
+                    self._dirty.pop(product_uid, None)
+
+    def unsubscribe(self, subscription: StockSubscription) -> None:
+        self.unfollow(subscription, list(subscription.product_uids))
+        self.subscriber_count -= 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._dirty:
+                continue
+            try:
+                await self._flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Stock stream flush failed: {str(e)}")
+
+    async def _flush(self) -> None:
+        dirty, self._dirty = self._dirty, {}
+        unknown = [product_uid for product_uid, inventory in dirty.items() if inventory is None]
+        if unknown:
+            inventories = await self._read(unknown)
+            dirty.update({product_uid: inventories.get(product_uid) for product_uid in unknown})
+        for product_uid, inventory in dirty.items():
+            subscribers = self._subscribers.get(product_uid)
+            if not subscribers:
+                continue
+            quantity_available = inventory.quantity_available if inventory is not None else None
+            if self._sent.get(product_uid) == quantity_available:
+                continue
+            self._sent[product_uid] = quantity_available
+            message = stock_message(product_uid, inventory)
+            for subscription in subscribers:
+                subscription.offer(product_uid, message)
+
+    async def _read(self, product_uids: List[str]) -> Dict[str, Inventory]:
+        async with self.session() as session:
+            return {
+                inventory.product_uid: inventory
+                async for inventory in build_inventory_repository(session).get_inventories_by_uids(product_uids)
+            }
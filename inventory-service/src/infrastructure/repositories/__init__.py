@@ -1,3 +1,30 @@
+from src.domain.repositories import InventoryInterface
+from src.infrastructure.config import DATABASE_STRATEGY
 from src.infrastructure.repositories.inventory_repository import InventoryRepository
+from src.infrastructure.repositories.memory_inventory_repository import MemoryInventoryRepository
+from src.infrastructure.repositories.inventory_shard_repository import InventoryShardRepository
+from src.infrastructure.repositories.cached_inventory_repository import CachedInventoryRepository
+from src.infrastructure.repositories.coalescing_inventory_repository import CoalescingInventoryRepository
+from src.infrastructure.repositories.reservation_repository import ReservationRepository
+from src.infrastructure.repositories.idempotency_repository import IdempotencyRepository
+from src.infrastructure.repositories.stock_movement_repository import StockMovementRepository
+from src.infrastructure.repositories.outbox_repository import OutboxRepository
 
-__all__ = ["InventoryRepository"]
\ No newline at end of file
+def build_inventory_repository(session, strategy: str = DATABASE_STRATEGY) -> InventoryInterface:
+    """The inventory repository over a session of the ``strategy`` database."""
+    if strategy == "memory":
+        return MemoryInventoryRepository(session)
+    return InventoryRepository(session)
+
+__all__ = [
+    "InventoryRepository",
+    "MemoryInventoryRepository",
+    "InventoryShardRepository",
+    "CachedInventoryRepository",
+    "CoalescingInventoryRepository",
+    "ReservationRepository",
+    "IdempotencyRepository",
+    "StockMovementRepository",
+    "OutboxRepository",
+    "build_inventory_repository"
+]
@@ -0,0 +1,91 @@
+from typing import AsyncIterator, List, Optional, Tuple
+
+from src.domain.repositories import InventoryInterface
+from src.domain.entities import Inventory, InventoryShard
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.database import UnitOfWork
+
+class CachedInventoryRepository(InventoryInterface):
+    """Read-through cache in front of another ``InventoryInterface``.
+
+    Single-product reads are served from ``cache`` while fresh. Every write
+    drops the entries it touches, both before and after hitting the wrapped
+    repository, so that no read racing with the write can repopulate them
+    with the old value. Under a unit of work, the write only becomes visible
+    when it commits, so the entries are dropped again then.
+    """
+    def __init__(self, repository: InventoryInterface, cache: InventoryCache, unit_of_work: Optional[UnitOfWork] = None):
+        self.repository = repository
+        self.cache = cache
+        self.unit_of_work = unit_of_work
+
+    async def get_inventory_by_uid(self, product_uid: str) -> Inventory:
+        inventory = self.cache.get(product_uid)
+        if inventory is not None:
+            return inventory
+        fill_token = self.cache.begin_fill(product_uid)
+        try:
+            inventory = await self.repository.get_inventory_by_uid(product_uid)
+        except BaseException:
+            self.cache.cancel_fill(product_uid, fill_token)
+            raise
+        self.cache.set(inventory, fill_token)
+        return inventory
+
+    def get_inventories_by_uids(self, product_uids: List[str]) -> AsyncIterator[Inventory]:
+        return self.repository.get_inventories_by_uids(product_uids)
+
+    async def list_inventories(
+        self,
+        after_id: int,
+        limit: int,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+    ) -> List[Inventory]:
+        return await self.repository.list_inventories(after_id, limit, max_available, has_reservations)
+
+    async def list_low_stock(self, after_id: int, limit: int) -> List[Inventory]:
+        return await self.repository.list_low_stock(after_id, limit)
+
+    async def create_inventory(self, inventory: Inventory) -> Inventory:
+        return await self._write([inventory.product_uid], self.repository.create_inventory(inventory))
+
+    async def update_inventory(self, inventory: Inventory) -> Inventory:
+        return await self._write([inventory.product_uid], self.repository.update_inventory(inventory))
+
+    async def upsert_stock_levels(self, levels: List[Tuple[str, int]]) -> Tuple[int, int]:
+        product_uids = [product_uid for product_uid, _ in levels]
+        return await self._write(product_uids, self.repository.upsert_stock_levels(levels))
+
+    async def reserve_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self._write([product_uid], self.repository.reserve_inventory(product_uid, amount))
+
+    async def release_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self._write([product_uid], self.repository.release_inventory(product_uid, amount))
+
+    async def reserve_inventory_batch(self, items: List[Tuple[str, int]]) -> List[Inventory]:
+        product_uids = [product_uid for product_uid, _ in items]
+        return await self._write(product_uids, self.repository.reserve_inventory_batch(items))
+
+    async def set_reorder_threshold(self, product_uid: str, reorder_threshold: Optional[int]) -> Inventory:
+        return await self._write([product_uid], self.repository.set_reorder_threshold(product_uid, reorder_threshold))
+
+    async def set_shard_count(self, product_uid: str, shard_count: int) -> Inventory:
+        return await self._write([product_uid], self.repository.set_shard_count(product_uid, shard_count))
+
+    async def get_inventory_shards(self, product_uid: str) -> List[InventoryShard]:
+        return await self.repository.get_inventory_shards(product_uid)
+
+    async def _write(self, product_uids, operation):
+        self._invalidate(product_uids)
+        try:
+            return await operation
+        finally:
+            if self.unit_of_work is None:
+                self._invalidate(product_uids)
+            else:
+                self.unit_of_work.after_commit(lambda: self._invalidate(product_uids))
+
+    def _invalidate(self, product_uids) -> None:
+        for product_uid in product_uids:
+            self.cache.invalidate(product_uid)
@@ -0,0 +1,60 @@
+from typing import AsyncIterator, List, Optional, Tuple
+
+from src.domain.repositories import InventoryInterface
+from src.domain.entities import Inventory, InventoryShard
+
+class CoalescingInventoryRepository(InventoryInterface):
+    """Sends single-product reservations of another ``InventoryInterface`` through a reservation broker.
+
+    ``broker`` applies them in its own transactions, grouped with concurrent
+    reservations of the same product. Every other operation goes straight to
+    the wrapped repository.
+    """
+    def __init__(self, repository: InventoryInterface, broker):
+        self.repository = repository
+        self.broker = broker
+
+    async def get_inventory_by_uid(self, product_uid: str) -> Inventory:
+        return await self.repository.get_inventory_by_uid(product_uid)
+
+    def get_inventories_by_uids(self, product_uids: List[str]) -> AsyncIterator[Inventory]:
+        return self.repository.get_inventories_by_uids(product_uids)
+
+    async def list_inventories(
+        self,
+        after_id: int,
+        limit: int,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+    ) -> List[Inventory]:
+        return await self.repository.list_inventories(after_id, limit, max_available, has_reservations)
+
+    async def list_low_stock(self, after_id: int, limit: int) -> List[Inventory]:
+        return await self.repository.list_low_stock(after_id, limit)
+
+    async def create_inventory(self, inventory: Inventory) -> Inventory:
+        return await self.repository.create_inventory(inventory)
+
+    async def update_inventory(self, inventory: Inventory) -> Inventory:
+        return await self.repository.update_inventory(inventory)
+
+    async def upsert_stock_levels(self, levels: List[Tuple[str, int]]) -> Tuple[int, int]:
+        return await self.repository.upsert_stock_levels(levels)
+
+    async def reserve_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self.broker.reserve(product_uid, amount)
+
+    async def release_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self.repository.release_inventory(product_uid, amount)
+
+    async def reserve_inventory_batch(self, items: List[Tuple[str, int]]) -> List[Inventory]:
+        return await self.repository.reserve_inventory_batch(items)
+
+    async def set_reorder_threshold(self, product_uid: str, reorder_threshold: Optional[int]) -> Inventory:
+        return await self.repository.set_reorder_threshold(product_uid, reorder_threshold)
+
+    async def set_shard_count(self, product_uid: str, shard_count: int) -> Inventory:
+        return await self.repository.set_shard_count(product_uid, shard_count)
+
+    async def get_inventory_shards(self, product_uid: str) -> List[InventoryShard]:
+        return await self.repository.get_inventory_shards(product_uid)
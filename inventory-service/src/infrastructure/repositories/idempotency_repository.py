@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, update, delete, null
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.repositories import IdempotencyInterface
+from src.domain.entities import IdempotencyRecord
+from src.domain.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyMismatchError
+from src.infrastructure.models.idempotency_key_model import IdempotencyKeyModel
+from src.infrastructure.monitoring import instrumented
+from src.infrastructure.monitoring.inventory_metrics import REPOSITORY_DURATION
+
+class IdempotencyRepository(IdempotencyInterface):
+    """Idempotency-Key records in Postgres.
+
+    The claim is written in the caller's session, which must belong to a
+    ``UnitOfWork``: the commits of the operation the key guards then only
+    end savepoints, and the claim, the inventory change and the response
+    reach the database together when the unit of work is committed after
+    ``complete``. A key is never recorded for a write that rolled back, and a
+    write is never committed without its key and response. A crash in
+    between leaves nothing behind, and the retry runs the operation afresh.
+    """
+
+    def __init__(self, db: AsyncSession = None):
+        self.db = db
+
+    @instrumented(REPOSITORY_DURATION)
+    async def claim(self, record: IdempotencyRecord) -> Optional[IdempotencyRecord]:
+        keys = IdempotencyKeyModel.__table__
+        # A concurrent claim of the same key blocks here until the other
+        # transaction ends. An expired key is taken over in place.
+        statement = insert(keys).values(
+            key=record.key,
+            fingerprint=record.fingerprint,
+            expires_at=record.expires_at,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[keys.c.key],
+            set_=dict(
+                fingerprint=statement.excluded.fingerprint,
+                expires_at=statement.excluded.expires_at,
+                status_code=None,
+                response=null(),
+            ),
+            where=keys.c.expires_at <= datetime.now(timezone.utc),
+        ).returning(keys.c.key)
+        result = await self.db.execute(statement)
+        if result.first() is not None:
+            return None
+
+        result = await self.db.execute(select(*keys.c).where(keys.c.key == record.key))
+        row = result.first()
+        if row is None:
+            # Expired and swept between the two statements.
+            return await self.claim(record)
+
+        existing = IdempotencyKeyModel.entity_from_row(row)
+        if existing.fingerprint != record.fingerprint:
+            raise IdempotencyKeyMismatchError(record.key)
+        if not existing.is_complete():
+            raise IdempotencyKeyInProgressError(record.key)
+        return existing
+
+    @instrumented(REPOSITORY_DURATION)
+    async def complete(self, record: IdempotencyRecord) -> None:
+        await self.db.execute(
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.key == record.key)
+            .values(status_code=record.status_code, response=record.response)
+        )
+        await self.db.commit()
+
+    async def discard(self, record: IdempotencyRecord) -> None:
+        await self.db.rollback()
+
+    @instrumented(REPOSITORY_DURATION)
+    async def delete_expired_keys(self, limit: int) -> int:
+        expired_keys = (
+            select(IdempotencyKeyModel.key)
+            .where(IdempotencyKeyModel.expires_at <= datetime.now(timezone.utc))
+            .order_by(IdempotencyKeyModel.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.key.in_(expired_keys.scalar_subquery()))
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -1,89 +1,408 @@
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy import (
+    select, update, exists, union_all, true, false, values, column, any_, bindparam, func, literal,
+    Integer, String, DateTime
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.infrastructure.config import INVENTORY_STREAM_PARTITION_SIZE
 from src.domain.repositories import InventoryInterface
-from src.domain.entities import Inventory
+from src.domain.entities import Inventory, InventoryShard
+from src.domain.exceptions import (
+    InventoryNotFoundError,
+    InventoryAlreadyExistsError,
+    InsufficientInventoryError
+)
 from src.infrastructure.models.inventory_model import InventoryModel
+from src.infrastructure.monitoring import instrumented
+from src.infrastructure.monitoring.inventory_metrics import REPOSITORY_DURATION
+from src.infrastructure.repositories.inventory_shard_repository import (
+    InventoryShardRepository,
+    inventory_columns,
+    counter_transfer_values,
+    shard_transfer_statement,
+    insufficient_stock_error
+)
+from src.infrastructure.repositories.stock_movement_repository import StockMovementRepository
 from datetime import datetime, timezone
 
+@lru_cache(maxsize=None)
+def stock_transfer_statement(source: str, target: Optional[str], hold: bool = False):
+    """Move ``amount`` units of product ``uid`` from counter ``source`` to ``target`` if there are enough.
+
+    Runs as a single statement: the guarded UPDATE lives in a CTE and, when
+    it matches nothing, the current row is returned instead with
+    ``applied = false``. No row at all means the product does not exist.
+    The guard is re-evaluated by Postgres against the latest row version
+    under the row lock, so concurrent callers can never oversell.
+
+    The row of a sharded product is left alone and the units are moved on
+    one of its shards, picked at random among those not locked, by a second
+    CTE. ``moved`` tells whether such a shard was found, and the returned
+    counters are then the totals over all shards from before the move.
+
+    Reserved units counted in ``held_quantity`` belong to timed reservations
+    and are never moved, and with ``hold`` the moved units are counted
+    there. Both need the inventory row locked before any shard, so sharded
+    products are then left to the caller, with ``moved`` false.
+
+    ``uid``, ``amount`` and ``now`` are bound at execution: the statement is
+    built once per pair of counters, which matters on the hottest path of
+    the service.
+    """
+    inventories = InventoryModel.__table__
+    product_uid = bindparam("uid", type_=String)
+    amount = bindparam("amount", type_=Integer)
+    movable = inventories.c[source]
+    if source == "reserved_quantity":
+        movable = movable - inventories.c.held_quantity
+    counters = counter_transfer_values(inventories, amount, source, target)
+    if hold:
+        counters["held_quantity"] = inventories.c.held_quantity + amount
+    applied = (
+        update(inventories)
+        .where(
+            inventories.c.product_uid == product_uid,
+            inventories.c.shard_count == 0,
+            movable >= amount,
+        )
+        .values(updated_at=bindparam("now"), **counters)
+        .returning(*inventories.c, true().label("applied"), false().label("moved"))
+        .cte("applied")
+    )
+    moved = false()
+    if not hold and source != "reserved_quantity":
+        moved = exists(select(shard_transfer_statement(source, target).cte("moved").c.shard))
+    current = (
+        select(*inventory_columns(), false().label("applied"), moved.label("moved"))
+        .where(inventories.c.product_uid == product_uid)
+        .where(~exists(select(applied.c.id)))
+    )
+    return union_all(select(applied), current)
+
+@lru_cache(maxsize=None)
+def stock_level_upsert_statement():
+    """Set ``quantity_available`` of every product in ``uids`` to the matching entry of ``quantities``.
+
+    Unknown products are inserted with nothing reserved. Rows already at the
+    given level are not touched, which spares a dead tuple and a change
+    notification for each of them. Returns the number of rows updated and
+    inserted, and the products whose stock is sharded, which are left to the
+    caller. ``uids`` must not repeat a product.
+    """
+    inventories = InventoryModel.__table__
+    now = bindparam("now", type_=DateTime(timezone=True))
+    given = func.unnest(
+        bindparam("uids", type_=ARRAY(String)), bindparam("quantities", type_=ARRAY(Integer))
+    ).table_valued("product_uid", "quantity_available").render_derived(name="given")
+    levels = select(given.c.product_uid, given.c.quantity_available).cte("levels")
+    updated = (
+        update(inventories)
+        .where(
+            inventories.c.product_uid == levels.c.product_uid,
+            inventories.c.shard_count == 0,
+            inventories.c.quantity_available != levels.c.quantity_available,
+        )
+        .values(quantity_available=levels.c.quantity_available, updated_at=now)
+        .returning(inventories.c.id)
+        .cte("updated")
+    )
+    inserted = (
+        insert(inventories)
+        .from_select(
+            ["product_uid", "quantity_available", "reserved_quantity", "created_at", "updated_at"],
+            select(levels.c.product_uid, levels.c.quantity_available, literal(0), now, now)
+            .where(~exists().where(inventories.c.product_uid == levels.c.product_uid)),
+        )
+        # A product created concurrently keeps its own stock level.
+        .on_conflict_do_nothing(index_elements=[inventories.c.product_uid])
+        .returning(inventories.c.id)
+        .cte("inserted")
+    )
+    return select(
+        select(func.count()).select_from(updated).scalar_subquery().label("updated"),
+        select(func.count()).select_from(inserted).scalar_subquery().label("inserted"),
+        select(func.array_agg(inventories.c.product_uid))
+        .where(inventories.c.product_uid == levels.c.product_uid, inventories.c.shard_count > 0)
+        .scalar_subquery()
+        .label("sharded"),
+    )
+
 class InventoryRepository(InventoryInterface):
     def __init__(self, db: AsyncSession = None):
         self.db = db
 
+    @instrumented(REPOSITORY_DURATION)
     async def get_inventory_by_uid(self, product_uid: str) -> Inventory:
-        from sqlalchemy import select
-        
-        query = select(InventoryModel).where(InventoryModel.product_uid == product_uid)
+        query = select(*inventory_columns()).where(InventoryModel.product_uid == product_uid)
         result = await self.db.execute(query)
-        inventory_model = result.scalars().first()
+        row = result.first()
         
-        if not inventory_model:
-            raise ValueError(f"Inventory not found for product_uid: {product_uid}")
+        if row is None:
+            raise InventoryNotFoundError(product_uid)
             
-        return inventory_model.to_entity()
+        return InventoryModel.entity_from_row(row)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_inventories_by_uids(self, product_uids: List[str]) -> AsyncIterator[Inventory]:
+        # A single array parameter keeps the statement text identical whatever
+        # the number of UIDs, so asyncpg can reuse its prepared statement.
+        query = select(*inventory_columns()).where(
+            InventoryModel.product_uid == any_(bindparam("product_uids", product_uids, type_=ARRAY(String)))
+        )
+        result = await self.db.stream(query)
+        # A partition at a time: every fetch from the async result is a greenlet switch.
+        async for rows in result.partitions(INVENTORY_STREAM_PARTITION_SIZE):
+            for row in rows:
+                yield InventoryModel.entity_from_row(row)
 
+    @instrumented(REPOSITORY_DURATION)
+    async def list_inventories(
+        self,
+        after_id: int,
+        limit: int,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+    ) -> List[Inventory]:
+        """Up to ``limit`` inventories with an ``id`` above ``after_id``, in ``id`` order.
+
+        Keyset pagination: every page is an index range scan on the primary
+        key, however deep into the table it starts.
+        """
+        rows = select(*inventory_columns()).subquery("inventory_rows")
+        query = select(rows).where(rows.c.id > after_id)
+        if max_available is not None:
+            query = query.where(rows.c.quantity_available <= max_available)
+        if has_reservations is not None:
+            query = query.where((rows.c.reserved_quantity > 0) == has_reservations)
+        result = await self.db.execute(query.order_by(rows.c.id).limit(limit))
+        inventories = [InventoryModel.entity_from_row(row) for row in result]
+        # End the read-only transaction rather than idle in it between pages.
+        await self.db.commit()
+        return inventories
+
+    @instrumented(REPOSITORY_DURATION)
+    async def list_low_stock(self, after_id: int, limit: int) -> List[Inventory]:
+        """Up to ``limit`` products at or below their reorder threshold with an ``id`` above ``after_id``.
+
+        The inner condition on the raw columns is the predicate of the partial
+        index ``ix_inventories_low_stock``, so only low-stock rows are read.
+        It also holds for every sharded product with a threshold, their row
+        counters being zero, hence the outer check on the summed counters.
+        """
+        inventories = InventoryModel.__table__
+        rows = (
+            select(*inventory_columns())
+            .where(inventories.c.quantity_available <= inventories.c.reorder_threshold, inventories.c.id > after_id)
+            .subquery("inventory_rows")
+        )
+        query = (
+            select(rows)
+            .where(rows.c.quantity_available <= rows.c.reorder_threshold)
+            .order_by(rows.c.id)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return [InventoryModel.entity_from_row(row) for row in result]
+
+    @instrumented(REPOSITORY_DURATION)
     async def create_inventory(self, inventory: Inventory) -> Inventory:
-        inventory_model = InventoryModel.from_entity(inventory)
-        self.db.add(inventory_model)
+        inventories = InventoryModel.__table__
+        statement = insert(inventories).values(
+            product_uid=inventory.product_uid,
+            quantity_available=inventory.quantity_available,
+            reserved_quantity=inventory.reserved_quantity,
+            created_at=inventory.created_at,
+            updated_at=inventory.updated_at,
+            shard_count=inventory.shard_count,
+            reorder_threshold=inventory.reorder_threshold,
+        ).returning(inventories.c.id)
         try:
-            await self.db.flush()
-            # Get the generated ID and update the entity
-            inventory.id = inventory_model.id
+            result = await self.db.execute(statement)
+            inventory.id = result.scalar_one()
             await self.db.commit()
             return inventory
+        except IntegrityError:
+            await self.db.rollback()
+            raise InventoryAlreadyExistsError(inventory.product_uid)
         except Exception as e:
             await self.db.rollback()
             raise e
 
-    async def update_inventory(self, inventory: Inventory) -> None:
-        from sqlalchemy import select
-        
-        query = select(InventoryModel).where(InventoryModel.product_uid == inventory.product_uid)
-        result = await self.db.execute(query)
-        inventory_model = result.scalars().first()
-        
-        if not inventory_model:
-            raise ValueError(f"Inventory not found for product_uid: {inventory.product_uid}")
-            
-        inventory_model.quantity_available = inventory.quantity_available
-        inventory_model.reserved_quantity = inventory.reserved_quantity
-        inventory_model.updated_at = inventory.updated_at
-        
+    @instrumented(REPOSITORY_DURATION)
+    async def update_inventory(self, inventory: Inventory) -> Inventory:
+        # Only the stock level is written: reserved_quantity belongs to the
+        # reserve/release paths and must not be overwritten from a stale read.
+        statement = (
+            update(InventoryModel)
+            .where(InventoryModel.product_uid == inventory.product_uid, InventoryModel.shard_count == 0)
+            .values(quantity_available=inventory.quantity_available, updated_at=inventory.updated_at)
+            .returning(*InventoryModel.__table__.c)
+        )
+        result = await self.db.execute(statement)
+        row = result.first()
+
+        if row is None:
+            # Missing or sharded: the new stock level is spread over the shards.
+            await InventoryShardRepository(self.db).reshard(
+                inventory.product_uid, quantity_available=inventory.quantity_available
+            )
+            await self.db.commit()
+            return await self.get_inventory_by_uid(inventory.product_uid)
+
         await self.db.commit()
+        return InventoryModel.entity_from_row(row)
 
-    async def reserve_inventory(self, product_uid: str, amount: int) -> None:
-        from sqlalchemy import select
-        
-        query = select(InventoryModel).where(InventoryModel.product_uid == product_uid)
-        result = await self.db.execute(query)
-        inventory_model = result.scalars().first()
-        
-        if not inventory_model:
-            raise ValueError(f"Inventory not found for product_uid: {product_uid}")
-            
-        if inventory_model.quantity_available < amount:
-            raise ValueError(f"Not enough inventory available. Available: {inventory_model.quantity_available}, Requested: {amount}")
-            
-        inventory_model.quantity_available -= amount
-        inventory_model.reserved_quantity += amount
-        inventory_model.updated_at = datetime.now(timezone.utc)
-        
+    @instrumented(REPOSITORY_DURATION)
+    async def upsert_stock_levels(self, levels: List[Tuple[str, int]]) -> Tuple[int, int]:
+        """Set the available stock of many products in one statement and transaction.
+
+        Returns the number of products inserted and updated; the others were
+        already at the given level.
+        """
+        quantities = dict(levels)
+        # Sorted so that concurrent writers meet the rows in the same order.
+        product_uids = sorted(quantities)
+        await StockMovementRepository(self.db).tag(reason="import")
+        result = await self.db.execute(stock_level_upsert_statement(), {
+            "uids": product_uids,
+            "quantities": [quantities[product_uid] for product_uid in product_uids],
+            "now": datetime.now(timezone.utc),
+        })
+        row = result.one()
+        updated = row.updated
+        shard_repository = InventoryShardRepository(self.db)
+        for product_uid in row.sharded or []:
+            await shard_repository.reshard(product_uid, quantity_available=quantities[product_uid])
+            updated += 1
         await self.db.commit()
+        return row.inserted, updated
 
-    async def release_inventory(self, product_uid: str, amount: int) -> None:
-        from sqlalchemy import select
-        
-        query = select(InventoryModel).where(InventoryModel.product_uid == product_uid)
+    @instrumented(REPOSITORY_DURATION)
+    async def reserve_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self._transfer_stock(product_uid, amount, "quantity_available", "reserved_quantity")
+
+    @instrumented(REPOSITORY_DURATION)
+    async def release_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return await self._transfer_stock(product_uid, amount, "reserved_quantity", "quantity_available")
+
+    @instrumented(REPOSITORY_DURATION)
+    async def reserve_inventory_batch(self, items: List[Tuple[str, int]]) -> List[Inventory]:
+        """Reserve every ``(product_uid, amount)`` pair in one transaction, or none of them.
+
+        Rows are locked in ``product_uid`` order so that two batches sharing
+        products always acquire their locks in the same order and cannot
+        deadlock. The cost is three round trips whatever the number of lines,
+        plus one or two per sharded product, whose shards are locked after
+        every inventory row.
+        """
+        amounts = {}
+        for product_uid, amount in items:
+            amounts[product_uid] = amounts.get(product_uid, 0) + amount
+        product_uids = sorted(amounts)
+
+        query = (
+            select(InventoryModel.product_uid, InventoryModel.quantity_available, InventoryModel.shard_count)
+            .where(InventoryModel.product_uid.in_(product_uids))
+            .order_by(InventoryModel.product_uid)
+            .with_for_update()
+        )
         result = await self.db.execute(query)
-        inventory_model = result.scalars().first()
-        
-        if not inventory_model:
-            raise ValueError(f"Inventory not found for product_uid: {product_uid}")
-            
-        if inventory_model.reserved_quantity < amount:
-            raise ValueError(f"Not enough reserved inventory. Reserved: {inventory_model.reserved_quantity}, Requested: {amount}")
-            
-        inventory_model.quantity_available += amount
-        inventory_model.reserved_quantity -= amount
-        inventory_model.updated_at = datetime.now(timezone.utc)
-        
+        locked = {row.product_uid: row for row in result}
+
+        for product_uid in product_uids:
+            if product_uid not in locked:
+                await self.db.rollback()
+                raise InventoryNotFoundError(product_uid)
+            available = locked[product_uid].quantity_available
+            if not locked[product_uid].shard_count and available < amounts[product_uid]:
+                await self.db.rollback()
+                raise InsufficientInventoryError(product_uid, available, amounts[product_uid])
+
+        sharded = [product_uid for product_uid in product_uids if locked[product_uid].shard_count]
+        shard_repository = InventoryShardRepository(self.db)
+        for product_uid in sharded:
+            await shard_repository.transfer(product_uid, amounts[product_uid], "quantity_available", "reserved_quantity")
+
+        requested = values(
+            column("product_uid", String), column("amount", Integer), name="requested"
+        ).data([(product_uid, amounts[product_uid]) for product_uid in product_uids if product_uid not in sharded])
+        statement = (
+            update(InventoryModel)
+            .where(InventoryModel.product_uid == requested.c.product_uid)
+            .values(
+                quantity_available=InventoryModel.quantity_available - requested.c.amount,
+                reserved_quantity=InventoryModel.reserved_quantity + requested.c.amount,
+                updated_at=datetime.now(timezone.utc),
+            )
+            .returning(*InventoryModel.__table__.c)
+        )
+        inventories = []
+        if len(sharded) < len(product_uids):
+            result = await self.db.execute(statement)
+            inventories = [InventoryModel.entity_from_row(row) for row in result]
+        await self.db.commit()
+        if sharded:
+            inventories += [inventory async for inventory in self.get_inventories_by_uids(sharded)]
+        return inventories
+
+    @instrumented(REPOSITORY_DURATION)
+    async def set_reorder_threshold(self, product_uid: str, reorder_threshold: Optional[int]) -> Inventory:
+        result = await self.db.execute(
+            update(InventoryModel)
+            .where(InventoryModel.product_uid == product_uid)
+            .values(reorder_threshold=reorder_threshold, updated_at=datetime.now(timezone.utc))
+            .returning(InventoryModel.id)
+        )
+        if result.first() is None:
+            await self.db.rollback()
+            raise InventoryNotFoundError(product_uid)
+        await self.db.commit()
+        return await self.get_inventory_by_uid(product_uid)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def set_shard_count(self, product_uid: str, shard_count: int) -> Inventory:
+        await InventoryShardRepository(self.db).reshard(product_uid, shard_count)
+        await self.db.commit()
+        return await self.get_inventory_by_uid(product_uid)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_inventory_shards(self, product_uid: str) -> List[InventoryShard]:
+        shards = await InventoryShardRepository(self.db).get_shards(product_uid)
+        if not shards:
+            # Unsharded products have no shard rows, missing ones no inventory row.
+            await self.get_inventory_by_uid(product_uid)
+        return shards
+
+    async def _transfer_stock(self, product_uid: str, amount: int, source: str, target: str) -> Inventory:
+        result = await self.db.execute(
+            stock_transfer_statement(source, target),
+            {"uid": product_uid, "amount": amount, "now": datetime.now(timezone.utc)},
+        )
+        row = result.first()
+
+        if row is None:
+            await self.db.rollback()
+            raise InventoryNotFoundError(product_uid)
+        if not row.applied and not row.moved:
+            if not row.shard_count:
+                movable = row._mapping[source]
+                if source == "reserved_quantity":
+                    movable -= row.held_quantity
+                await self.db.rollback()
+                raise insufficient_stock_error(product_uid, source, movable, amount)
+            if source == "reserved_quantity":
+                await InventoryShardRepository(self.db).release(product_uid, amount)
+            else:
+                # Every shard holding enough units was busy.
+                await InventoryShardRepository(self.db).transfer(product_uid, amount, source, target)
+
         await self.db.commit()
+        inventory = InventoryModel.entity_from_row(row)
+        if not row.applied:
+            setattr(inventory, source, getattr(inventory, source) - amount)
+            setattr(inventory, target, getattr(inventory, target) + amount)
+        return inventory
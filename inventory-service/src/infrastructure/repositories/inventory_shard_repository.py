@@ -0,0 +1,282 @@
+import random
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional
+
+from sqlalchemy import select, update, delete, case, cast, func, and_, values, column, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import InventoryShard
+from src.domain.exceptions import (
+    InventoryNotFoundError,
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError
+)
+from src.infrastructure.models.inventory_model import InventoryModel
+from src.infrastructure.models.inventory_shard_model import InventoryShardModel
+from src.infrastructure.repositories.stock_movement_repository import StockMovementRepository
+
+STOCK_COUNTERS = ("quantity_available", "reserved_quantity")
+
+def inventory_columns():
+    """Columns of ``inventories`` with the counters of sharded products summed over their shards.
+
+    The CASE keeps unsharded rows, the vast majority, away from the shard
+    table altogether.
+    """
+    inventories = InventoryModel.__table__
+    shards = InventoryShardModel.__table__
+    columns = []
+    for inventory_column in inventories.c:
+        if inventory_column.name in STOCK_COUNTERS:
+            total = (
+                select(func.coalesce(func.sum(shards.c[inventory_column.name]), 0))
+                .where(shards.c.product_uid == inventories.c.product_uid)
+                .scalar_subquery()
+            )
+            inventory_column = case(
+                (inventories.c.shard_count > 0, cast(total, Integer)), else_=inventory_column
+            ).label(inventory_column.name)
+        columns.append(inventory_column)
+    return columns
+
+def counter_transfer_values(table, amount, source: str, target: Optional[str]) -> dict:
+    """SET clause moving ``amount`` units from counter ``source`` to ``target``, or out of stock if None."""
+    counters = {source: table.c[source] - amount}
+    if target is not None:
+        counters[target] = table.c[target] + amount
+    return counters
+
+@lru_cache(maxsize=None)
+def shard_transfer_statement(source: str, target: Optional[str] = None, skip_locked: bool = True):
+    """Move ``amount`` units on one shard of product ``uid`` holding enough of them, picked at random.
+
+    With ``skip_locked`` shards held by other transactions are passed over,
+    and the statement updates nothing if they all are. ``uid`` and
+    ``amount`` are bound at execution, so the statement is built once.
+    """
+    shards = InventoryShardModel.__table__
+    product_uid = bindparam("uid", type_=String)
+    amount = bindparam("amount", type_=Integer)
+    candidate = (
+        select(shards.c.shard)
+        .where(shards.c.product_uid == product_uid, shards.c[source] >= amount)
+        .order_by(func.random())
+        .limit(1)
+        .with_for_update(skip_locked=skip_locked)
+        .scalar_subquery()
+    )
+    return (
+        update(shards)
+        .where(shards.c.product_uid == product_uid, shards.c.shard == candidate, shards.c[source] >= amount)
+        .values(**counter_transfer_values(shards, amount, source, target))
+        .returning(shards.c.shard)
+    )
+
+def insufficient_stock_error(product_uid: str, source: str, held: int, amount: int) -> Exception:
+    if source == "quantity_available":
+        return InsufficientInventoryError(product_uid, held, amount)
+    return InsufficientReservedInventoryError(product_uid, held, amount)
+
+def split_evenly(total: int, parts: int) -> List[int]:
+    quotient, remainder = divmod(total, parts)
+    return [quotient + (1 if part < remainder else 0) for part in range(parts)]
+
+class InventoryShardRepository:
+    """Stock counters of hot products, split across ``inventory_shards`` rows.
+
+    A sharded product keeps zeros in its ``inventories`` counters and as many
+    shard rows as its ``shard_count``, each with its own available and
+    reserved quantities, so concurrent reservations of the product update
+    different rows instead of queueing on one. The methods run inside the
+    caller's transaction and never commit. Like the repository operations they
+    belong to, they roll back before raising.
+    """
+
+    def __init__(self, db: AsyncSession = None):
+        self.db = db
+
+    async def transfer(self, product_uid: str, amount: int, source: str, target: Optional[str] = None) -> None:
+        """Move ``amount`` units from the ``source`` counter to ``target``, or out of stock if None.
+
+        One shard holding enough units is picked at random, skipping shards
+        locked by other transactions. If they are all busy, the call queues
+        on one of them, inside a savepoint: should that shard fall short once
+        locked, rolling back to the savepoint releases it. Only when no single
+        shard holds enough units is every shard locked, in shard order, and
+        the units taken from as many shards as needed.
+        """
+        parameters = {"uid": product_uid, "amount": amount}
+        result = await self.db.execute(shard_transfer_statement(source, target, skip_locked=True), parameters)
+        if result.first() is not None:
+            return
+
+        savepoint = await self.db.begin_nested()
+        result = await self.db.execute(shard_transfer_statement(source, target, skip_locked=False), parameters)
+        if result.first() is not None:
+            await savepoint.commit()
+            return
+        # Holding one shard while waiting for the others in order would deadlock.
+        await savepoint.rollback()
+        await self._transfer_across_shards(product_uid, amount, source, target)
+
+    async def hold(self, product_uid: str, amount: int) -> None:
+        """Reserve ``amount`` units for a timed reservation, counted in ``held_quantity``.
+
+        Counting them locks the inventory row first, as closing reservations
+        and ``release`` do, then the units are moved like by ``transfer``.
+        """
+        inventories = InventoryModel.__table__
+        result = await self.db.execute(
+            update(inventories)
+            .where(inventories.c.product_uid == product_uid)
+            .values(held_quantity=inventories.c.held_quantity + amount)
+            .returning(inventories.c.id)
+        )
+        if result.first() is None:
+            await self.db.rollback()
+            raise InventoryNotFoundError(product_uid)
+        await self.transfer(product_uid, amount, "quantity_available", "reserved_quantity")
+
+    async def release(self, product_uid: str, amount: int) -> None:
+        """Return ``amount`` reserved units to available stock, sparing those held by timed reservations.
+
+        The inventory row, which counts the held units, is locked first, then
+        every shard in order, so that no reservation is created or closed
+        between the check and the transfer.
+        """
+        inventories = InventoryModel.__table__
+        result = await self.db.execute(
+            select(inventories.c.held_quantity).where(inventories.c.product_uid == product_uid).with_for_update()
+        )
+        held = result.scalar_one_or_none()
+        if held is None:
+            await self.db.rollback()
+            raise InventoryNotFoundError(product_uid)
+        await self._transfer_across_shards(product_uid, amount, "reserved_quantity", "quantity_available", spared=held)
+
+    async def _transfer_across_shards(
+        self, product_uid: str, amount: int, source: str, target: Optional[str], spared: int = 0
+    ) -> None:
+        shards = InventoryShardModel.__table__
+        result = await self.db.execute(
+            select(shards.c.shard, shards.c[source].label("held"))
+            .where(shards.c.product_uid == product_uid)
+            .order_by(shards.c.shard)
+            .with_for_update()
+        )
+        held = {row.shard: row.held for row in result}
+        total = sum(held.values()) - spared
+        if total < amount:
+            await self.db.rollback()
+            raise insufficient_stock_error(product_uid, source, total, amount)
+
+        order = sorted(held)
+        start = random.randrange(len(order))
+        takes, remaining = [], amount
+        for shard in order[start:] + order[:start]:
+            take = min(remaining, held[shard])
+            if take:
+                takes.append((shard, take))
+                remaining -= take
+            if not remaining:
+                break
+
+        moved = values(column("shard", Integer), column("amount", Integer), name="moved").data(takes)
+        await self.db.execute(
+            update(shards)
+            .where(shards.c.product_uid == product_uid, shards.c.shard == moved.c.shard)
+            .values(**counter_transfer_values(shards, moved.c.amount, source, target))
+        )
+
+    async def reshard(
+        self, product_uid: str, shard_count: Optional[int] = None, quantity_available: Optional[int] = None
+    ) -> None:
+        """Spread the stock of ``product_uid`` evenly over ``shard_count`` shards.
+
+        ``shard_count`` defaults to the current one, which rebalances the
+        shards, and 0 folds the stock back into the inventory row.
+        ``quantity_available`` replaces the available stock at the same time.
+        The inventory row is locked first, then its shards in order. Existing
+        shard rows are updated in place, so reservations waiting on them
+        carry on against the new values.
+        """
+        inventories = InventoryModel.__table__
+        shards = InventoryShardModel.__table__
+        result = await self.db.execute(
+            select(inventories.c.shard_count, inventories.c.quantity_available, inventories.c.reserved_quantity)
+            .where(inventories.c.product_uid == product_uid)
+            .with_for_update()
+        )
+        inventory = result.first()
+        if inventory is None:
+            await self.db.rollback()
+            raise InventoryNotFoundError(product_uid)
+
+        if shard_count is None:
+            shard_count = inventory.shard_count
+        if quantity_available is None:
+            # Stock only moves between rows of the product: its movements net to zero.
+            await StockMovementRepository(self.db).tag(reason="reshard")
+        result = await self.db.execute(
+            select(shards.c.quantity_available, shards.c.reserved_quantity)
+            .where(shards.c.product_uid == product_uid)
+            .order_by(shards.c.shard)
+            .with_for_update()
+        )
+        current = result.all()
+        available = inventory.quantity_available + sum(row.quantity_available for row in current)
+        reserved = inventory.reserved_quantity + sum(row.reserved_quantity for row in current)
+        if quantity_available is not None:
+            available = quantity_available
+
+        if shard_count:
+            statement = insert(shards).values([
+                dict(product_uid=product_uid, shard=shard, quantity_available=shard_available, reserved_quantity=shard_reserved)
+                for shard, (shard_available, shard_reserved) in enumerate(
+                    zip(split_evenly(available, shard_count), split_evenly(reserved, shard_count))
+                )
+            ])
+            await self.db.execute(statement.on_conflict_do_update(
+                index_elements=[shards.c.product_uid, shards.c.shard],
+                set_=dict(
+                    quantity_available=statement.excluded.quantity_available,
+                    reserved_quantity=statement.excluded.reserved_quantity,
+                ),
+            ))
+        await self.db.execute(
+            delete(shards).where(shards.c.product_uid == product_uid, shards.c.shard >= shard_count)
+        )
+
+        if shard_count != inventory.shard_count or quantity_available is not None:
+            counters = dict(quantity_available=0, reserved_quantity=0)
+            if not shard_count:
+                counters = dict(quantity_available=available, reserved_quantity=reserved)
+            await self.db.execute(
+                update(inventories)
+                .where(inventories.c.product_uid == product_uid)
+                .values(shard_count=shard_count, updated_at=datetime.now(timezone.utc), **counters)
+            )
+
+    async def get_shards(self, product_uid: str) -> List[InventoryShard]:
+        shards = InventoryShardModel.__table__
+        result = await self.db.execute(
+            select(*shards.c).where(shards.c.product_uid == product_uid).order_by(shards.c.shard)
+        )
+        return [InventoryShardModel.entity_from_row(row) for row in result]
+
+    async def find_unbalanced(self, limit: int) -> List[str]:
+        """Products with a shard holding less than half its fair share of available stock."""
+        shards = InventoryShardModel.__table__
+        available = shards.c.quantity_available
+        result = await self.db.execute(
+            select(shards.c.product_uid)
+            .group_by(shards.c.product_uid)
+            .having(and_(
+                func.max(available) - func.min(available) > 1,
+                func.min(available) * 2 * func.count() < func.sum(available),
+            ))
+            .limit(limit)
+        )
+        return list(result.scalars())
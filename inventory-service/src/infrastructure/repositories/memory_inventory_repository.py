@@ -0,0 +1,172 @@
+from typing import AsyncIterator, List, Optional, Tuple
+
+from src.domain.repositories import InventoryInterface
+from src.domain.entities import Inventory, InventoryShard
+from src.domain.exceptions import InventoryNotFoundError, InventoryAlreadyExistsError
+from src.infrastructure.database.memory_strategy import InventoryStore, NO_THRESHOLD
+from src.infrastructure.monitoring import instrumented
+from src.infrastructure.monitoring.inventory_metrics import REPOSITORY_DURATION
+from src.infrastructure.repositories.inventory_shard_repository import insufficient_stock_error, split_evenly
+
+class MemoryInventoryRepository(InventoryInterface):
+    """``InventoryInterface`` over an ``InventoryStore``, with the semantics of ``InventoryRepository``.
+
+    Every operation checks and writes the store without awaiting in
+    between, which makes it atomic against concurrent tasks the way a
+    guarded UPDATE is in Postgres: reservations can never oversell, and a
+    batch is applied entirely or not at all. Sharded products keep their
+    totals; their shards are reported as an even split of them.
+    """
+
+    def __init__(self, db: InventoryStore = None):
+        self.db = db
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_inventory_by_uid(self, product_uid: str) -> Inventory:
+        return self.db.entity(self._slot(product_uid))
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_inventories_by_uids(self, product_uids: List[str]) -> AsyncIterator[Inventory]:
+        slots = self.db.slots
+        for product_uid in product_uids:
+            slot = slots.get(product_uid)
+            if slot is not None:
+                yield self.db.entity(slot)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def list_inventories(
+        self,
+        after_id: int,
+        limit: int,
+        max_available: Optional[int] = None,
+        has_reservations: Optional[bool] = None,
+    ) -> List[Inventory]:
+        store = self.db
+        inventories = []
+        # Slots are ids minus one, so the page starts right at slot ``after_id``.
+        for slot in range(max(after_id, 0), len(store)):
+            if max_available is not None and store.quantity_available[slot] > max_available:
+                continue
+            if has_reservations is not None and (store.reserved_quantity[slot] > 0) != has_reservations:
+                continue
+            inventories.append(store.entity(slot))
+            if len(inventories) == limit:
+                break
+        return inventories
+
+    @instrumented(REPOSITORY_DURATION)
+    async def list_low_stock(self, after_id: int, limit: int) -> List[Inventory]:
+        store = self.db
+        inventories = []
+        for slot in range(max(after_id, 0), len(store)):
+            threshold = store.reorder_threshold[slot]
+            if threshold != NO_THRESHOLD and store.quantity_available[slot] <= threshold:
+                inventories.append(store.entity(slot))
+                if len(inventories) == limit:
+                    break
+        return inventories
+
+    @instrumented(REPOSITORY_DURATION)
+    async def create_inventory(self, inventory: Inventory) -> Inventory:
+        if inventory.product_uid in self.db.slots:
+            raise InventoryAlreadyExistsError(inventory.product_uid)
+        inventory.id = self.db.add(inventory) + 1
+        return inventory
+
+    @instrumented(REPOSITORY_DURATION)
+    async def update_inventory(self, inventory: Inventory) -> Inventory:
+        slot = self._slot(inventory.product_uid)
+        self.db.quantity_available[slot] = inventory.quantity_available
+        self.db.updated_at[slot] = inventory.updated_at.timestamp()
+        return self.db.entity(slot)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def upsert_stock_levels(self, levels: List[Tuple[str, int]]) -> Tuple[int, int]:
+        store = self.db
+        inserted = updated = 0
+        for product_uid, quantity_available in dict(levels).items():
+            slot = store.slots.get(product_uid)
+            if slot is None:
+                store.add(Inventory(product_uid=product_uid, quantity_available=quantity_available))
+                inserted += 1
+            elif store.quantity_available[slot] != quantity_available or store.shard_count[slot]:
+                # Sharded products are always resharded, and counted, like in Postgres.
+                store.quantity_available[slot] = quantity_available
+                store.touch(slot)
+                updated += 1
+        return inserted, updated
+
+    @instrumented(REPOSITORY_DURATION)
+    async def reserve_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return self._transfer_stock(product_uid, amount, "quantity_available", "reserved_quantity")
+
+    @instrumented(REPOSITORY_DURATION)
+    async def release_inventory(self, product_uid: str, amount: int) -> Inventory:
+        return self._transfer_stock(product_uid, amount, "reserved_quantity", "quantity_available")
+
+    @instrumented(REPOSITORY_DURATION)
+    async def reserve_inventory_batch(self, items: List[Tuple[str, int]]) -> List[Inventory]:
+        store = self.db
+        amounts = {}
+        for product_uid, amount in items:
+            amounts[product_uid] = amounts.get(product_uid, 0) + amount
+        product_uids = sorted(amounts)
+
+        slots = []
+        for product_uid in product_uids:
+            slot = self._slot(product_uid)
+            slots.append(slot)
+            available = store.quantity_available[slot]
+            if available < amounts[product_uid]:
+                raise insufficient_stock_error(product_uid, "quantity_available", available, amounts[product_uid])
+
+        for product_uid, slot in zip(product_uids, slots):
+            store.quantity_available[slot] -= amounts[product_uid]
+            store.reserved_quantity[slot] += amounts[product_uid]
+            store.touch(slot)
+        return [store.entity(slot) for slot in slots]
+
+    @instrumented(REPOSITORY_DURATION)
+    async def set_reorder_threshold(self, product_uid: str, reorder_threshold: Optional[int]) -> Inventory:
+        slot = self._slot(product_uid)
+        self.db.reorder_threshold[slot] = NO_THRESHOLD if reorder_threshold is None else reorder_threshold
+        self.db.touch(slot)
+        return self.db.entity(slot)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def set_shard_count(self, product_uid: str, shard_count: int) -> Inventory:
+        slot = self._slot(product_uid)
+        if self.db.shard_count[slot] != shard_count:
+            self.db.shard_count[slot] = shard_count
+            self.db.touch(slot)
+        return self.db.entity(slot)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_inventory_shards(self, product_uid: str) -> List[InventoryShard]:
+        slot = self._slot(product_uid)
+        shard_count = self.db.shard_count[slot]
+        if not shard_count:
+            return []
+        return [
+            InventoryShard(product_uid, shard, available, reserved)
+            for shard, (available, reserved) in enumerate(zip(
+                split_evenly(self.db.quantity_available[slot], shard_count),
+                split_evenly(self.db.reserved_quantity[slot], shard_count),
+            ))
+        ]
+
+    def _slot(self, product_uid: str) -> int:
+        slot = self.db.slots.get(product_uid)
+        if slot is None:
+            raise InventoryNotFoundError(product_uid)
+        return slot
+
+    def _transfer_stock(self, product_uid: str, amount: int, source: str, target: str) -> Inventory:
+        slot = self._slot(product_uid)
+        held = getattr(self.db, source)
+        if held[slot] < amount:
+            raise insufficient_stock_error(product_uid, source, held[slot], amount)
+        held[slot] -= amount
+        getattr(self.db, target)[slot] += amount
+        self.db.touch(slot)
+        return self.db.entity(slot)
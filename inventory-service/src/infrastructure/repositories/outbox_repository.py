@@ -0,0 +1,60 @@
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import select, update, delete, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.models.outbox_event_model import OutboxEventModel
+from src.infrastructure.monitoring import instrumented
+from src.infrastructure.monitoring.inventory_metrics import REPOSITORY_DURATION
+
+class OutboxRepository:
+    """Stock change events queued in ``outbox_events`` by the stock movement trigger.
+
+    A relay leases the oldest unclaimed events in a short transaction, so
+    concurrent relays take disjoint batches, delivers them with no
+    transaction open and deletes them in a second one. A relay dying
+    mid-batch leaves its events to the next claim once the lease runs out.
+    """
+
+    def __init__(self, db: AsyncSession = None):
+        self.db = db
+
+    @instrumented(REPOSITORY_DURATION)
+    async def claim_events(self, limit: int, lease: float) -> List[dict]:
+        """Lease up to ``limit`` events for ``lease`` seconds, oldest first.
+
+        Returns their payloads with ``event_id`` set. Leases run on the
+        database clock, which every relay shares.
+        """
+        outbox = OutboxEventModel.__table__
+        now = func.now()
+        claimable = (
+            select(outbox.c.id)
+            .where(or_(outbox.c.claimed_until.is_(None), outbox.c.claimed_until <= now))
+            .order_by(outbox.c.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(outbox)
+            .where(outbox.c.id.in_(claimable.scalar_subquery()))
+            .values(claimed_until=now + timedelta(seconds=lease))
+            .returning(outbox.c.id, outbox.c.payload)
+        )
+        events = sorted(({"event_id": row.id, **row.payload} for row in result), key=lambda event: event["event_id"])
+        await self.db.commit()
+        return events
+
+    @instrumented(REPOSITORY_DURATION)
+    async def release_events(self, event_ids: List[int]) -> None:
+        """Hand undelivered events back to the next claim, without waiting for their lease."""
+        await self.db.execute(
+            update(OutboxEventModel).where(OutboxEventModel.id.in_(event_ids)).values(claimed_until=None)
+        )
+        await self.db.commit()
+
+    @instrumented(REPOSITORY_DURATION)
+    async def delete_events(self, event_ids: List[int]) -> None:
+        await self.db.execute(delete(OutboxEventModel).where(OutboxEventModel.id.in_(event_ids)))
+        await self.db.commit()
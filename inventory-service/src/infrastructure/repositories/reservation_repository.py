@@ -0,0 +1,198 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, insert, update, delete, exists, case, values, column, Integer, String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.repositories import ReservationInterface
+from src.domain.entities import Reservation
+from src.domain.exceptions import (
+    InventoryNotFoundError,
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError,
+    ReservationNotFoundError
+)
+from src.infrastructure.models.inventory_model import InventoryModel
+from src.infrastructure.models.reservation_model import ReservationModel
+from src.infrastructure.monitoring import instrumented
+from src.infrastructure.monitoring.inventory_metrics import REPOSITORY_DURATION
+from src.infrastructure.repositories.inventory_repository import stock_transfer_statement
+from src.infrastructure.repositories.inventory_shard_repository import InventoryShardRepository, counter_transfer_values
+from src.infrastructure.repositories.stock_movement_repository import StockMovementRepository
+
+class ReservationRepository(ReservationInterface):
+    def __init__(self, db: AsyncSession = None):
+        self.db = db
+
+    @instrumented(REPOSITORY_DURATION)
+    async def create_reservation(self, reservation: Reservation) -> Reservation:
+        amount = reservation.amount
+        result = await self.db.execute(
+            stock_transfer_statement("quantity_available", "reserved_quantity", hold=True),
+            {"uid": reservation.product_uid, "amount": amount, "now": datetime.now(timezone.utc)},
+        )
+        row = result.first()
+
+        if row is None:
+            await self.db.rollback()
+            raise InventoryNotFoundError(reservation.product_uid)
+        if not row.applied and not row.moved:
+            if not row.shard_count:
+                await self.db.rollback()
+                raise InsufficientInventoryError(reservation.product_uid, row.quantity_available, amount)
+            await InventoryShardRepository(self.db).hold(reservation.product_uid, amount)
+
+        reservation.id = str(uuid.uuid4())
+        await self.db.execute(insert(ReservationModel).values(
+            id=reservation.id,
+            product_uid=reservation.product_uid,
+            amount=reservation.amount,
+            expires_at=reservation.expires_at,
+            created_at=reservation.created_at,
+        ))
+        await self.db.commit()
+        return reservation
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_reservation(self, reservation_id: str) -> Reservation:
+        query = select(*ReservationModel.__table__.c).where(ReservationModel.id == reservation_id)
+        result = await self.db.execute(query)
+        row = result.first()
+
+        if row is None:
+            raise ReservationNotFoundError(reservation_id)
+
+        return ReservationModel.entity_from_row(row)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def release_reservation(self, reservation_id: str) -> Reservation:
+        return await self._close_reservation(reservation_id, "quantity_available")
+
+    @instrumented(REPOSITORY_DURATION)
+    async def confirm_reservation(self, reservation_id: str) -> Reservation:
+        # The reserved units are sold: they leave reserved_quantity for good.
+        return await self._close_reservation(reservation_id, None)
+
+    @instrumented(REPOSITORY_DURATION)
+    async def release_expired_reservations(self, limit: int) -> List[Reservation]:
+        """Release up to ``limit`` expired reservations in one transaction.
+
+        Expired rows are taken from the head of the ``expires_at`` index with
+        SKIP LOCKED, so concurrent sweepers share the work, and the stock is
+        returned with inventory rows locked in product_uid order, like
+        batch reservations, to rule out deadlocks.
+        """
+        expired_ids = (
+            select(ReservationModel.id)
+            .where(ReservationModel.expires_at <= datetime.now(timezone.utc))
+            .order_by(ReservationModel.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(ReservationModel)
+            .where(ReservationModel.id.in_(expired_ids.scalar_subquery()))
+            .returning(*ReservationModel.__table__.c)
+        )
+        reservations = [ReservationModel.entity_from_row(row) for row in result]
+        if not reservations:
+            await self.db.rollback()
+            return reservations
+
+        amounts = {}
+        for reservation in reservations:
+            amounts[reservation.product_uid] = amounts.get(reservation.product_uid, 0) + reservation.amount
+        await StockMovementRepository(self.db).tag(reason="expire")
+        await self._settle_reserved(amounts, "quantity_available")
+        await self.db.commit()
+        return reservations
+
+    async def _close_reservation(self, reservation_id: str, target: Optional[str]) -> Reservation:
+        # Delete the reservation and settle its stock in a single statement,
+        # unless the product is sharded, whose row is left alone.
+        closed = (
+            delete(ReservationModel)
+            .where(ReservationModel.id == reservation_id)
+            .returning(*ReservationModel.__table__.c)
+            .cte("closed")
+        )
+        inventories = InventoryModel.__table__
+        settled = (
+            update(inventories)
+            .where(
+                inventories.c.product_uid == closed.c.product_uid,
+                inventories.c.shard_count == 0,
+                inventories.c.held_quantity >= closed.c.amount,
+            )
+            .values(
+                updated_at=datetime.now(timezone.utc),
+                held_quantity=inventories.c.held_quantity - closed.c.amount,
+                **counter_transfer_values(inventories, closed.c.amount, "reserved_quantity", target),
+            )
+            .returning(inventories.c.shard_count)
+            .cte("settled")
+        )
+        result = await self.db.execute(select(*closed.c, exists(select(settled.c.shard_count)).label("settled")))
+        row = result.first()
+
+        if row is None:
+            await self.db.rollback()
+            raise ReservationNotFoundError(reservation_id)
+        if not row.settled:
+            await self._settle_reserved({row.product_uid: row.amount}, target)
+
+        await self.db.commit()
+        return ReservationModel.entity_from_row(row)
+
+    async def _settle_reserved(self, amounts: Dict[str, int], target: Optional[str]) -> None:
+        """Take ``amounts`` units of each product out of ``reserved_quantity``, into ``target`` unless None.
+
+        The units are those of closed reservations, counted in
+        ``held_quantity``, which /release cannot hand back: they are all
+        still reserved, and a product short of them fails the whole
+        settlement instead of settling part of it. Inventory rows are locked
+        in product_uid order, then the shards of sharded products.
+        """
+        inventories = InventoryModel.__table__
+        product_uids = sorted(amounts)
+        result = await self.db.execute(
+            select(inventories.c.product_uid, inventories.c.shard_count, inventories.c.held_quantity)
+            .where(inventories.c.product_uid.in_(product_uids))
+            .order_by(inventories.c.product_uid)
+            .with_for_update()
+        )
+        locked = {row.product_uid: row for row in result}
+        for product_uid in product_uids:
+            if product_uid not in locked:
+                await self.db.rollback()
+                raise InventoryNotFoundError(product_uid)
+            if locked[product_uid].held_quantity < amounts[product_uid]:
+                await self.db.rollback()
+                raise InsufficientReservedInventoryError(
+                    product_uid, locked[product_uid].held_quantity, amounts[product_uid]
+                )
+
+        settled = values(column("product_uid", String), column("amount", Integer), name="settled").data(
+            [(product_uid, amounts[product_uid]) for product_uid in product_uids]
+        )
+        # The counters of sharded products are settled on their shards.
+        counters = {
+            counter: case((inventories.c.shard_count > 0, inventories.c[counter]), else_=settled_counter)
+            for counter, settled_counter in counter_transfer_values(
+                inventories, settled.c.amount, "reserved_quantity", target
+            ).items()
+        }
+        await self.db.execute(
+            update(inventories)
+            .where(inventories.c.product_uid == settled.c.product_uid)
+            .values(
+                updated_at=datetime.now(timezone.utc),
+                held_quantity=inventories.c.held_quantity - settled.c.amount,
+                **counters,
+            )
+        )
+        shard_repository = InventoryShardRepository(self.db)
+        for product_uid in product_uids:
+            if locked[product_uid].shard_count:
+                await shard_repository.transfer(product_uid, amounts[product_uid], "reserved_quantity", target)
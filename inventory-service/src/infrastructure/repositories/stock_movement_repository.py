@@ -0,0 +1,210 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, func, tuple_, true, literal_column, values, column, bindparam, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.repositories import StockMovementInterface
+from src.domain.entities import StockMovement, StockSnapshot
+from src.infrastructure.models.stock_movement_model import StockMovementModel
+from src.infrastructure.models.inventory_snapshot_model import InventorySnapshotModel
+from src.infrastructure.monitoring import instrumented
+from src.infrastructure.monitoring.inventory_metrics import REPOSITORY_DURATION
+
+# Transaction-local settings read by the record_stock_movement() trigger.
+MOVEMENT_SETTINGS = {
+    "reason": "inventory.movement_reason",
+    "idempotency_key": "inventory.idempotency_key",
+}
+NEGATIVE_INFINITY = literal_column("'-infinity'::timestamptz", DateTime(timezone=True))
+
+@lru_cache(maxsize=None)
+def stock_at_statement():
+    """Counters of product ``uid`` at time ``at``: its latest snapshot up to then plus the movements since.
+
+    Snapshots are taken on a fixed period for every product that moved, so
+    the tail read from ``ix_stock_movements_product_uid_created_at`` never
+    spans more than one period. A NULL ``taken_at`` with no movements means
+    the product has no history up to ``at``.
+    """
+    movements = StockMovementModel.__table__
+    snapshots = InventorySnapshotModel.__table__
+    product_uid = bindparam("uid", type_=String)
+    at = bindparam("at", type_=DateTime(timezone=True))
+    origin = values(column("origin", Integer), name="origin").data([(1,)])
+    snapshot = (
+        select(snapshots.c.taken_at, snapshots.c.quantity_available, snapshots.c.reserved_quantity)
+        .where(snapshots.c.product_uid == product_uid, snapshots.c.taken_at <= at)
+        .order_by(snapshots.c.taken_at.desc())
+        .limit(1)
+        .subquery("snapshot")
+    )
+    tail = (
+        select(
+            func.sum(movements.c.delta_available).label("delta_available"),
+            func.sum(movements.c.delta_reserved).label("delta_reserved"),
+            func.count().label("movements"),
+        )
+        .where(
+            movements.c.product_uid == product_uid,
+            movements.c.created_at > func.coalesce(snapshot.c.taken_at, NEGATIVE_INFINITY),
+            movements.c.created_at <= at,
+        )
+        .lateral("tail")
+    )
+    return (
+        select(
+            snapshot.c.taken_at,
+            (func.coalesce(snapshot.c.quantity_available, 0) + func.coalesce(tail.c.delta_available, 0))
+            .label("quantity_available"),
+            (func.coalesce(snapshot.c.reserved_quantity, 0) + func.coalesce(tail.c.delta_reserved, 0))
+            .label("reserved_quantity"),
+            tail.c.movements,
+        )
+        .select_from(origin)
+        .outerjoin(snapshot, true())
+        .join(tail, true())
+    )
+
+@lru_cache(maxsize=None)
+def snapshot_statement():
+    """Snapshot at ``taken_at`` up to ``limit`` products that moved in (``since``, ``taken_at``] and have none there yet.
+
+    Each snapshot folds the movements since the previous snapshot of the
+    product into its counters. Products are picked in product_uid order and
+    conflicting rows are skipped, so concurrent snapshotters only duplicate
+    work, never rows.
+    """
+    movements = StockMovementModel.__table__
+    snapshots = InventorySnapshotModel.__table__
+    taken_at = bindparam("taken_at", type_=DateTime(timezone=True))
+    pending = (
+        select(movements.c.product_uid)
+        .where(
+            movements.c.created_at > bindparam("since", type_=DateTime(timezone=True)),
+            movements.c.created_at <= taken_at,
+            ~select(snapshots.c.product_uid)
+            .where(snapshots.c.product_uid == movements.c.product_uid, snapshots.c.taken_at == taken_at)
+            .exists(),
+        )
+        .group_by(movements.c.product_uid)
+        .order_by(movements.c.product_uid)
+        .limit(bindparam("limit", type_=Integer))
+        .cte("pending")
+    )
+    previous = (
+        select(snapshots.c.taken_at, snapshots.c.quantity_available, snapshots.c.reserved_quantity)
+        .where(snapshots.c.product_uid == pending.c.product_uid, snapshots.c.taken_at < taken_at)
+        .order_by(snapshots.c.taken_at.desc())
+        .limit(1)
+        .lateral("previous")
+    )
+    tail = (
+        select(
+            func.sum(movements.c.delta_available).label("delta_available"),
+            func.sum(movements.c.delta_reserved).label("delta_reserved"),
+        )
+        .where(
+            movements.c.product_uid == pending.c.product_uid,
+            movements.c.created_at > func.coalesce(previous.c.taken_at, NEGATIVE_INFINITY),
+            movements.c.created_at <= taken_at,
+        )
+        .lateral("tail")
+    )
+    rows = (
+        select(
+            pending.c.product_uid,
+            taken_at,
+            func.coalesce(previous.c.quantity_available, 0) + func.coalesce(tail.c.delta_available, 0),
+            func.coalesce(previous.c.reserved_quantity, 0) + func.coalesce(tail.c.delta_reserved, 0),
+        )
+        .select_from(pending)
+        .outerjoin(previous, true())
+        .join(tail, true())
+    )
+    return (
+        insert(snapshots)
+        .from_select(["product_uid", "taken_at", "quantity_available", "reserved_quantity"], rows)
+        .on_conflict_do_nothing()
+    )
+
+class StockMovementRepository(StockMovementInterface):
+    """The stock movement ledger and its snapshots.
+
+    Movements are appended by database triggers in the transaction changing
+    the counters, whichever path changes them, so writers have nothing to do
+    but, optionally, ``tag`` the transaction.
+    """
+
+    def __init__(self, db: AsyncSession = None):
+        self.db = db
+
+    async def tag(self, reason: Optional[str] = None, idempotency_key: Optional[str] = None) -> None:
+        """Record ``reason`` and ``idempotency_key`` on the movements of the current transaction.
+
+        Costs a round trip, so hot paths leave the reason to the trigger,
+        which tells reservations, releases and confirmations apart by itself.
+        """
+        settings = {"reason": reason, "idempotency_key": idempotency_key}
+        calls = [
+            func.set_config(MOVEMENT_SETTINGS[name], value, True)
+            for name, value in settings.items() if value is not None
+        ]
+        if calls:
+            await self.db.execute(select(*calls))
+
+    @instrumented(REPOSITORY_DURATION)
+    async def list_movements(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        after: Optional[Tuple[datetime, int]],
+        limit: int,
+        product_uid: Optional[str] = None,
+    ) -> List[StockMovement]:
+        """Up to ``limit`` movements in [``since``, ``until``), in (created_at, id) order, past ``after``.
+
+        Either bound may be None for an open range.
+        """
+        movements = StockMovementModel.__table__
+        query = select(*movements.c).order_by(movements.c.created_at, movements.c.id).limit(limit)
+        if since is not None:
+            query = query.where(movements.c.created_at >= since)
+        if until is not None:
+            query = query.where(movements.c.created_at < until)
+        if product_uid is not None:
+            query = query.where(movements.c.product_uid == product_uid)
+        if after is not None:
+            query = query.where(tuple_(movements.c.created_at, movements.c.id) > tuple_(*after))
+        result = await self.db.execute(query)
+        return [StockMovementModel.entity_from_row(row) for row in result]
+
+    @instrumented(REPOSITORY_DURATION)
+    async def get_stock_at(self, product_uid: str, at: datetime) -> Optional[StockSnapshot]:
+        row = (await self.db.execute(stock_at_statement(), {"uid": product_uid, "at": at})).one()
+        if row.taken_at is None and not row.movements:
+            return None
+        return StockSnapshot(
+            product_uid=product_uid,
+            taken_at=at,
+            quantity_available=row.quantity_available,
+            reserved_quantity=row.reserved_quantity,
+        )
+
+    async def latest_snapshot_time(self) -> Optional[datetime]:
+        result = await self.db.execute(select(func.max(InventorySnapshotModel.taken_at)))
+        return result.scalar()
+
+    async def first_movement_after(self, since: Optional[datetime]) -> Optional[datetime]:
+        query = select(func.min(StockMovementModel.created_at))
+        if since is not None:
+            query = query.where(StockMovementModel.created_at > since)
+        return (await self.db.execute(query)).scalar()
+
+    @instrumented(REPOSITORY_DURATION)
+    async def take_snapshots(self, taken_at: datetime, since: datetime, limit: int) -> int:
+        result = await self.db.execute(snapshot_statement(), {"taken_at": taken_at, "since": since, "limit": limit})
+        await self.db.commit()
+        return result.rowcount
@@ -1,13 +1,61 @@
 from .inventory_schema import (
     InventoryCreateSchema,
     InventoryUpdateSchema,
+    InventoryImportRowSchema,
     InventoryReserveSchema,
-    InventoryReleaseSchema
+    InventoryReleaseSchema,
+    InventoryBatchReserveSchema,
+    InventoryLookupSchema,
+    InventoryReorderThresholdSchema,
+    InventoryShardingSchema,
+    ReservationCreateSchema
+)
+from .inventory_response_schema import (
+    InventoryResponseSchema,
+    InventoryRowResponseSchema,
+    InventoryCreatedSchema,
+    InventoryLevelsResponseSchema,
+    InventoryShardResponseSchema,
+    MessageResponseSchema,
+    InventoryCreateResponseSchema,
+    InventoryMessageResponseSchema,
+    InventoryRowMessageResponseSchema,
+    InventoryBatchReserveResponseSchema,
+    InventoryPageResponseSchema,
+    InventoryLookupResponseSchema,
+    InventoryShardsResponseSchema,
+    InventoryImportErrorSchema,
+    InventoryImportResponseSchema,
+    InventoryCacheStatsResponseSchema,
+    INVENTORY_ROWS
 )
 
 __all__ = [
     "InventoryCreateSchema",
     "InventoryUpdateSchema",
+    "InventoryImportRowSchema",
     "InventoryReserveSchema",
-    "InventoryReleaseSchema"
+    "InventoryReleaseSchema",
+    "InventoryBatchReserveSchema",
+    "InventoryLookupSchema",
+    "InventoryReorderThresholdSchema",
+    "InventoryShardingSchema",
+    "ReservationCreateSchema",
+    "InventoryResponseSchema",
+    "InventoryRowResponseSchema",
+    "InventoryCreatedSchema",
+    "InventoryLevelsResponseSchema",
+    "InventoryShardResponseSchema",
+    "MessageResponseSchema",
+    "InventoryCreateResponseSchema",
+    "InventoryMessageResponseSchema",
+    "InventoryRowMessageResponseSchema",
+    "InventoryBatchReserveResponseSchema",
+    "InventoryPageResponseSchema",
+    "InventoryLookupResponseSchema",
+    "InventoryShardsResponseSchema",
+    "InventoryImportErrorSchema",
+    "InventoryImportResponseSchema",
+    "InventoryCacheStatsResponseSchema",
+    "INVENTORY_ROWS"
 ]
\ No newline at end of file
@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+# Response models validate straight from domain entities, by attribute, and
+# FastAPI then dumps them to JSON bytes in pydantic-core, without going
+# through jsonable_encoder.
+
+class InventoryResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_uid: str
+    quantity_available: int
+    reserved_quantity: int
+    created_at: datetime
+    updated_at: datetime
+    shard_count: int
+    reorder_threshold: Optional[int]
+
+class InventoryRowResponseSchema(BaseModel):
+    """An inventory in lists, lookups and exports."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_uid: str
+    quantity_available: int
+    reserved_quantity: int
+    reorder_threshold: Optional[int]
+    updated_at: datetime
+
+class InventoryCreatedSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_uid: str
+    quantity_available: int
+    reserved_quantity: int
+    reorder_threshold: Optional[int]
+
+class InventoryLevelsResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    product_uid: str
+    quantity_available: int
+    reserved_quantity: int
+
+class InventoryShardResponseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    shard: int
+    quantity_available: int
+    reserved_quantity: int
+
+class MessageResponseSchema(BaseModel):
+    message: str
+
+class InventoryCreateResponseSchema(MessageResponseSchema):
+    inventory: InventoryCreatedSchema
+
+class InventoryMessageResponseSchema(MessageResponseSchema):
+    inventory: InventoryResponseSchema
+
+class InventoryRowMessageResponseSchema(MessageResponseSchema):
+    inventory: InventoryRowResponseSchema
+
+class InventoryBatchReserveResponseSchema(MessageResponseSchema):
+    inventories: List[InventoryLevelsResponseSchema]
+
+class InventoryPageResponseSchema(BaseModel):
+    inventories: List[InventoryRowResponseSchema]
+    next_cursor: Optional[str]
+
+class InventoryLookupResponseSchema(BaseModel):
+    inventories: List[InventoryRowResponseSchema]
+    missing: List[str]
+
+class InventoryShardsResponseSchema(BaseModel):
+    product_uid: str
+    shard_count: int
+    shards: List[InventoryShardResponseSchema]
+
+class InventoryImportErrorSchema(BaseModel):
+    line: int
+    error: str
+
+class InventoryImportResponseSchema(MessageResponseSchema):
+    processed: int
+    inserted: int
+    updated: int
+    unchanged: int
+    failed: int
+    errors: List[InventoryImportErrorSchema]
+
+class InventoryCacheStatsResponseSchema(BaseModel):
+    """Only ``enabled`` is set when the cache is disabled."""
+    enabled: bool
+    size: Optional[int] = None
+    max_size: Optional[int] = None
+    ttl: Optional[float] = None
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+    evictions: Optional[int] = None
+    expirations: Optional[int] = None
+
+# Streamed responses dump whole pages of entities in one call.
+INVENTORY_ROWS = TypeAdapter(List[InventoryRowResponseSchema])
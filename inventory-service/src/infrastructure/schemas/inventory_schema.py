@@ -1,21 +1,49 @@
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from src.infrastructure.config import (
+    INVENTORY_LOOKUP_MAX_UIDS,
+    INVENTORY_MAX_SHARDS,
+    RESERVATION_DEFAULT_TTL,
+    RESERVATION_MAX_TTL
+)
 
 class InventoryCreateSchema(BaseModel):
     product_uid: str
     quantity_available: int
     reserved_quantity: int = 0
+    reorder_threshold: Optional[int] = Field(default=None, ge=0)
 
 class InventoryUpdateSchema(BaseModel):
     product_uid: str
     quantity_available: int
 
+class InventoryImportRowSchema(BaseModel):
+    product_uid: str = Field(min_length=1)
+    quantity_available: int = Field(ge=0, le=2**31 - 1)
+
 class InventoryReserveSchema(BaseModel):
     product_uid: str
-    amount: int
+    amount: int = Field(gt=0)
 
 class InventoryReleaseSchema(BaseModel):
     product_uid: str
-    amount: int
+    amount: int = Field(gt=0)
+
+class InventoryBatchReserveSchema(BaseModel):
+    items: List[InventoryReserveSchema] = Field(min_length=1)
 
+class InventoryLookupSchema(BaseModel):
+    product_uids: List[str] = Field(min_length=1, max_length=INVENTORY_LOOKUP_MAX_UIDS)
 
+class InventoryReorderThresholdSchema(BaseModel):
+    # null clears the threshold
+    reorder_threshold: Optional[int] = Field(ge=0)
 
+class InventoryShardingSchema(BaseModel):
+    shard_count: int = Field(ge=1, le=INVENTORY_MAX_SHARDS)
+
+class ReservationCreateSchema(BaseModel):
+    product_uid: str
+    amount: int = Field(gt=0)
+    ttl_seconds: int = Field(default=RESERVATION_DEFAULT_TTL, gt=0, le=RESERVATION_MAX_TTL)
@@ -0,0 +1,8 @@
+from src.infrastructure.tasks.batch_sweeper import BatchSweeper
+from src.infrastructure.tasks.reservation_sweeper import ReservationSweeper
+from src.infrastructure.tasks.idempotency_key_sweeper import IdempotencyKeySweeper
+from src.infrastructure.tasks.shard_rebalancer import ShardRebalancer
+from src.infrastructure.tasks.stock_snapshotter import StockSnapshotter
+from src.infrastructure.tasks.outbox_relay import OutboxRelay
+
+__all__ = ["BatchSweeper", "ReservationSweeper", "IdempotencyKeySweeper", "ShardRebalancer", "StockSnapshotter", "OutboxRelay"]
@@ -0,0 +1,49 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from loguru import logger
+
+class BatchSweeper(ABC):
+    """Background task deleting expired rows in bounded batches.
+
+    Each pass handles at most ``batch_size`` rows in one transaction. A full
+    batch is followed by another pass straight away; otherwise the sweeper
+    sleeps for ``interval`` seconds. The work per pass is bounded by the batch
+    size whatever the size of the table.
+    """
+    name = "batch-sweeper"
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def sweep(self) -> int:
+        """Run one pass and return the number of rows handled."""
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                swept = await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self.name} pass failed: {str(e)}")
+                swept = 0
+            if swept < self.batch_size:
+                await asyncio.sleep(self.interval)
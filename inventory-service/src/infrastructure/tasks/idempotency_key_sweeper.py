@@ -0,0 +1,33 @@
+from contextlib import asynccontextmanager
+from typing import Type
+
+from loguru import logger
+
+from src.infrastructure.config import IDEMPOTENCY_SWEEP_INTERVAL, IDEMPOTENCY_SWEEP_BATCH_SIZE
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.repositories import IdempotencyRepository
+from src.infrastructure.tasks.batch_sweeper import BatchSweeper
+
+class IdempotencyKeySweeper(BatchSweeper):
+    """Background task deleting expired rows of ``idempotency_keys``.
+
+    Expired keys are already ignored by claims; sweeping only keeps the table
+    and its index small.
+    """
+    name = "idempotency-key-sweeper"
+
+    def __init__(
+        self,
+        strategy: Type[DatabaseStrategy],
+        interval: float = IDEMPOTENCY_SWEEP_INTERVAL,
+        batch_size: int = IDEMPOTENCY_SWEEP_BATCH_SIZE,
+    ):
+        super().__init__(interval, batch_size)
+        self.session = asynccontextmanager(strategy.get_session)
+
+    async def sweep(self) -> int:
+        async with self.session() as session:
+            deleted = await IdempotencyRepository(session).delete_expired_keys(self.batch_size)
+        if deleted:
+            logger.debug(f"Deleted {deleted} expired idempotency keys")
+        return deleted
@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Type
+
+from loguru import logger
+
+from src.infrastructure.config import OUTBOX_POLL_INTERVAL, OUTBOX_BATCH_SIZE, OUTBOX_MAX_RETRY_DELAY, OUTBOX_LEASE
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.monitoring.inventory_metrics import OUTBOX_EVENTS
+from src.infrastructure.notifications.event_sinks import EventSink
+from src.infrastructure.repositories import OutboxRepository
+from src.infrastructure.tasks.batch_sweeper import BatchSweeper
+
+class OutboxRelay(BatchSweeper):
+    """Background task delivering the stock change outbox to an event sink, at least once.
+
+    Each pass leases a batch in one short transaction, publishes it with no
+    connection held, and deletes it in a second transaction; events are only
+    removed once the sink has acknowledged them. A slow sink thus pins
+    neither a pooled connection nor row locks. The relay
+    pulls no faster than the sink accepts, so a slow or failing consumer
+    never slows down writers: the outbox table absorbs the backlog, and
+    failed batches are retried with exponential backoff.
+
+    With one relay, events of a product are delivered in the order of its
+    changes. Concurrent relays share the work but may interleave batches.
+    """
+    name = "outbox-relay"
+
+    def __init__(
+        self,
+        strategy: Type[DatabaseStrategy],
+        sink: EventSink,
+        interval: float = OUTBOX_POLL_INTERVAL,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_retry_delay: float = OUTBOX_MAX_RETRY_DELAY,
+        lease: float = OUTBOX_LEASE,
+    ):
+        super().__init__(interval, batch_size)
+        self.session = asynccontextmanager(strategy.get_session)
+        self.sink = sink
+        self.max_retry_delay = max_retry_delay
+        self.lease = lease
+        self._failures = 0
+
+    async def start(self) -> None:
+        await self.sink.start()
+        await super().start()
+
+    async def stop(self) -> None:
+        await super().stop()
+        await self.sink.stop()
+
+    async def sweep(self) -> int:
+        async with self.session() as session:
+            events = await OutboxRepository(session).claim_events(self.batch_size, self.lease)
+        if not events:
+            return 0
+        event_ids = [event["event_id"] for event in events]
+        try:
+            await self.sink.publish(events)
+        except Exception as e:
+            # Release the batch before backing off, another relay may take it.
+            async with self.session() as session:
+                await OutboxRepository(session).release_events(event_ids)
+            OUTBOX_EVENTS.inc("failed", amount=len(events))
+            delay = min(self.max_retry_delay, 2 ** self._failures)
+            self._failures += 1
+            logger.warning(f"Delivery of {len(events)} outbox events failed, retrying in {delay}s: {str(e)}")
+            await asyncio.sleep(delay)
+            return 0
+        async with self.session() as session:
+            await OutboxRepository(session).delete_events(event_ids)
+        self._failures = 0
+        OUTBOX_EVENTS.inc("delivered", amount=len(events))
+        return len(events)
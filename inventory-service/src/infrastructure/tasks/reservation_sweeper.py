@@ -0,0 +1,35 @@
+from contextlib import asynccontextmanager
+from typing import Optional, Type
+
+from loguru import logger
+
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.config import RESERVATION_SWEEP_INTERVAL, RESERVATION_SWEEP_BATCH_SIZE
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.repositories import ReservationRepository
+from src.infrastructure.tasks.batch_sweeper import BatchSweeper
+
+class ReservationSweeper(BatchSweeper):
+    """Background task returning the stock of expired reservations."""
+    name = "reservation-sweeper"
+
+    def __init__(
+        self,
+        strategy: Type[DatabaseStrategy],
+        cache: Optional[InventoryCache] = None,
+        interval: float = RESERVATION_SWEEP_INTERVAL,
+        batch_size: int = RESERVATION_SWEEP_BATCH_SIZE,
+    ):
+        super().__init__(interval, batch_size)
+        self.session = asynccontextmanager(strategy.get_session)
+        self.cache = cache
+
+    async def sweep(self) -> int:
+        async with self.session() as session:
+            reservations = await ReservationRepository(session).release_expired_reservations(self.batch_size)
+        if self.cache is not None:
+            for reservation in reservations:
+                self.cache.invalidate(reservation.product_uid)
+        if reservations:
+            logger.info(f"Released {len(reservations)} expired reservations")
+        return len(reservations)
@@ -0,0 +1,38 @@
+from contextlib import asynccontextmanager
+from typing import Type
+
+from loguru import logger
+
+from src.infrastructure.config import SHARD_REBALANCE_INTERVAL, SHARD_REBALANCE_BATCH_SIZE
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.repositories import InventoryShardRepository
+from src.infrastructure.tasks.batch_sweeper import BatchSweeper
+
+class ShardRebalancer(BatchSweeper):
+    """Background task evening out the shards of sharded products.
+
+    Reservations drain shards unevenly, and a dry shard sends reservations to
+    the slow path that locks every shard of the product. Each product is
+    rebalanced in its own short transaction; totals do not change.
+    """
+    name = "shard-rebalancer"
+
+    def __init__(
+        self,
+        strategy: Type[DatabaseStrategy],
+        interval: float = SHARD_REBALANCE_INTERVAL,
+        batch_size: int = SHARD_REBALANCE_BATCH_SIZE,
+    ):
+        super().__init__(interval, batch_size)
+        self.session = asynccontextmanager(strategy.get_session)
+
+    async def sweep(self) -> int:
+        async with self.session() as session:
+            repository = InventoryShardRepository(session)
+            product_uids = await repository.find_unbalanced(self.batch_size)
+            for product_uid in product_uids:
+                await repository.reshard(product_uid)
+                await session.commit()
+        if product_uids:
+            logger.debug(f"Rebalanced the shards of {len(product_uids)} products")
+        return len(product_uids)
@@ -0,0 +1,70 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Type
+
+from loguru import logger
+
+from src.infrastructure.config import (
+    STOCK_SNAPSHOT_PERIOD,
+    STOCK_SNAPSHOT_LAG,
+    STOCK_SNAPSHOT_INTERVAL,
+    STOCK_SNAPSHOT_BATCH_SIZE
+)
+from src.infrastructure.database.database_strategy import DatabaseStrategy
+from src.infrastructure.repositories import StockMovementRepository
+from src.infrastructure.tasks.batch_sweeper import BatchSweeper
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+class StockSnapshotter(BatchSweeper):
+    """Background task folding the stock movement ledger into periodic snapshots.
+
+    Snapshots are taken at multiples of ``period`` seconds, for the products
+    that moved since the previous one, once ``lag`` seconds have passed so
+    that no movement dated before them can still commit. Periods are done in
+    order, ``batch_size`` products at a time, and periods without movements
+    are skipped.
+    """
+    name = "stock-snapshotter"
+
+    def __init__(
+        self,
+        strategy: Type[DatabaseStrategy],
+        period: int = STOCK_SNAPSHOT_PERIOD,
+        lag: float = STOCK_SNAPSHOT_LAG,
+        interval: float = STOCK_SNAPSHOT_INTERVAL,
+        batch_size: int = STOCK_SNAPSHOT_BATCH_SIZE,
+    ):
+        super().__init__(interval, batch_size)
+        self.session = asynccontextmanager(strategy.get_session)
+        self.period = timedelta(seconds=period)
+        self.lag = timedelta(seconds=lag)
+        # Snapshot time known to be complete, so its products are not looked
+        # for again on every pass.
+        self._completed: Optional[datetime] = None
+
+    def snapshot_time_after(self, moment: datetime) -> datetime:
+        """The first multiple of the period at or after ``moment``."""
+        periods = -((EPOCH - moment) // self.period)
+        return EPOCH + periods * self.period
+
+    async def sweep(self) -> int:
+        async with self.session() as session:
+            repository = StockMovementRepository(session)
+            latest = await repository.latest_snapshot_time()
+            if latest is not None and latest != self._completed:
+                taken = await repository.take_snapshots(latest, latest - self.period, self.batch_size)
+                if taken:
+                    logger.debug(f"Took {taken} stock snapshots at {latest.isoformat()}")
+                    return taken
+                self._completed = latest
+
+            first = await repository.first_movement_after(latest)
+            if first is None:
+                return 0
+            taken_at = self.snapshot_time_after(first)
+            if taken_at > datetime.now(timezone.utc) - self.lag:
+                return 0
+            taken = await repository.take_snapshots(taken_at, taken_at - self.period, self.batch_size)
+        logger.debug(f"Took {taken} stock snapshots at {taken_at.isoformat()}")
+        return taken
@@ -1,6 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from src.infrastructure.config import DATABASE_STRATEGY, METRICS_ENABLED
+from src.infrastructure.monitoring import MetricsRegistry
+
+from src.interface.exception_handlers import exception_handlers
+from src.interface.lifespan import lifespan
+from src.interface.middlewares import MetricsMiddleware
 from src.interface.routes.inventory_route import router as inventory_route
+from src.interface.routes.reservation_route import router as reservation_route
+from src.interface.routes.stock_movement_route import router as stock_movement_route
+from src.interface.routes.stock_stream_route import router as stock_stream_route
 
 app = FastAPI(
     title="Inventory Service",
@@ -15,7 +25,27 @@ app = FastAPI(
         "name": "MIT",
         "url": "https://opensource.org/licenses/MIT",
     },
+    exception_handlers=exception_handlers,
+    lifespan=lifespan,
 )
 
 # Routers
+# Stock movements and streams first: GET /inventory/movements would match /inventory/{product_uid}
+# The in-memory stand-in only keeps inventories.
+if DATABASE_STRATEGY == "sqlalchemy":
+    app.include_router(stock_movement_route)
+    app.include_router(stock_stream_route)
 app.include_router(inventory_route)
+if DATABASE_STRATEGY == "sqlalchemy":
+    app.include_router(reservation_route)
+
+# Metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(
+            MetricsRegistry.get_instance().render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,135 @@
+from typing import AsyncIterator, Callable, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.services import InventoryService, ReservationService, StockMovementService
+from src.domain.repositories import InventoryInterface
+from src.infrastructure.brokers import ReservationBroker
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.config import (
+    DATABASE_STRATEGY,
+    IDEMPOTENCY_STORE,
+    INVENTORY_CACHE_ENABLED,
+    RESERVATION_BROKER_ENABLED,
+    LOW_STOCK_WEBHOOK_URL
+)
+from src.infrastructure.database import DatabaseFactory, UnitOfWork
+from src.infrastructure.notifications import LowStockNotifier
+from src.infrastructure.repositories import (
+    build_inventory_repository,
+    CachedInventoryRepository,
+    CoalescingInventoryRepository,
+    ReservationRepository,
+    StockMovementRepository
+)
+from src.interface.idempotency import IDEMPOTENCY_KEY_HEADER
+
+# Sessions are cheap checkouts from the pool built in the application lifespan
+db_instance = DatabaseFactory.get_default_strategy().get_session
+
+async def get_idempotent_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session of the routes run through ``run_idempotent``.
+
+    A request carrying an Idempotency-Key, with the postgres store, gets the
+    session of a unit of work instead, which ``run_idempotent`` commits with
+    the key and the response, and which is rolled back if the request ends
+    otherwise.
+    """
+    if IDEMPOTENCY_STORE == "postgres" and IDEMPOTENCY_KEY_HEADER in request.headers:
+        async with DatabaseFactory.get_default_strategy().unit_of_work() as unit_of_work:
+            request.state.unit_of_work = unit_of_work
+            yield unit_of_work.session
+        return
+    async for session in db_instance():
+        yield session
+
+RepositoryLayer = Callable[[InventoryInterface, Optional[UnitOfWork]], InventoryInterface]
+
+class ServiceProvider:
+    """Builds the services of a request around its session.
+
+    Everything else they need lives as long as the worker: the cache,
+    reservation broker and low-stock notifier singletons are resolved, and
+    the repository layers to stack are chosen from the configuration, once,
+    when the provider is built in the lifespan. A request only wraps its
+    session in those layers and its service, which are also handed the unit
+    of work the session belongs to, if any.
+    """
+
+    def __init__(
+        self,
+        strategy: str = DATABASE_STRATEGY,
+        cache: Optional[InventoryCache] = None,
+        broker: Optional[ReservationBroker] = None,
+        low_stock_notifier: Optional[LowStockNotifier] = None,
+    ):
+        self.strategy = strategy
+        self.cache = cache
+        self.low_stock_notifier = low_stock_notifier
+        # Innermost first; the coalescing chain adds the broker under the cache.
+        self.layers: List[RepositoryLayer] = []
+        self.coalescing_layers: List[RepositoryLayer] = []
+        if broker is not None:
+            self.coalescing_layers.append(
+                lambda repository, unit_of_work: CoalescingInventoryRepository(repository, broker)
+            )
+        if cache is not None:
+            self.layers.append(
+                lambda repository, unit_of_work: CachedInventoryRepository(repository, cache, unit_of_work)
+            )
+            self.coalescing_layers.append(self.layers[-1])
+
+    @classmethod
+    def from_config(cls) -> 'ServiceProvider':
+        return cls(
+            strategy=DATABASE_STRATEGY,
+            cache=InventoryCache.get_instance() if INVENTORY_CACHE_ENABLED else None,
+            broker=ReservationBroker.get_instance() if RESERVATION_BROKER_ENABLED else None,
+            low_stock_notifier=LowStockNotifier.get_instance() if LOW_STOCK_WEBHOOK_URL else None,
+        )
+
+    def inventory_service(self, session, coalesce: bool = False) -> InventoryService:
+        repository = build_inventory_repository(session, self.strategy)
+        unit_of_work = UnitOfWork.of(session)
+        for layer in self.coalescing_layers if coalesce else self.layers:
+            repository = layer(repository, unit_of_work)
+        return InventoryService(repository, self.low_stock_notifier)
+
+    def reservation_service(self, session: AsyncSession) -> ReservationService:
+        return ReservationService(ReservationRepository(session), self.cache, UnitOfWork.of(session))
+
+    def stock_movement_service(self, session: AsyncSession) -> StockMovementService:
+        return StockMovementService(StockMovementRepository(session))
+
+# Dependencies are coroutines, as FastAPI runs plain functions in its
+# threadpool, and read the provider off the request rather than depending on
+# it: each level of dependencies is solved again on every request.
+
+def service_provider(request: Request) -> ServiceProvider:
+    return request.app.state.service_provider
+
+async def get_inventory_service(request: Request, session: AsyncSession = Depends(db_instance)) -> InventoryService:
+    return service_provider(request).inventory_service(session)
+
+async def get_idempotent_inventory_service(
+    request: Request, session: AsyncSession = Depends(get_idempotent_session)) -> InventoryService:
+    return service_provider(request).inventory_service(session)
+
+async def get_reserving_inventory_service(
+    request: Request, session: AsyncSession = Depends(get_idempotent_session)) -> InventoryService:
+    # The broker commits in its own transactions, so keyed requests keep the
+    # direct path where the key is committed together with the reservation.
+    coalesce = IDEMPOTENCY_KEY_HEADER not in request.headers
+    return service_provider(request).inventory_service(session, coalesce=coalesce)
+
+async def get_reservation_service(request: Request, session: AsyncSession = Depends(db_instance)) -> ReservationService:
+    return service_provider(request).reservation_service(session)
+
+async def get_idempotent_reservation_service(
+    request: Request, session: AsyncSession = Depends(get_idempotent_session)) -> ReservationService:
+    return service_provider(request).reservation_service(session)
+
+async def get_stock_movement_service(
+    request: Request, session: AsyncSession = Depends(db_instance)) -> StockMovementService:
+    return service_provider(request).stock_movement_service(session)
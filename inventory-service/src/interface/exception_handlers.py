@@ -0,0 +1,67 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from src.domain.exceptions import (
+    InventoryNotFoundError,
+    InventoryAlreadyExistsError,
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError,
+    ReservationNotFoundError,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyMismatchError
+)
+from src.infrastructure.monitoring.inventory_metrics import INVENTORY_OUTCOMES
+
+async def inventory_not_found_handler(request: Request, exc: InventoryNotFoundError):
+    INVENTORY_OUTCOMES.inc("not_found")
+    return JSONResponse(status_code=404, content={"detail": str(exc), "product_uid": exc.product_uid})
+
+async def inventory_already_exists_handler(request: Request, exc: InventoryAlreadyExistsError):
+    INVENTORY_OUTCOMES.inc("already_exists")
+    return JSONResponse(status_code=409, content={"detail": str(exc), "product_uid": exc.product_uid})
+
+async def insufficient_inventory_handler(request: Request, exc: InsufficientInventoryError):
+    INVENTORY_OUTCOMES.inc("insufficient_stock")
+    return JSONResponse(
+        status_code=409,
+        content={
+            "detail": str(exc),
+            "product_uid": exc.product_uid,
+            "available": exc.available,
+            "requested": exc.requested,
+        },
+    )
+
+async def insufficient_reserved_inventory_handler(request: Request, exc: InsufficientReservedInventoryError):
+    INVENTORY_OUTCOMES.inc("insufficient_reserved")
+    return JSONResponse(
+        status_code=409,
+        content={
+            "detail": str(exc),
+            "product_uid": exc.product_uid,
+            "reserved": exc.reserved,
+            "requested": exc.requested,
+        },
+    )
+
+async def reservation_not_found_handler(request: Request, exc: ReservationNotFoundError):
+    INVENTORY_OUTCOMES.inc("reservation_not_found")
+    return JSONResponse(status_code=404, content={"detail": str(exc), "reservation_id": exc.reservation_id})
+
+async def idempotency_key_in_progress_handler(request: Request, exc: IdempotencyKeyInProgressError):
+    INVENTORY_OUTCOMES.inc("idempotency_in_progress")
+    return JSONResponse(status_code=409, content={"detail": str(exc), "idempotency_key": exc.key})
+
+async def idempotency_key_mismatch_handler(request: Request, exc: IdempotencyKeyMismatchError):
+    INVENTORY_OUTCOMES.inc("idempotency_mismatch")
+    return JSONResponse(status_code=422, content={"detail": str(exc), "idempotency_key": exc.key})
+
+exception_handlers = {
+    InventoryNotFoundError: inventory_not_found_handler,
+    InventoryAlreadyExistsError: inventory_already_exists_handler,
+    InsufficientInventoryError: insufficient_inventory_handler,
+    InsufficientReservedInventoryError: insufficient_reserved_inventory_handler,
+    ReservationNotFoundError: reservation_not_found_handler,
+    IdempotencyKeyInProgressError: idempotency_key_in_progress_handler,
+    IdempotencyKeyMismatchError: idempotency_key_mismatch_handler,
+}
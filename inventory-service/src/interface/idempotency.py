@@ -0,0 +1,87 @@
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import IdempotencyRecord
+from src.domain.repositories import IdempotencyInterface
+from src.infrastructure.cache import IdempotencyCache
+from src.infrastructure.config import DATABASE_STRATEGY, IDEMPOTENCY_STORE, IDEMPOTENCY_KEY_TTL, IDEMPOTENCY_KEY_MAX_LENGTH
+from src.infrastructure.database import UnitOfWork
+from src.infrastructure.monitoring.inventory_metrics import IDEMPOTENT_REPLAYS
+from src.infrastructure.repositories import IdempotencyRepository, StockMovementRepository
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+async def get_idempotency_key(
+    idempotency_key: Optional[str] = Header(
+        None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=IDEMPOTENCY_KEY_MAX_LENGTH
+    )
+) -> Optional[str]:
+    return idempotency_key
+
+def build_idempotency_store(session: AsyncSession) -> IdempotencyInterface:
+    if IDEMPOTENCY_STORE == "memory":
+        return IdempotencyCache.get_instance()
+    return IdempotencyRepository(session)
+
+def request_fingerprint(request: Request, payload: BaseModel) -> str:
+    body = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{request.method} {request.url.path} {body}".encode()).hexdigest()
+
+async def run_idempotent(
+    request: Request,
+    payload: BaseModel,
+    idempotency_key: Optional[str],
+    session: AsyncSession,
+    operation: Callable[[], Awaitable[Any]],
+    status_code: int = 200,
+):
+    """Run ``operation`` at most once per Idempotency-Key.
+
+    A retry with the same key and body gets the first response back without
+    touching inventories. Failed operations are not recorded, so they can be
+    retried with the same key. Without a key, ``operation`` simply runs.
+
+    With the postgres store, ``session`` must come from
+    ``get_idempotent_session``: the claim, the operation and the response are
+    committed at once through the unit of work it opened for the request.
+    """
+    if idempotency_key is None:
+        return await operation()
+
+    unit_of_work: Optional[UnitOfWork] = getattr(request.state, "unit_of_work", None)
+    if IDEMPOTENCY_STORE == "postgres" and unit_of_work is None:
+        raise RuntimeError("Idempotent routes must take their session from get_idempotent_session")
+    store = build_idempotency_store(session)
+    record = IdempotencyRecord.with_ttl(idempotency_key, request_fingerprint(request, payload), IDEMPOTENCY_KEY_TTL)
+    stored = await store.claim(record)
+    if stored is not None:
+        IDEMPOTENT_REPLAYS.inc(request.scope["route"].path)
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.response,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    try:
+        if DATABASE_STRATEGY == "sqlalchemy":
+            # Stock movements of the operation carry the key in the ledger.
+            await StockMovementRepository(session).tag(idempotency_key=idempotency_key)
+        response = jsonable_encoder(await operation())
+    except BaseException:
+        await store.discard(record)
+        if unit_of_work is not None:
+            await unit_of_work.rollback()
+        raise
+    record.status_code = status_code
+    record.response = response
+    await store.complete(record)
+    if unit_of_work is not None:
+        await unit_of_work.commit()
+    return response
@@ -0,0 +1,116 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from src.infrastructure.brokers import ReservationBroker
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.config import (
+    DATABASE_STRATEGY,
+    INVENTORY_CACHE_ENABLED,
+    INVENTORY_CHANGE_LISTENER_ENABLED,
+    POOL_STATS_ENABLED,
+    DB_POOL_WARMUP,
+    RESERVATION_SWEEPER_ENABLED,
+    IDEMPOTENCY_STORE,
+    IDEMPOTENCY_SWEEPER_ENABLED,
+    SHARD_REBALANCER_ENABLED,
+    STOCK_SNAPSHOTTER_ENABLED,
+    OUTBOX_RELAY_ENABLED,
+    STOCK_STREAM_ENABLED,
+    RESERVATION_BROKER_ENABLED,
+    LOW_STOCK_WEBHOOK_URL
+)
+from src.infrastructure.database import DatabaseFactory
+from src.infrastructure.monitoring import configure_logging, PoolStatsReporter
+from src.infrastructure.notifications import InventoryChangeListener, LowStockNotifier, StockStreamBroadcaster, build_event_sink
+from src.infrastructure.tasks import ReservationSweeper, IdempotencyKeySweeper, ShardRebalancer, StockSnapshotter, OutboxRelay
+from src.interface.dependencies import ServiceProvider
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+
+    database = DatabaseFactory.get_default_strategy()
+    await database.startup()
+    if DB_POOL_WARMUP:
+        await database.warm_up()
+
+    # The in-memory stand-in only serves inventories: the tasks below need Postgres.
+    postgres = DATABASE_STRATEGY == "sqlalchemy"
+
+    pool_stats_reporter = None
+    if postgres and POOL_STATS_ENABLED:
+        pool_stats_reporter = PoolStatsReporter(database)
+        await pool_stats_reporter.start()
+
+    listener = None
+    stock_stream_broadcaster = None
+    if postgres and ((INVENTORY_CACHE_ENABLED and INVENTORY_CHANGE_LISTENER_ENABLED) or STOCK_STREAM_ENABLED):
+        listener = InventoryChangeListener.get_instance()
+        if INVENTORY_CACHE_ENABLED and INVENTORY_CHANGE_LISTENER_ENABLED:
+            cache = InventoryCache.get_instance()
+            listener.add_handler(cache.apply_change, cache.clear)
+        if STOCK_STREAM_ENABLED:
+            stock_stream_broadcaster = StockStreamBroadcaster.get_instance()
+            listener.add_handler(stock_stream_broadcaster.apply_change, stock_stream_broadcaster.reset)
+            await stock_stream_broadcaster.start()
+        await listener.start()
+
+    reservation_sweeper = None
+    if postgres and RESERVATION_SWEEPER_ENABLED:
+        cache = InventoryCache.get_instance() if INVENTORY_CACHE_ENABLED else None
+        reservation_sweeper = ReservationSweeper(database, cache)
+        await reservation_sweeper.start()
+
+    idempotency_key_sweeper = None
+    if postgres and IDEMPOTENCY_STORE == "postgres" and IDEMPOTENCY_SWEEPER_ENABLED:
+        idempotency_key_sweeper = IdempotencyKeySweeper(database)
+        await idempotency_key_sweeper.start()
+
+    shard_rebalancer = None
+    if postgres and SHARD_REBALANCER_ENABLED:
+        shard_rebalancer = ShardRebalancer(database)
+        await shard_rebalancer.start()
+
+    stock_snapshotter = None
+    if postgres and STOCK_SNAPSHOTTER_ENABLED:
+        stock_snapshotter = StockSnapshotter(database)
+        await stock_snapshotter.start()
+
+    outbox_relay = None
+    if postgres and OUTBOX_RELAY_ENABLED:
+        outbox_relay = OutboxRelay(database, build_event_sink())
+        await outbox_relay.start()
+
+    low_stock_notifier = None
+    if LOW_STOCK_WEBHOOK_URL:
+        low_stock_notifier = LowStockNotifier.get_instance()
+        await low_stock_notifier.start()
+
+    # Routes get their services from it, around the session of each request.
+    app.state.service_provider = ServiceProvider.from_config()
+
+    yield
+
+    if RESERVATION_BROKER_ENABLED:
+        # Settle the reservations still waiting for their window.
+        await ReservationBroker.get_instance().stop()
+    if low_stock_notifier is not None:
+        await low_stock_notifier.stop()
+    if outbox_relay is not None:
+        await outbox_relay.stop()
+    if stock_snapshotter is not None:
+        await stock_snapshotter.stop()
+    if shard_rebalancer is not None:
+        await shard_rebalancer.stop()
+    if idempotency_key_sweeper is not None:
+        await idempotency_key_sweeper.stop()
+    if reservation_sweeper is not None:
+        await reservation_sweeper.stop()
+    if listener is not None:
+        await listener.stop()
+    if stock_stream_broadcaster is not None:
+        await stock_stream_broadcaster.stop()
+    if pool_stats_reporter is not None:
+        await pool_stats_reporter.stop()
+    await database.shutdown()
@@ -0,0 +1,3 @@
+from src.interface.middlewares.metrics_middleware import MetricsMiddleware
+
+__all__ = ["MetricsMiddleware"]
@@ -1,55 +1,308 @@
-from fastapi import APIRouter, Depends
+import base64
+import csv
+import io
+import json
+from typing import List, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.infrastructure.database import DatabaseFactory
+from src.infrastructure.config import (
+    INVENTORY_LOOKUP_MAX_UIDS,
+    INVENTORY_LIST_DEFAULT_LIMIT,
+    INVENTORY_LIST_MAX_LIMIT,
+    INVENTORY_CACHE_ENABLED
+)
+
+from src.domain.entities import Inventory
 from src.application.services import InventoryService
-from src.infrastructure.repositories import InventoryRepository
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.importers import read_stock_levels
 from src.infrastructure.schemas import (
     InventoryCreateSchema,
     InventoryUpdateSchema,
     InventoryReserveSchema,
-    InventoryReleaseSchema
+    InventoryReleaseSchema,
+    InventoryBatchReserveSchema,
+    InventoryLookupSchema,
+    InventoryReorderThresholdSchema,
+    InventoryShardingSchema,
+    InventoryResponseSchema,
+    InventoryCreateResponseSchema,
+    InventoryMessageResponseSchema,
+    InventoryRowMessageResponseSchema,
+    InventoryBatchReserveResponseSchema,
+    InventoryPageResponseSchema,
+    InventoryLookupResponseSchema,
+    InventoryShardsResponseSchema,
+    InventoryImportResponseSchema,
+    InventoryCacheStatsResponseSchema,
+    MessageResponseSchema,
+    INVENTORY_ROWS
 )
+from src.interface.dependencies import (
+    get_idempotent_session,
+    get_inventory_service,
+    get_idempotent_inventory_service,
+    get_reserving_inventory_service
+)
+from src.interface.idempotency import get_idempotency_key, run_idempotent
 
 router = APIRouter(prefix="/inventory")
-# Use the retry mechanism for database connections
-db_instance = DatabaseFactory.create_strategy('sqlalchemy').get_session_with_retry
 
-@router.post("/", status_code=201)
+@router.post("/", status_code=201, response_model=InventoryCreateResponseSchema)
 async def create_inventory(
-    inventory: InventoryCreateSchema, session: AsyncSession = Depends(db_instance)):
-    inventory_service = InventoryService(InventoryRepository(session))
+    inventory: InventoryCreateSchema, inventory_service: InventoryService = Depends(get_inventory_service)):
     created_inventory = await inventory_service.create_inventory(inventory)
+    return {"message": "Inventory created", "inventory": created_inventory}
+
+EXPORT_COLUMNS = ("id", "product_uid", "quantity_available", "reserved_quantity", "reorder_threshold", "updated_at")
+# Rows of a lookup dumped per chunk of the streamed response
+LOOKUP_CHUNK_ROWS = 1000
+
+def dump_rows(inventories: List[Inventory]) -> bytes:
+    """``inventories`` as comma-separated JSON objects, dumped in one call."""
+    return INVENTORY_ROWS.dump_json(INVENTORY_ROWS.validate_python(inventories, from_attributes=True))[1:-1]
+
+def encode_cursor(after_id: int) -> str:
+    return base64.urlsafe_b64encode(str(after_id).encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        after_id = int(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    if after_id < 0:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return after_id
+
+async def stream_lookup(inventory_service: InventoryService, product_uids: List[str]):
+    """Stream ``{"inventories": [...], "missing": [...]}`` as rows arrive from the cursor.
+
+    Rows go out ``LOOKUP_CHUNK_ROWS`` at a time, each chunk dumped in one
+    call: every chunk sent is a trip through the event loop, which under
+    load means waiting behind every request in flight.
+    """
+    missing = dict.fromkeys(product_uids)
+    separator = b""
+    chunk = []
+    yield b'{"inventories":['
+    async for inventory in inventory_service.get_inventories_by_uids(product_uids):
+        missing.pop(inventory.product_uid, None)
+        chunk.append(inventory)
+        if len(chunk) == LOOKUP_CHUNK_ROWS:
+            yield separator + dump_rows(chunk)
+            separator, chunk = b",", []
+    if chunk:
+        yield separator + dump_rows(chunk)
+    yield b'],"missing":' + json.dumps(list(missing)).encode() + b'}'
+
+async def lookup_response(inventory_service: InventoryService, product_uids: List[str]) -> Response:
+    """Lookups of up to ``LOOKUP_CHUNK_ROWS`` products, most of them, are answered in a single body."""
+    if len(product_uids) > LOOKUP_CHUNK_ROWS:
+        return StreamingResponse(stream_lookup(inventory_service, product_uids), media_type="application/json")
+    missing = dict.fromkeys(product_uids)
+    inventories = []
+    async for inventory in inventory_service.get_inventories_by_uids(product_uids):
+        missing.pop(inventory.product_uid, None)
+        inventories.append(inventory)
+    content = b'{"inventories":[' + dump_rows(inventories) + b'],"missing":' + json.dumps(list(missing)).encode() + b'}'
+    return Response(content, media_type="application/json")
+
+# Both shapes are returned as ready-made bodies: FastAPI would otherwise
+# validate each page against every member of the union.
+@router.get("/", response_model=Union[InventoryPageResponseSchema, InventoryLookupResponseSchema])
+async def get_inventories(
+    product_uid: Optional[List[str]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = Query(INVENTORY_LIST_DEFAULT_LIMIT, ge=1, le=INVENTORY_LIST_MAX_LIMIT),
+    max_available: Optional[int] = Query(None, ge=0),
+    has_reservations: Optional[bool] = None,
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    """Look up the given products, or without ``product_uid`` page through all of them by cursor."""
+    if product_uid:
+        if len(product_uid) > INVENTORY_LOOKUP_MAX_UIDS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"At most {INVENTORY_LOOKUP_MAX_UIDS} product_uid values per request, use POST /inventory/lookup"
+            )
+        return await lookup_response(inventory_service, product_uid)
+
+    after_id = decode_cursor(cursor) if cursor is not None else 0
+    inventories = await inventory_service.list_inventories(after_id, limit, max_available, has_reservations)
+    page = InventoryPageResponseSchema.model_validate(serialize_page(inventories, limit), from_attributes=True)
+    return Response(page.model_dump_json(), media_type="application/json")
+
+def serialize_page(inventories: List[Inventory], limit: int) -> dict:
     return {
-        "message": "Inventory created",
-        "inventory": {
-            "id": created_inventory.id,
-            "product_uid": created_inventory.product_uid,
-            "quantity_available": created_inventory.quantity_available,
-            "reserved_quantity": created_inventory.reserved_quantity
-        }
+        "inventories": inventories,
+        "next_cursor": encode_cursor(inventories[-1].id) if len(inventories) == limit else None
     }
 
-@router.get("/{product_uid}")
-async def get_inventory(product_uid: str, session: AsyncSession = Depends(db_instance)):
-    inventory_service = InventoryService(InventoryRepository(session))
+@router.get("/low-stock", response_model=InventoryPageResponseSchema)
+async def get_low_stock(
+    cursor: Optional[str] = None,
+    limit: int = Query(INVENTORY_LIST_DEFAULT_LIMIT, ge=1, le=INVENTORY_LIST_MAX_LIMIT),
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    """Products at or below their reorder threshold, paged by cursor."""
+    after_id = decode_cursor(cursor) if cursor is not None else 0
+    inventories = await inventory_service.list_low_stock(after_id, limit)
+    return serialize_page(inventories, limit)
+
+async def stream_export(inventory_service: InventoryService, format: str, **filters):
+    """Stream every matching inventory, one chunk per keyset page."""
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+    async for page in inventory_service.export_inventories(**filters):
+        if format == "csv":
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                (inventory.id, inventory.product_uid, inventory.quantity_available,
+                 inventory.reserved_quantity, inventory.reorder_threshold, inventory.updated_at.isoformat())
+                for inventory in page
+            )
+            yield buffer.getvalue()
+        else:
+            rows = INVENTORY_ROWS.validate_python(page, from_attributes=True)
+            yield "".join(row.model_dump_json() + "\n" for row in rows)
+
+@router.get("/export")
+async def export_inventories(
+    format: Literal["csv", "ndjson"] = "ndjson",
+    max_available: Optional[int] = Query(None, ge=0),
+    has_reservations: Optional[bool] = None,
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    return StreamingResponse(
+        stream_export(inventory_service, format, max_available=max_available, has_reservations=has_reservations),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="inventory.{format}"'}
+    )
+
+@router.post("/lookup", response_model=InventoryLookupResponseSchema)
+async def lookup_inventories(
+    lookup: InventoryLookupSchema,
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    return await lookup_response(inventory_service, lookup.product_uids)
+
+IMPORT_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+@router.post("/import", response_model=InventoryImportResponseSchema)
+async def import_inventories(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    if format is None:
+        media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = IMPORT_MEDIA_TYPES.get(media_type)
+        if format is None:
+            raise HTTPException(
+                status_code=415,
+                detail="Send text/csv or application/x-ndjson, or pass format=csv|ndjson"
+            )
+    # The body is consumed as it arrives and the report sent once it is
+    # fully applied: clients and proxies rarely read a response early.
+    errors = []
+    async for event in inventory_service.import_stock_levels(read_stock_levels(request.stream(), format)):
+        if event["event"] == "error":
+            errors.append({"line": event["line"], "error": event["error"]})
+        elif event["event"] == "progress":
+            logger.info(f"Stock level import: {event['processed']} rows processed")
+        else:
+            summary = {name: count for name, count in event.items() if name != "event"}
+    return {"message": "Stock levels imported", **summary, "errors": errors}
+
+@router.get("/cache/stats", response_model=InventoryCacheStatsResponseSchema, response_model_exclude_unset=True)
+async def get_cache_stats():
+    if not INVENTORY_CACHE_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **InventoryCache.get_instance().stats()}
+
+@router.get("/{product_uid}", response_model=InventoryResponseSchema)
+async def get_inventory(product_uid: str, inventory_service: InventoryService = Depends(get_inventory_service)):
     inventory = await inventory_service.get_inventory_by_uid(product_uid)
     return inventory
 
-@router.put("/{product_uid}")
-async def update_inventory(product_uid: str, inventory: InventoryUpdateSchema, session: AsyncSession = Depends(db_instance)):
-    inventory_service = InventoryService(InventoryRepository(session))
+@router.get("/{product_uid}/shards", response_model=InventoryShardsResponseSchema)
+async def get_inventory_shards(product_uid: str, inventory_service: InventoryService = Depends(get_inventory_service)):
+    shards = await inventory_service.get_inventory_shards(product_uid)
+    return {"product_uid": product_uid, "shard_count": len(shards), "shards": shards}
+
+@router.put("/{product_uid}/reorder-threshold", response_model=InventoryRowMessageResponseSchema)
+async def set_reorder_threshold(
+    product_uid: str, threshold: InventoryReorderThresholdSchema,
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    inventory = await inventory_service.set_reorder_threshold(product_uid, threshold)
+    return {"message": "Reorder threshold updated", "inventory": inventory}
+
+@router.put("/{product_uid}/shards", response_model=InventoryMessageResponseSchema)
+async def enable_sharding(
+    product_uid: str, sharding: InventoryShardingSchema,
+    inventory_service: InventoryService = Depends(get_inventory_service)):
+    inventory = await inventory_service.enable_sharding(product_uid, sharding)
+    return {"message": "Inventory sharded", "inventory": inventory}
+
+@router.delete("/{product_uid}/shards", response_model=InventoryMessageResponseSchema)
+async def disable_sharding(product_uid: str, inventory_service: InventoryService = Depends(get_inventory_service)):
+    inventory = await inventory_service.disable_sharding(product_uid)
+    return {"message": "Inventory sharding disabled", "inventory": inventory}
+
+@router.put("/{product_uid}", response_model=MessageResponseSchema)
+async def update_inventory(
+    product_uid: str, inventory: InventoryUpdateSchema,
+    inventory_service: InventoryService = Depends(get_inventory_service)):
     await inventory_service.update_inventory(product_uid, inventory)
     return {"message": "Inventory updated"}
 
-@router.post("/reserve")
-async def reserve_inventory(inventory: InventoryReserveSchema, session: AsyncSession = Depends(db_instance)):
-    inventory_service = InventoryService(InventoryRepository(session))
-    await inventory_service.reserve_inventory(inventory.product_uid, inventory.amount)
-    return {"message": "Inventory reserved"}
-
-@router.post("/release")
-async def release_inventory(inventory: InventoryReleaseSchema, session: AsyncSession = Depends(db_instance)):
-    inventory_service = InventoryService(InventoryRepository(session))
-    await inventory_service.release_inventory(inventory.product_uid, inventory.amount)
-    return {"message": "Inventory released"}
+@router.post("/reserve", response_model=MessageResponseSchema)
+async def reserve_inventory(
+    request: Request,
+    inventory: InventoryReserveSchema,
+    session: AsyncSession = Depends(get_idempotent_session),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
+    inventory_service: InventoryService = Depends(get_reserving_inventory_service)):
+
+    async def reserve():
+        await inventory_service.reserve_inventory(inventory.product_uid, inventory.amount)
+        return {"message": "Inventory reserved"}
+
+    return await run_idempotent(request, inventory, idempotency_key, session, reserve)
+
+@router.post("/reserve/batch", response_model=InventoryBatchReserveResponseSchema)
+async def reserve_inventory_batch(
+    request: Request,
+    batch: InventoryBatchReserveSchema,
+    session: AsyncSession = Depends(get_idempotent_session),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
+    inventory_service: InventoryService = Depends(get_idempotent_inventory_service)):
+
+    async def reserve_batch():
+        inventories = await inventory_service.reserve_inventory_batch(batch)
+        return InventoryBatchReserveResponseSchema.model_validate(
+            {"message": "Inventory reserved", "inventories": inventories}, from_attributes=True
+        )
+
+    return await run_idempotent(request, batch, idempotency_key, session, reserve_batch)
+
+@router.post("/release", response_model=MessageResponseSchema)
+async def release_inventory(
+    request: Request,
+    inventory: InventoryReleaseSchema,
+    session: AsyncSession = Depends(get_idempotent_session),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
+    inventory_service: InventoryService = Depends(get_idempotent_inventory_service)):
+
+    async def release():
+        await inventory_service.release_inventory(inventory.product_uid, inventory.amount)
+        return {"message": "Inventory released"}
+
+    return await run_idempotent(request, inventory, idempotency_key, session, release)
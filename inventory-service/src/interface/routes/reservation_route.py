@@ -0,0 +1,58 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import Reservation
+from src.application.services import ReservationService
+from src.infrastructure.schemas import ReservationCreateSchema
+from src.interface.dependencies import (
+    get_idempotent_session,
+    get_reservation_service,
+    get_idempotent_reservation_service
+)
+from src.interface.idempotency import get_idempotency_key, run_idempotent
+
+router = APIRouter(prefix="/inventory/reservations")
+
+def serialize_reservation(reservation: Reservation) -> dict:
+    return {
+        "id": reservation.id,
+        "product_uid": reservation.product_uid,
+        "amount": reservation.amount,
+        "expires_at": reservation.expires_at,
+        "created_at": reservation.created_at
+    }
+
+@router.post("/", status_code=201)
+async def create_reservation(
+    request: Request,
+    reservation: ReservationCreateSchema,
+    session: AsyncSession = Depends(get_idempotent_session),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key),
+    reservation_service: ReservationService = Depends(get_idempotent_reservation_service)):
+
+    async def create():
+        created_reservation = await reservation_service.create_reservation(reservation)
+        return {"message": "Inventory reserved", "reservation": serialize_reservation(created_reservation)}
+
+    return await run_idempotent(request, reservation, idempotency_key, session, create, status_code=201)
+
+@router.get("/{reservation_id}")
+async def get_reservation(
+    reservation_id: UUID, reservation_service: ReservationService = Depends(get_reservation_service)):
+    reservation = await reservation_service.get_reservation(str(reservation_id))
+    return serialize_reservation(reservation)
+
+@router.delete("/{reservation_id}")
+async def release_reservation(
+    reservation_id: UUID, reservation_service: ReservationService = Depends(get_reservation_service)):
+    reservation = await reservation_service.release_reservation(str(reservation_id))
+    return {"message": "Reservation released", "reservation": serialize_reservation(reservation)}
+
+@router.post("/{reservation_id}/confirm")
+async def confirm_reservation(
+    reservation_id: UUID, reservation_service: ReservationService = Depends(get_reservation_service)):
+    reservation = await reservation_service.confirm_reservation(str(reservation_id))
+    return {"message": "Reservation confirmed", "reservation": serialize_reservation(reservation)}
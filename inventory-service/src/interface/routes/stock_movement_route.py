@@ -0,0 +1,93 @@
+import base64
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.infrastructure.config import INVENTORY_LIST_DEFAULT_LIMIT, INVENTORY_LIST_MAX_LIMIT
+
+from src.domain.entities import StockMovement
+from src.application.services import StockMovementService
+from src.interface.dependencies import get_stock_movement_service
+
+router = APIRouter(prefix="/inventory")
+
+def as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # Times given without an offset are read as UTC.
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+def serialize_movement(movement: StockMovement) -> dict:
+    return {
+        "id": movement.id,
+        "product_uid": movement.product_uid,
+        "delta_available": movement.delta_available,
+        "delta_reserved": movement.delta_reserved,
+        "reason": movement.reason,
+        "idempotency_key": movement.idempotency_key,
+        "created_at": movement.created_at
+    }
+
+def encode_movement_cursor(movement: StockMovement) -> str:
+    return base64.urlsafe_b64encode(f"{movement.created_at.isoformat()},{movement.id}".encode()).decode()
+
+def decode_movement_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+        return datetime.fromisoformat(created_at), int(id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+async def list_movements(
+    stock_movement_service: StockMovementService,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    cursor: Optional[str],
+    limit: int,
+    product_uid: Optional[str] = None,
+) -> dict:
+    since, until = as_utc(since), as_utc(until)
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=422, detail="since must be before until")
+    after = decode_movement_cursor(cursor) if cursor is not None else None
+    movements = await stock_movement_service.list_movements(since, until, after, limit, product_uid)
+    return {
+        "movements": [serialize_movement(movement) for movement in movements],
+        "next_cursor": encode_movement_cursor(movements[-1]) if len(movements) == limit else None
+    }
+
+@router.get("/movements")
+async def get_movements(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(INVENTORY_LIST_DEFAULT_LIMIT, ge=1, le=INVENTORY_LIST_MAX_LIMIT),
+    stock_movement_service: StockMovementService = Depends(get_stock_movement_service)):
+    """Stock movements of every product in [since, until), oldest first, paged by cursor."""
+    return await list_movements(stock_movement_service, since, until, cursor, limit)
+
+@router.get("/{product_uid}/movements")
+async def get_product_movements(
+    product_uid: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(INVENTORY_LIST_DEFAULT_LIMIT, ge=1, le=INVENTORY_LIST_MAX_LIMIT),
+    stock_movement_service: StockMovementService = Depends(get_stock_movement_service)):
+    """Stock movements of one product in [since, until), oldest first, paged by cursor."""
+    return await list_movements(stock_movement_service, since, until, cursor, limit, product_uid)
+
+@router.get("/{product_uid}/stock-at")
+async def get_stock_at(
+    product_uid: str,
+    at: datetime,
+    stock_movement_service: StockMovementService = Depends(get_stock_movement_service)):
+    """Stock counters of a product as they stood at ``at``, rebuilt from the ledger."""
+    snapshot = await stock_movement_service.get_stock_at(product_uid, as_utc(at))
+    return {
+        "product_uid": snapshot.product_uid,
+        "at": snapshot.taken_at,
+        "quantity_available": snapshot.quantity_available,
+        "reserved_quantity": snapshot.reserved_quantity
+    }
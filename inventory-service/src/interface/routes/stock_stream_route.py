@@ -0,0 +1,115 @@
+import asyncio
+import json
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from src.infrastructure.config import STOCK_STREAM_ENABLED, STOCK_STREAM_HEARTBEAT_INTERVAL, STOCK_STREAM_MAX_UIDS
+from src.infrastructure.notifications import StockStreamBroadcaster, StockSubscription
+
+router = APIRouter(prefix="/inventory")
+
+TOO_MANY_SUBSCRIBERS = "Too many stock stream subscribers"
+
+def check_stream_request(broadcaster: StockStreamBroadcaster, product_uids: List[str]) -> None:
+    if not STOCK_STREAM_ENABLED:
+        raise HTTPException(status_code=503, detail="Stock streams are disabled")
+    if len(product_uids) > STOCK_STREAM_MAX_UIDS:
+        raise HTTPException(status_code=422, detail=f"At most {STOCK_STREAM_MAX_UIDS} product_uid can be followed")
+    if broadcaster.full:
+        raise HTTPException(status_code=503, detail=TOO_MANY_SUBSCRIBERS)
+
+async def stream_events(broadcaster: StockStreamBroadcaster, product_uids: List[str]):
+    # Subscribed within the stream, so the subscription ends with it however the client leaves.
+    subscription = await broadcaster.subscribe(product_uids)
+    if subscription is None:
+        # The last slots were taken since the request was checked.
+        yield f"event: error\ndata: {TOO_MANY_SUBSCRIBERS}\n\n"
+        return
+    try:
+        while True:
+            messages = await subscription.next(STOCK_STREAM_HEARTBEAT_INTERVAL)
+            if not messages:
+                # Keeps proxies from closing an idle stream.
+                yield ": keep-alive\n\n"
+                continue
+            yield "".join(f"event: stock\ndata: {message}\n\n" for message in messages)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+@router.get("/stream")
+async def stream_stock(product_uid: List[str] = Query(..., min_length=1)):
+    """Server-Sent Events of the stock levels of ``product_uid``.
+
+    The current levels come first, then one ``stock`` event whenever
+    ``quantity_available`` of a followed product changes.
+    """
+    broadcaster = StockStreamBroadcaster.get_instance()
+    check_stream_request(broadcaster, product_uid)
+    return StreamingResponse(
+        stream_events(broadcaster, product_uid),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def send_messages(websocket: WebSocket, subscription: StockSubscription) -> None:
+    while True:
+        for message in await subscription.next(STOCK_STREAM_HEARTBEAT_INTERVAL):
+            await websocket.send_text(message)
+
+async def receive_commands(
+    websocket: WebSocket, broadcaster: StockStreamBroadcaster, subscription: StockSubscription) -> None:
+    while True:
+        try:
+            command = json.loads(await websocket.receive_text())
+            subscribe = [str(uid) for uid in command.get("subscribe", [])]
+            unsubscribe = [str(uid) for uid in command.get("unsubscribe", [])]
+        except (ValueError, AttributeError, TypeError):
+            await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA, reason="Invalid command")
+            return
+        broadcaster.unfollow(subscription, unsubscribe)
+        if len(subscription.product_uids | set(subscribe)) > STOCK_STREAM_MAX_UIDS:
+            await websocket.close(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason=f"At most {STOCK_STREAM_MAX_UIDS} product_uid can be followed"
+            )
+            return
+        await broadcaster.follow(subscription, subscribe)
+
+@router.websocket("/stream/ws")
+async def stream_stock_ws(websocket: WebSocket, product_uid: List[str] = Query([])):
+    """WebSocket twin of ``/inventory/stream``, one text frame per message.
+
+    Followed products can be changed on the fly by sending
+    ``{"subscribe": [...]}`` or ``{"unsubscribe": [...]}``.
+    """
+    broadcaster = StockStreamBroadcaster.get_instance()
+    try:
+        check_stream_request(broadcaster, product_uid)
+    except HTTPException as e:
+        code = status.WS_1013_TRY_AGAIN_LATER if e.status_code == 503 else status.WS_1008_POLICY_VIOLATION
+        await websocket.close(code=code, reason=e.detail)
+        return
+    await websocket.accept()
+    subscription = await broadcaster.subscribe(product_uid)
+    if subscription is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=TOO_MANY_SUBSCRIBERS)
+        return
+    # Either side ending ends the stream: a failed send must not leave the
+    # subscription alive behind a receive loop, nor a closed one behind a sender.
+    tasks = [
+        asyncio.create_task(send_messages(websocket, subscription)),
+        asyncio.create_task(receive_commands(websocket, broadcaster, subscription)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Nothing awaited here: the endpoint may itself be cancelled when the client leaves.
+        for task in tasks:
+            task.cancel()
+        broadcaster.unsubscribe(subscription)
+    for task in done:
+        error = task.exception()
+        if error is not None and not isinstance(error, WebSocketDisconnect):
+            raise error
@@ -0,0 +1,66 @@
+import os
+
+# Configuration is read at import time: pin it before anything under src is
+# imported. The app and the routes run on the in-memory backend. Repository
+# tests run against the database TEST_POSTGRES_URL points at, migrated to
+# head, and are skipped without it.
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+os.environ.update({
+    "DATABASE_STRATEGY": "memory",
+    "POSTGRES_URL": TEST_POSTGRES_URL or "",
+    "INVENTORY_CACHE_ENABLED": "false",
+    "RESERVATION_BROKER_ENABLED": "false",
+    "LOW_STOCK_WEBHOOK_URL": "",
+    "STOCK_STREAM_ENABLED": "false",
+    "INVENTORY_CHANGE_LISTENER_ENABLED": "false",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.cache.idempotency_cache import IdempotencyCache
+from src.infrastructure.database.memory_strategy import InventoryStore, MemoryStrategy
+from src.infrastructure.repositories.memory_inventory_repository import MemoryInventoryRepository
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def client():
+    """The app on a fresh in-memory store, which its lifespan creates and drops."""
+    from src.interface import app
+
+    IdempotencyCache._instance = None
+    with TestClient(app) as client:
+        yield client
+    IdempotencyCache._instance = None
+
+@pytest.fixture
+def repository():
+    return MemoryInventoryRepository(InventoryStore())
+
+@pytest.fixture
+async def memory_strategy():
+    await MemoryStrategy.startup()
+    yield MemoryStrategy
+    await MemoryStrategy.shutdown()
+
+@pytest.fixture
+async def engine():
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    yield engine
+    await engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+@pytest.fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import uuid
+
+import asyncpg
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities import Inventory
+from src.infrastructure.config import INVENTORY_CHANGE_CHANNEL
+from src.infrastructure.repositories import InventoryRepository
+pytestmark = pytest.mark.anyio
+
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+@pytest.fixture
+async def notifications(engine):
+    payloads = []
+    connection = await asyncpg.connect(TEST_POSTGRES_URL.replace("postgresql+asyncpg://", "postgresql://", 1))
+    await connection.add_listener(INVENTORY_CHANGE_CHANNEL, lambda *args: payloads.append(args[-1]))
+    yield payloads
+    await connection.close()
+
+async def write(notify_changes: bool, product_uid: str, shard_count: int = 0) -> None:
+    engine = create_async_engine(
+        TEST_POSTGRES_URL, connect_args={"server_settings": {"inventory.notify_changes": "on" if notify_changes else "off"}}
+    )
+    try:
+        async with sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as session:
+            repository = InventoryRepository(session)
+            await repository.create_inventory(Inventory(product_uid=product_uid, quantity_available=10))
+            if shard_count:
+                await repository.set_shard_count(product_uid, shard_count)
+            await repository.reserve_inventory(product_uid, 1)
+    finally:
+        await engine.dispose()
+
+@pytest.mark.parametrize("shard_count", [0, 2])
+async def test_changes_are_published_with_notify_changes_on(notifications, shard_count):
+    product_uid = f"test-{uuid.uuid4().hex}"
+    await write(True, product_uid, shard_count)
+    await asyncio.sleep(0.2)
+    assert any(product_uid in payload for payload in notifications)
+
+@pytest.mark.parametrize("shard_count", [0, 2])
+async def test_changes_are_not_published_with_notify_changes_off(notifications, shard_count):
+    product_uid = f"test-{uuid.uuid4().hex}"
+    await write(False, product_uid, shard_count)
+    await asyncio.sleep(0.2)
+    assert not any(product_uid in payload for payload in notifications)
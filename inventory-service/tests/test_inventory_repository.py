@@ -0,0 +1,242 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.application.services import InventoryService
+from src.domain.entities import Inventory
+from src.domain.exceptions import (
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError,
+    InventoryNotFoundError,
+)
+from src.infrastructure.importers import read_stock_levels
+from src.infrastructure.repositories import InventoryRepository
+from src.infrastructure.schemas import InventoryBatchReserveSchema
+
+pytestmark = pytest.mark.anyio
+
+async def create_product(session, quantity_available, shard_count=0) -> str:
+    # Products of their own, so the database need not be empty.
+    product_uid = f"test-{uuid.uuid4().hex}"
+    repository = InventoryRepository(session)
+    await repository.create_inventory(Inventory(product_uid=product_uid, quantity_available=quantity_available))
+    if shard_count:
+        await repository.set_shard_count(product_uid, shard_count)
+    return product_uid
+
+async def levels(session, product_uid):
+    inventory = await InventoryRepository(session).get_inventory_by_uid(product_uid)
+    return inventory.quantity_available, inventory.reserved_quantity
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_reserve_and_release(session, shard_count):
+    product_uid = await create_product(session, 10, shard_count)
+    repository = InventoryRepository(session)
+
+    inventory = await repository.reserve_inventory(product_uid, 7)
+    assert (inventory.quantity_available, inventory.reserved_quantity) == (3, 7)
+    inventory = await repository.release_inventory(product_uid, 5)
+    assert (inventory.quantity_available, inventory.reserved_quantity) == (8, 2)
+    assert await levels(session, product_uid) == (8, 2)
+
+@pytest.mark.parametrize("shard_count", [0, 2])
+async def test_shortfalls_leave_counters_untouched(session, shard_count):
+    product_uid = await create_product(session, 3, shard_count)
+    repository = InventoryRepository(session)
+    await repository.reserve_inventory(product_uid, 1)
+
+    with pytest.raises(InsufficientInventoryError) as error:
+        await repository.reserve_inventory(product_uid, 3)
+    assert (error.value.available, error.value.requested) == (2, 3)
+    with pytest.raises(InsufficientReservedInventoryError) as error:
+        await repository.release_inventory(product_uid, 2)
+    assert (error.value.reserved, error.value.requested) == (1, 2)
+    assert await levels(session, product_uid) == (2, 1)
+
+async def test_unknown_product(session):
+    with pytest.raises(InventoryNotFoundError):
+        await InventoryRepository(session).reserve_inventory(f"test-{uuid.uuid4().hex}", 1)
+    with pytest.raises(InventoryNotFoundError):
+        await InventoryRepository(session).release_inventory(f"test-{uuid.uuid4().hex}", 1)
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_concurrent_reservations_never_oversell(session, session_factory, shard_count):
+    # Sharded, most of the 25 fall back to locking every shard.
+    product_uid = await create_product(session, 10, shard_count)
+
+    async def reserve():
+        async with session_factory() as own_session:
+            try:
+                await InventoryRepository(own_session).reserve_inventory(product_uid, 1)
+            except InsufficientInventoryError:
+                return False
+            return True
+
+    results = await asyncio.gather(*(reserve() for _ in range(25)))
+    assert results.count(True) == 10
+    assert await levels(session, product_uid) == (0, 10)
+
+async def test_sharded_reservation_spans_shards(session):
+    product_uid = await create_product(session, 10, 4)
+    # No single shard holds 9 units: they are taken from several.
+    await InventoryRepository(session).reserve_inventory(product_uid, 9)
+    shards = await InventoryRepository(session).get_inventory_shards(product_uid)
+    assert len(shards) == 4
+    assert sum(shard.reserved_quantity for shard in shards) == 9
+    assert all(shard.quantity_available >= 0 for shard in shards)
+    assert await levels(session, product_uid) == (1, 9)
+
+async def test_batch_reservation(session):
+    first = await create_product(session, 10)
+    second = await create_product(session, 5)
+
+    inventories = await InventoryRepository(session).reserve_inventory_batch([(second, 1), (first, 2), (second, 3)])
+    assert sorted((inventory.product_uid, inventory.reserved_quantity) for inventory in inventories) == sorted(
+        [(first, 2), (second, 4)]
+    )
+    assert await levels(session, first) == (8, 2)
+    assert await levels(session, second) == (1, 4)
+
+async def test_batch_reservation_is_all_or_nothing(session):
+    first = await create_product(session, 10)
+    second = await create_product(session, 1)
+    repository = InventoryRepository(session)
+
+    with pytest.raises(InsufficientInventoryError) as error:
+        await repository.reserve_inventory_batch([(first, 2), (second, 2)])
+    assert error.value.product_uid == second
+    with pytest.raises(InventoryNotFoundError):
+        await repository.reserve_inventory_batch([(first, 2), (f"test-{uuid.uuid4().hex}", 1)])
+    assert await levels(session, first) == (10, 0)
+    assert await levels(session, second) == (1, 0)
+
+async def test_batch_reservation_with_sharded_product(session):
+    plain = await create_product(session, 5)
+    sharded = await create_product(session, 5, 2)
+    repository = InventoryRepository(session)
+
+    with pytest.raises(InsufficientInventoryError):
+        await repository.reserve_inventory_batch([(plain, 2), (sharded, 6)])
+    assert await levels(session, plain) == (5, 0)
+    await repository.reserve_inventory_batch([(plain, 2), (sharded, 5)])
+    assert await levels(session, plain) == (3, 2)
+    assert await levels(session, sharded) == (0, 5)
+
+async def test_overlapping_batches_do_not_deadlock(session, session_factory):
+    first = await create_product(session, 20)
+    second = await create_product(session, 20)
+
+    async def reserve(items):
+        async with session_factory() as own_session:
+            await InventoryRepository(own_session).reserve_inventory_batch(items)
+
+    await asyncio.gather(*(
+        reserve([(first, 1), (second, 1)] if index % 2 else [(second, 1), (first, 1)]) for index in range(10)
+    ))
+    assert await levels(session, first) == (10, 10)
+    assert await levels(session, second) == (10, 10)
+
+async def test_lookup_skips_missing_products(session):
+    first = await create_product(session, 1)
+    second = await create_product(session, 2)
+    missing = f"test-{uuid.uuid4().hex}"
+
+    found = [
+        (inventory.product_uid, inventory.quantity_available)
+        async for inventory in InventoryRepository(session).get_inventories_by_uids([second, missing, first])
+    ]
+    assert sorted(found) == sorted([(first, 1), (second, 2)])
+
+async def test_lookup_of_no_products(session):
+    assert [inventory async for inventory in InventoryRepository(session).get_inventories_by_uids([])] == []
+
+async def test_import_stock_levels(session):
+    first = await create_product(session, 1)
+    second = await create_product(session, 2)
+    sharded = await create_product(session, 4, 2)
+    new = f"test-{uuid.uuid4().hex}"
+    body = (
+        f"product_uid,quantity_available\n{first},5\n{second},2\n{new},7\n{sharded},9\n{first},6\nbad,-1\n"
+    ).encode()
+
+    async def chunks():
+        yield body
+
+    service = InventoryService(InventoryRepository(session))
+    events = [event async for event in service.import_stock_levels(read_stock_levels(chunks(), "csv"), chunk_size=2)]
+
+    assert [event["event"] for event in events] == ["progress", "progress", "error", "done"]
+    assert events[2]["line"] == 7
+    done = events[-1]
+    assert (done["processed"], done["inserted"], done["updated"], done["unchanged"], done["failed"]) == (6, 1, 3, 1, 1)
+    # The last row of a product wins.
+    assert await levels(session, first) == (6, 0)
+    assert await levels(session, new) == (7, 0)
+    assert await levels(session, sharded) == (9, 0)
+
+async def test_list_inventories_pages_in_id_order(session):
+    uids = [await create_product(session, quantity) for quantity in (5, 1, 0, 8)]
+    repository = InventoryRepository(session)
+    await repository.reserve_inventory(uids[0], 2)
+    first = await repository.get_inventory_by_uid(uids[0])
+
+    page = await repository.list_inventories(first.id - 1, 2)
+    assert [inventory.product_uid for inventory in page] == uids[:2]
+    page = await repository.list_inventories(page[-1].id, 2)
+    assert [inventory.product_uid for inventory in page] == uids[2:]
+
+    low_stock = await repository.list_inventories(first.id - 1, 10, max_available=1)
+    assert [inventory.product_uid for inventory in low_stock] == uids[1:3]
+    reserved = await repository.list_inventories(first.id - 1, 10, has_reservations=True)
+    assert [(inventory.product_uid, inventory.reserved_quantity) for inventory in reserved] == [(uids[0], 2)]
+
+async def test_export_inventories_reads_every_page(session):
+    uids = [await create_product(session, quantity) for quantity in range(5)]
+    service = InventoryService(InventoryRepository(session))
+
+    pages = [page async for page in service.export_inventories(page_size=2)]
+    assert all(0 < len(page) <= 2 for page in pages)
+    exported = [inventory.product_uid for page in pages for inventory in page]
+    assert [product_uid for product_uid in exported if product_uid in uids] == uids
+    assert len(exported) == len(set(exported))
+
+async def test_list_low_stock(session):
+    low = await create_product(session, 2)
+    above = await create_product(session, 9)
+    sharded = await create_product(session, 3, 2)
+    repository = InventoryRepository(session)
+    for product_uid in (low, above, sharded):
+        await repository.set_reorder_threshold(product_uid, 5)
+    first = await repository.get_inventory_by_uid(low)
+
+    page = await repository.list_low_stock(first.id - 1, 10)
+    # The sharded product is low on its summed counters.
+    assert [(inventory.product_uid, inventory.quantity_available) for inventory in page] == [(low, 2), (sharded, 3)]
+
+class RecordingNotifier:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, inventory):
+        self.published.append(inventory.product_uid)
+
+async def test_reservation_crossing_the_threshold_is_published(session):
+    first = await create_product(session, 10)
+    second = await create_product(session, 10)
+    repository = InventoryRepository(session)
+    for product_uid in (first, second):
+        await repository.set_reorder_threshold(product_uid, 5)
+    notifier = RecordingNotifier()
+    service = InventoryService(repository, notifier)
+
+    await service.reserve_inventory(first, 4)
+    assert notifier.published == []
+    await service.reserve_inventory(first, 2)
+    await service.reserve_inventory(first, 1)
+    # Only the reservation that took the stock down to the threshold counts.
+    assert notifier.published == [first]
+    await service.reserve_inventory_batch(InventoryBatchReserveSchema(items=[
+        {"product_uid": second, "amount": 3}, {"product_uid": second, "amount": 3},
+    ]))
+    assert notifier.published == [first, second]
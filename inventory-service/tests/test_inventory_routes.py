@@ -0,0 +1,239 @@
+import csv
+import io
+import json
+
+def create(client, product_uid, quantity_available):
+    response = client.post("/inventory/", json={"product_uid": product_uid, "quantity_available": quantity_available})
+    assert response.status_code == 201, response.text
+    return response.json()["inventory"]
+
+def levels(client, product_uid):
+    inventory = client.get(f"/inventory/{product_uid}").json()
+    return inventory["quantity_available"], inventory["reserved_quantity"]
+
+def test_create_and_get(client):
+    created = create(client, "p1", 10)
+    assert created["quantity_available"] == 10
+    assert created["reserved_quantity"] == 0
+
+    response = client.get("/inventory/p1")
+    assert response.status_code == 200
+    assert response.json()["product_uid"] == "p1"
+
+def test_create_existing_product(client):
+    create(client, "p1", 10)
+    response = client.post("/inventory/", json={"product_uid": "p1", "quantity_available": 5})
+    assert response.status_code == 409
+    assert response.json()["product_uid"] == "p1"
+
+def test_get_unknown_product(client):
+    response = client.get("/inventory/missing")
+    assert response.status_code == 404
+    assert response.json()["product_uid"] == "missing"
+
+def test_update(client):
+    create(client, "p1", 10)
+    response = client.put("/inventory/p1", json={"product_uid": "p1", "quantity_available": 3})
+    assert response.status_code == 200
+    assert levels(client, "p1") == (3, 0)
+
+def test_reserve_and_release(client):
+    create(client, "p1", 10)
+    assert client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 4}).status_code == 200
+    assert levels(client, "p1") == (6, 4)
+    assert client.post("/inventory/release", json={"product_uid": "p1", "amount": 3}).status_code == 200
+    assert levels(client, "p1") == (9, 1)
+
+def test_reserve_more_than_available(client):
+    create(client, "p1", 2)
+    response = client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 3})
+    assert response.status_code == 409
+    assert response.json()["available"] == 2
+    assert response.json()["requested"] == 3
+    assert levels(client, "p1") == (2, 0)
+
+def test_release_more_than_reserved(client):
+    create(client, "p1", 10)
+    client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 2})
+    response = client.post("/inventory/release", json={"product_uid": "p1", "amount": 3})
+    assert response.status_code == 409
+    assert response.json()["reserved"] == 2
+    assert response.json()["requested"] == 3
+    assert levels(client, "p1") == (8, 2)
+
+def test_reserve_unknown_product(client):
+    response = client.post("/inventory/reserve", json={"product_uid": "missing", "amount": 1})
+    assert response.status_code == 404
+
+def test_reserve_batch(client):
+    create(client, "p1", 10)
+    create(client, "p2", 5)
+    response = client.post("/inventory/reserve/batch", json={"items": [
+        {"product_uid": "p1", "amount": 2},
+        {"product_uid": "p2", "amount": 5},
+        {"product_uid": "p1", "amount": 1},
+    ]})
+    assert response.status_code == 200
+    inventories = {row["product_uid"]: row for row in response.json()["inventories"]}
+    assert inventories["p1"]["quantity_available"] == 7
+    assert inventories["p2"]["reserved_quantity"] == 5
+
+def test_reserve_batch_is_all_or_nothing(client):
+    create(client, "p1", 10)
+    create(client, "p2", 1)
+    response = client.post("/inventory/reserve/batch", json={"items": [
+        {"product_uid": "p1", "amount": 2},
+        {"product_uid": "p2", "amount": 2},
+    ]})
+    assert response.status_code == 409
+    assert response.json()["product_uid"] == "p2"
+    assert levels(client, "p1") == (10, 0)
+    assert levels(client, "p2") == (1, 0)
+
+def test_idempotent_reserve_is_replayed(client):
+    create(client, "p1", 10)
+    headers = {"Idempotency-Key": "order-1"}
+    first = client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 4}, headers=headers)
+    replay = client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 4}, headers=headers)
+    assert first.status_code == replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    assert levels(client, "p1") == (6, 4)
+
+def test_idempotency_key_reused_for_another_request(client):
+    create(client, "p1", 10)
+    headers = {"Idempotency-Key": "order-1"}
+    client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 4}, headers=headers)
+    response = client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 5}, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["idempotency_key"] == "order-1"
+    assert levels(client, "p1") == (6, 4)
+
+def test_failed_idempotent_request_can_be_retried(client):
+    create(client, "p1", 1)
+    headers = {"Idempotency-Key": "order-1"}
+    body = {"product_uid": "p1", "amount": 3}
+    assert client.post("/inventory/reserve", json=body, headers=headers).status_code == 409
+
+    client.put("/inventory/p1", json={"product_uid": "p1", "quantity_available": 5})
+    response = client.post("/inventory/reserve", json=body, headers=headers)
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
+    assert levels(client, "p1") == (2, 3)
+
+def test_lookup_reports_missing_products(client):
+    create(client, "p1", 1)
+    create(client, "p2", 2)
+    response = client.post("/inventory/lookup", json={"product_uids": ["p2", "nope", "p1"]})
+    assert response.status_code == 200
+    assert sorted(row["product_uid"] for row in response.json()["inventories"]) == ["p1", "p2"]
+    assert response.json()["missing"] == ["nope"]
+
+    response = client.get("/inventory/", params={"product_uid": ["p1", "nope"]})
+    assert [row["product_uid"] for row in response.json()["inventories"]] == ["p1"]
+    assert response.json()["missing"] == ["nope"]
+
+def test_list_pages_by_cursor(client):
+    for index in range(5):
+        create(client, f"p{index}", index)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        page = client.get("/inventory/", params=params).json()
+        seen += [row["product_uid"] for row in page["inventories"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"p{index}" for index in range(5)]
+
+def test_list_filters(client):
+    create(client, "p1", 1)
+    create(client, "p2", 10)
+    client.post("/inventory/reserve", json={"product_uid": "p2", "amount": 1})
+
+    page = client.get("/inventory/", params={"max_available": 5}).json()
+    assert [row["product_uid"] for row in page["inventories"]] == ["p1"]
+    page = client.get("/inventory/", params={"has_reservations": True}).json()
+    assert [row["product_uid"] for row in page["inventories"]] == ["p2"]
+
+def test_invalid_cursor(client):
+    assert client.get("/inventory/", params={"cursor": "not a cursor"}).status_code == 422
+
+def test_low_stock(client):
+    create(client, "p1", 10)
+    create(client, "p2", 10)
+    response = client.put("/inventory/p1/reorder-threshold", json={"reorder_threshold": 8})
+    assert response.status_code == 200
+    assert response.json()["inventory"]["reorder_threshold"] == 8
+    assert client.get("/inventory/low-stock").json()["inventories"] == []
+
+    client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 2})
+    page = client.get("/inventory/low-stock").json()
+    assert [row["product_uid"] for row in page["inventories"]] == ["p1"]
+
+def test_export_ndjson(client):
+    create(client, "p1", 1)
+    create(client, "p2", 2)
+    response = client.get("/inventory/export")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["product_uid"], row["quantity_available"]) for row in rows] == [("p1", 1), ("p2", 2)]
+
+def test_export_csv(client):
+    create(client, "p1", 1)
+    response = client.get("/inventory/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["product_uid"], row["quantity_available"]) for row in rows] == [("p1", "1")]
+
+def test_import_csv(client):
+    create(client, "p1", 1)
+    create(client, "p2", 2)
+    body = "product_uid,quantity_available\np1,5\np2,2\np3,7\np4,-1\n"
+    response = client.post("/inventory/import", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["processed"], report["inserted"], report["updated"], report["unchanged"], report["failed"]) == (4, 1, 1, 1, 1)
+    assert [error["line"] for error in report["errors"]] == [5]
+    assert levels(client, "p1") == (5, 0)
+    assert levels(client, "p3") == (7, 0)
+
+def test_import_csv_with_byte_order_mark(client):
+    body = b"\xef\xbb\xbfproduct_uid,quantity_available\r\np1,5\r\n"
+    response = client.post("/inventory/import", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json()["errors"] == []
+    assert response.json()["inserted"] == 1
+    assert levels(client, "p1") == (5, 0)
+
+def test_import_ndjson(client):
+    body = '{"product_uid": "p1", "quantity_available": 5}\nnot json\n'
+    response = client.post("/inventory/import", params={"format": "ndjson"}, content=body)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert [error["line"] for error in response.json()["errors"]] == [2]
+
+def test_import_unknown_media_type(client):
+    response = client.post("/inventory/import", content="{}", headers={"Content-Type": "application/json"})
+    assert response.status_code == 415
+
+def test_sharding(client):
+    create(client, "p1", 10)
+    assert client.get("/inventory/p1/shards").json()["shards"] == []
+
+    response = client.put("/inventory/p1/shards", json={"shard_count": 3})
+    assert response.status_code == 200
+    shards = client.get("/inventory/p1/shards").json()
+    assert shards["shard_count"] == 3
+    assert sum(shard["quantity_available"] for shard in shards["shards"]) == 10
+
+    client.post("/inventory/reserve", json={"product_uid": "p1", "amount": 4})
+    assert levels(client, "p1") == (6, 4)
+
+    assert client.delete("/inventory/p1/shards").status_code == 200
+    assert client.get("/inventory/p1/shards").json()["shard_count"] == 0
+    assert levels(client, "p1") == (6, 4)
+
+def test_cache_stats_when_disabled(client):
+    assert client.get("/inventory/cache/stats").json() == {"enabled": False}
@@ -0,0 +1,110 @@
+import asyncio
+import random
+
+import pytest
+
+from src.application.services.inventory_service import InventoryService
+from src.domain.entities import Inventory
+from src.domain.exceptions import (
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError,
+    InventoryNotFoundError,
+)
+from src.infrastructure.importers import read_stock_levels
+
+pytestmark = pytest.mark.anyio
+
+async def test_reserve_and_release(repository):
+    await repository.create_inventory(Inventory(product_uid="p1", quantity_available=10))
+    inventory = await repository.reserve_inventory("p1", 4)
+    assert (inventory.quantity_available, inventory.reserved_quantity) == (6, 4)
+    inventory = await repository.release_inventory("p1", 4)
+    assert (inventory.quantity_available, inventory.reserved_quantity) == (10, 0)
+
+async def test_shortfalls_leave_counters_untouched(repository):
+    await repository.create_inventory(Inventory(product_uid="p1", quantity_available=3, reserved_quantity=1))
+    with pytest.raises(InsufficientInventoryError) as error:
+        await repository.reserve_inventory("p1", 4)
+    assert (error.value.available, error.value.requested) == (3, 4)
+    with pytest.raises(InsufficientReservedInventoryError) as error:
+        await repository.release_inventory("p1", 2)
+    assert (error.value.reserved, error.value.requested) == (1, 2)
+
+    inventory = await repository.get_inventory_by_uid("p1")
+    assert (inventory.quantity_available, inventory.reserved_quantity) == (3, 1)
+
+async def test_unknown_product(repository):
+    with pytest.raises(InventoryNotFoundError):
+        await repository.reserve_inventory("missing", 1)
+
+@pytest.mark.parametrize("seed", range(5))
+async def test_concurrent_reservations_never_oversell(repository, seed):
+    rng = random.Random(seed)
+    stock = {f"p{index}": rng.randint(0, 20) for index in range(3)}
+    for product_uid, quantity_available in stock.items():
+        await repository.create_inventory(Inventory(product_uid=product_uid, quantity_available=quantity_available))
+
+    async def client(operations):
+        reserved = {product_uid: 0 for product_uid in stock}
+        for product_uid, amount in operations:
+            await asyncio.sleep(0)
+            try:
+                if amount > 0:
+                    await repository.reserve_inventory(product_uid, amount)
+                else:
+                    await repository.release_inventory(product_uid, -amount)
+            except (InsufficientInventoryError, InsufficientReservedInventoryError):
+                continue
+            reserved[product_uid] += amount
+        return reserved
+
+    results = await asyncio.gather(*(
+        client([(rng.choice(list(stock)), rng.choice([-3, -1, 1, 2, 5])) for _ in range(50)])
+        for _ in range(20)
+    ))
+
+    for product_uid, quantity_available in stock.items():
+        inventory = await repository.get_inventory_by_uid(product_uid)
+        reserved = sum(result[product_uid] for result in results)
+        assert inventory.quantity_available >= 0
+        assert inventory.reserved_quantity == reserved >= 0
+        assert inventory.quantity_available + inventory.reserved_quantity == quantity_available
+
+async def test_batch_reservation_is_all_or_nothing(repository):
+    await repository.create_inventory(Inventory(product_uid="p1", quantity_available=5))
+    await repository.create_inventory(Inventory(product_uid="p2", quantity_available=5))
+
+    inventories = await repository.reserve_inventory_batch([("p2", 1), ("p1", 2), ("p2", 3)])
+    assert [(inventory.product_uid, inventory.reserved_quantity) for inventory in inventories] == [("p1", 2), ("p2", 4)]
+
+    with pytest.raises(InsufficientInventoryError) as error:
+        await repository.reserve_inventory_batch([("p1", 1), ("p2", 2)])
+    assert error.value.product_uid == "p2"
+    with pytest.raises(InventoryNotFoundError):
+        await repository.reserve_inventory_batch([("p1", 1), ("missing", 1)])
+    assert (await repository.get_inventory_by_uid("p1")).reserved_quantity == 2
+
+async def test_shards_split_the_counters(repository):
+    await repository.create_inventory(Inventory(product_uid="p1", quantity_available=10, reserved_quantity=3))
+    await repository.set_shard_count("p1", 4)
+    shards = await repository.get_inventory_shards("p1")
+    assert len(shards) == 4
+    assert sum(shard.quantity_available for shard in shards) == 10
+    assert sum(shard.reserved_quantity for shard in shards) == 3
+
+async def test_import(repository):
+    await repository.create_inventory(Inventory(product_uid="p1", quantity_available=1))
+    await repository.create_inventory(Inventory(product_uid="p2", quantity_available=2))
+
+    async def chunks():
+        yield b"product_uid,quantity_available\np1,5\np2,2\np3,"
+        yield b"7\np4,-1\np3,8\n"
+
+    service = InventoryService(repository)
+    events = [event async for event in service.import_stock_levels(read_stock_levels(chunks(), "csv"), chunk_size=2)]
+
+    assert [event["event"] for event in events] == ["progress", "error", "done"]
+    assert events[1]["line"] == 5
+    done = {name: count for name, count in events[-1].items() if name != "event"}
+    assert done == dict(processed=5, inserted=1, updated=1, unchanged=1, failed=1)
+    assert (await repository.get_inventory_by_uid("p3")).quantity_available == 8
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from src.domain.entities import Inventory
+from src.domain.exceptions import InsufficientInventoryError, InventoryNotFoundError
+from src.infrastructure.brokers import ReservationBroker
+from src.infrastructure.repositories.memory_inventory_repository import MemoryInventoryRepository
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def repository(memory_strategy):
+    repository = MemoryInventoryRepository(memory_strategy._store)
+    await repository.create_inventory(Inventory(product_uid="p1", quantity_available=10))
+    return repository
+
+async def test_group_is_applied_as_one_reservation(memory_strategy, repository, monkeypatch):
+    calls = []
+    reserve_inventory = MemoryInventoryRepository.reserve_inventory
+
+    async def counting_reserve(self, product_uid, amount):
+        calls.append(amount)
+        return await reserve_inventory(self, product_uid, amount)
+
+    monkeypatch.setattr(MemoryInventoryRepository, "reserve_inventory", counting_reserve)
+    broker = ReservationBroker(strategy=memory_strategy, window=0.01)
+    results = await asyncio.gather(*(broker.reserve("p1", amount) for amount in (1, 2, 3)))
+
+    assert calls == [6]
+    # Each caller sees the counters right after its own reservation.
+    assert [(result.quantity_available, result.reserved_quantity) for result in results] == [(9, 1), (7, 3), (4, 6)]
+
+async def test_shortfall_admits_in_arrival_order(memory_strategy, repository):
+    broker = ReservationBroker(strategy=memory_strategy, window=0.01)
+    results = await asyncio.gather(
+        *(broker.reserve("p1", amount) for amount in (4, 7, 5, 1)),
+        return_exceptions=True,
+    )
+
+    assert results[0].reserved_quantity == 4
+    assert isinstance(results[1], InsufficientInventoryError)
+    assert (results[1].available, results[1].requested) == (6, 7)
+    assert results[2].reserved_quantity == 9
+    assert results[3].reserved_quantity == 10
+    inventory = await repository.get_inventory_by_uid("p1")
+    assert (inventory.quantity_available, inventory.reserved_quantity) == (0, 10)
+
+@pytest.fixture
+async def slow_broker(memory_strategy):
+    broker = ReservationBroker(strategy=memory_strategy, window=60, max_batch=2)
+    yield broker
+    # Timers of groups already applied would otherwise sleep out the window.
+    for task in list(broker._flushes):
+        task.cancel()
+
+async def test_max_batch_closes_the_group(slow_broker, repository):
+    results = await asyncio.wait_for(asyncio.gather(slow_broker.reserve("p1", 1), slow_broker.reserve("p1", 1)), 1)
+    assert [result.reserved_quantity for result in results] == [1, 2]
+
+async def test_stop_applies_open_groups(slow_broker, repository):
+    pending = asyncio.ensure_future(slow_broker.reserve("p1", 3))
+    await asyncio.sleep(0)
+    stopping = asyncio.ensure_future(slow_broker.stop())
+    assert (await asyncio.wait_for(pending, 1)).reserved_quantity == 3
+    stopping.cancel()
+
+async def test_unknown_product_fails_the_group(memory_strategy, repository):
+    broker = ReservationBroker(strategy=memory_strategy, window=0.01)
+    results = await asyncio.gather(broker.reserve("missing", 1), broker.reserve("missing", 2), return_exceptions=True)
+    assert all(isinstance(result, InventoryNotFoundError) for result in results)
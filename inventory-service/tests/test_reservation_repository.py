@@ -0,0 +1,119 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.domain.entities import Inventory, Reservation
+from src.domain.exceptions import (
+    InsufficientInventoryError,
+    InsufficientReservedInventoryError,
+    ReservationNotFoundError,
+)
+from src.infrastructure.repositories import InventoryRepository, ReservationRepository
+
+pytestmark = pytest.mark.anyio
+
+async def create_product(session, quantity_available, shard_count=0) -> str:
+    product_uid = f"test-{uuid.uuid4().hex}"
+    repository = InventoryRepository(session)
+    await repository.create_inventory(Inventory(product_uid=product_uid, quantity_available=quantity_available))
+    if shard_count:
+        await repository.set_shard_count(product_uid, shard_count)
+    return product_uid
+
+async def levels(session, product_uid):
+    inventory = await InventoryRepository(session).get_inventory_by_uid(product_uid)
+    return inventory.quantity_available, inventory.reserved_quantity
+
+async def create_reservation(session, product_uid, amount, expired=False) -> Reservation:
+    expires_at = datetime.now(timezone.utc) + (timedelta(seconds=-1) if expired else timedelta(hours=1))
+    reservation = Reservation(product_uid=product_uid, amount=amount, expires_at=expires_at)
+    return await ReservationRepository(session).create_reservation(reservation)
+
+async def test_create_reservation(session):
+    product_uid = await create_product(session, 10)
+    reservation = await create_reservation(session, product_uid, 4)
+
+    assert await levels(session, product_uid) == (6, 4)
+    stored = await ReservationRepository(session).get_reservation(reservation.id)
+    assert (stored.product_uid, stored.amount) == (product_uid, 4)
+
+async def test_create_reservation_short_of_stock(session):
+    product_uid = await create_product(session, 3)
+    with pytest.raises(InsufficientInventoryError):
+        await create_reservation(session, product_uid, 4)
+    assert await levels(session, product_uid) == (3, 0)
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_release_reservation(session, shard_count):
+    product_uid = await create_product(session, 10, shard_count)
+    reservation = await create_reservation(session, product_uid, 4)
+    await create_reservation(session, product_uid, 2)
+
+    await ReservationRepository(session).release_reservation(reservation.id)
+    assert await levels(session, product_uid) == (8, 2)
+    with pytest.raises(ReservationNotFoundError):
+        await ReservationRepository(session).release_reservation(reservation.id)
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_confirm_reservation(session, shard_count):
+    product_uid = await create_product(session, 10, shard_count)
+    reservation = await create_reservation(session, product_uid, 4)
+
+    await ReservationRepository(session).confirm_reservation(reservation.id)
+    assert await levels(session, product_uid) == (6, 0)
+    with pytest.raises(ReservationNotFoundError):
+        await ReservationRepository(session).get_reservation(reservation.id)
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_release_spares_units_held_by_reservations(session, shard_count):
+    product_uid = await create_product(session, 10, shard_count)
+    reservation = await create_reservation(session, product_uid, 4)
+    await InventoryRepository(session).reserve_inventory(product_uid, 2)
+
+    with pytest.raises(InsufficientReservedInventoryError) as error:
+        await InventoryRepository(session).release_inventory(product_uid, 3)
+    assert (error.value.reserved, error.value.requested) == (2, 3)
+    assert await levels(session, product_uid) == (4, 6)
+
+    await InventoryRepository(session).release_inventory(product_uid, 2)
+    await ReservationRepository(session).confirm_reservation(reservation.id)
+    assert await levels(session, product_uid) == (6, 0)
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_sweeper_releases_units_refused_to_release(session, shard_count):
+    product_uid = await create_product(session, 10, shard_count)
+    reservation = await create_reservation(session, product_uid, 4, expired=True)
+    with pytest.raises(InsufficientReservedInventoryError):
+        await InventoryRepository(session).release_inventory(product_uid, 3)
+
+    released = await ReservationRepository(session).release_expired_reservations(1000)
+    assert reservation.id in [expired.id for expired in released]
+    assert await levels(session, product_uid) == (10, 0)
+
+@pytest.mark.parametrize("shard_count", [0, 4])
+async def test_sweeper_releases_expired_reservations_only(session, shard_count):
+    product_uid = await create_product(session, 10, shard_count)
+    expired = await create_reservation(session, product_uid, 4, expired=True)
+    active = await create_reservation(session, product_uid, 2)
+
+    released = await ReservationRepository(session).release_expired_reservations(1000)
+    assert expired.id in [reservation.id for reservation in released]
+    assert active.id not in [reservation.id for reservation in released]
+    assert await levels(session, product_uid) == (8, 2)
+
+async def test_concurrent_sweepers_release_each_reservation_once(session, session_factory):
+    product_uid = await create_product(session, 20)
+    for _ in range(10):
+        await create_reservation(session, product_uid, 2, expired=True)
+
+    async def sweep():
+        async with session_factory() as own_session:
+            return await ReservationRepository(own_session).release_expired_reservations(3)
+
+    while True:
+        batches = await asyncio.gather(sweep(), sweep())
+        if not any(batches):
+            break
+    assert await levels(session, product_uid) == (20, 0)
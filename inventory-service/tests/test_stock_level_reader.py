@@ -0,0 +1,56 @@
+import pytest
+
+from src.infrastructure.importers import read_stock_levels
+
+pytestmark = pytest.mark.anyio
+
+async def chunked(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+async def read(format, *chunks):
+    return [record async for records in read_stock_levels(chunked(*chunks), format) for record in records]
+
+async def test_csv_rows():
+    records = await read("csv", b"product_uid,quantity_available\np1,5\np", b"2,7\n")
+    assert records == [
+        (2, {"product_uid": "p1", "quantity_available": "5"}),
+        (3, {"product_uid": "p2", "quantity_available": "7"}),
+    ]
+
+async def test_csv_byte_order_mark():
+    records = await read("csv", b"\xef\xbb\xbfproduct_uid,quantity_available\r\np1,5\r\n")
+    assert records == [(2, {"product_uid": "p1", "quantity_available": "5"})]
+
+async def test_csv_byte_order_mark_split_across_chunks():
+    records = await read("csv", b"\xef", b"\xbb\xbfproduct_uid,quantity_", b"available\np1,5")
+    assert records == [(2, {"product_uid": "p1", "quantity_available": "5"})]
+
+async def test_csv_byte_order_mark_only_dropped_at_the_start():
+    records = await read("csv", b"product_uid,quantity_available\n", b"\xef\xbb\xbfp1,5\n")
+    assert records == [(2, {"product_uid": "\ufeffp1", "quantity_available": "5"})]
+
+async def test_csv_missing_column():
+    [(line, error)] = await read("csv", b"product_uid,quantity\np1,5\n")
+    assert line == 1
+    assert "quantity_available" in str(error)
+
+async def test_csv_field_count():
+    [(line, error)] = await read("csv", b"product_uid,quantity_available\np1,5,6\n")
+    assert line == 2
+    assert "Expected 2 fields, got 3" in str(error)
+
+async def test_ndjson_byte_order_mark():
+    records = await read("ndjson", b'\xef\xbb\xbf{"product_uid": "p1", "quantity_available": 5}\n')
+    assert records == [(1, {"product_uid": "p1", "quantity_available": 5})]
+
+async def test_ndjson_invalid_lines():
+    records = await read("ndjson", b'not json\n[1]\n\n{"product_uid": "p1"}')
+    assert [line for line, _ in records] == [1, 2, 4]
+    assert isinstance(records[0][1], ValueError)
+    assert isinstance(records[1][1], ValueError)
+    assert records[2][1] == {"product_uid": "p1"}
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        read_stock_levels(chunked(), "xml")
@@ -0,0 +1,39 @@
+import asyncio
+import json
+
+import pytest
+
+from src.domain.entities import Inventory
+from src.infrastructure.notifications import StockStreamBroadcaster
+from src.infrastructure.repositories.memory_inventory_repository import MemoryInventoryRepository
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def broadcaster(memory_strategy):
+    await MemoryInventoryRepository(memory_strategy._store).create_inventory(
+        Inventory(product_uid="p1", quantity_available=10)
+    )
+    return StockStreamBroadcaster(strategy=memory_strategy, max_subscribers=2)
+
+async def test_subscribe_starts_with_the_current_levels(broadcaster):
+    subscription = await broadcaster.subscribe(["p1", "missing"])
+    messages = [json.loads(message) for message in await subscription.next(1)]
+    assert {message["product_uid"]: message["quantity_available"] for message in messages} == {"p1": 10, "missing": None}
+    broadcaster.unsubscribe(subscription)
+    assert broadcaster.subscriber_count == 0
+
+async def test_concurrent_subscribers_never_exceed_the_limit(broadcaster):
+    subscriptions = await asyncio.gather(*(broadcaster.subscribe(["p1"]) for _ in range(5)))
+    assert sum(subscription is not None for subscription in subscriptions) == 2
+    assert broadcaster.subscriber_count == 2
+
+async def test_failed_initial_read_gives_the_slot_back(broadcaster, monkeypatch):
+    async def failing_read(product_uids):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(broadcaster, "_read", failing_read)
+    with pytest.raises(ConnectionError):
+        await broadcaster.subscribe(["p1"])
+    assert broadcaster.subscriber_count == 0
+    assert broadcaster._subscribers == {}
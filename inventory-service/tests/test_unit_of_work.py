@@ -0,0 +1,92 @@
+import uuid
+
+import pytest
+
+from src.domain.entities import IdempotencyRecord, Inventory
+from src.domain.exceptions import InsufficientInventoryError
+from src.infrastructure.cache import InventoryCache
+from src.infrastructure.database import UnitOfWork
+from src.infrastructure.repositories import CachedInventoryRepository, IdempotencyRepository, InventoryRepository
+
+pytestmark = pytest.mark.anyio
+
+async def create_product(session, quantity_available) -> str:
+    product_uid = f"test-{uuid.uuid4().hex}"
+    await InventoryRepository(session).create_inventory(
+        Inventory(product_uid=product_uid, quantity_available=quantity_available)
+    )
+    return product_uid
+
+async def levels(session, product_uid):
+    inventory = await InventoryRepository(session).get_inventory_by_uid(product_uid)
+    return inventory.quantity_available, inventory.reserved_quantity
+
+async def test_unit_of_work_rolls_back_without_commit(engine, session_factory, session):
+    product_uid = f"test-{uuid.uuid4().hex}"
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        # The repository commits, which only releases a savepoint.
+        await InventoryRepository(unit_of_work.session).create_inventory(
+            Inventory(product_uid=product_uid, quantity_available=1)
+        )
+        assert [inventory async for inventory in InventoryRepository(session).get_inventories_by_uids([product_uid])] == []
+    assert [inventory async for inventory in InventoryRepository(session).get_inventories_by_uids([product_uid])] == []
+
+async def test_unit_of_work_commit(engine, session_factory, session):
+    product_uid = f"test-{uuid.uuid4().hex}"
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        await InventoryRepository(unit_of_work.session).create_inventory(
+            Inventory(product_uid=product_uid, quantity_available=1)
+        )
+        await unit_of_work.commit()
+    assert await levels(session, product_uid) == (1, 0)
+
+async def test_idempotency_key_of_failed_operation_is_discarded(engine, session_factory, session):
+    product_uid = await create_product(session, 1)
+    record = IdempotencyRecord.with_ttl(f"test-{uuid.uuid4().hex}", "fingerprint", 60)
+
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        store = IdempotencyRepository(unit_of_work.session)
+        assert await store.claim(record) is None
+        with pytest.raises(InsufficientInventoryError):
+            await InventoryRepository(unit_of_work.session).reserve_inventory(product_uid, 2)
+        await store.discard(record)
+        await unit_of_work.rollback()
+
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        store = IdempotencyRepository(unit_of_work.session)
+        assert await store.claim(record) is None
+        await InventoryRepository(unit_of_work.session).reserve_inventory(product_uid, 1)
+        record.status_code, record.response = 200, {"message": "Inventory reserved"}
+        await store.complete(record)
+        await unit_of_work.commit()
+
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        replayed = await IdempotencyRepository(unit_of_work.session).claim(record)
+        assert replayed.is_complete()
+        assert replayed.response == {"message": "Inventory reserved"}
+    assert await levels(session, product_uid) == (0, 1)
+
+async def test_after_commit_callbacks_wait_for_commit(engine, session_factory):
+    called = []
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        assert UnitOfWork.of(unit_of_work.session) is unit_of_work
+        unit_of_work.after_commit(lambda: called.append("rolled back"))
+        await unit_of_work.rollback()
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        unit_of_work.after_commit(lambda: called.append("committed"))
+        assert called == []
+        await unit_of_work.commit()
+    assert called == ["committed"]
+
+async def test_cache_entries_are_dropped_when_the_unit_of_work_commits(engine, session_factory, session):
+    product_uid = await create_product(session, 5)
+    cache = InventoryCache()
+    reader = CachedInventoryRepository(InventoryRepository(session), cache)
+
+    async with UnitOfWork.open(engine, session_factory) as unit_of_work:
+        writer = CachedInventoryRepository(InventoryRepository(unit_of_work.session), cache, unit_of_work)
+        await writer.reserve_inventory(product_uid, 2)
+        # Read before the commit, which caches the old levels again.
+        assert (await reader.get_inventory_by_uid(product_uid)).quantity_available == 5
+        await unit_of_work.commit()
+    assert (await reader.get_inventory_by_uid(product_uid)).quantity_available == 3